@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Suíte de Benchmarks em Escala
+Descrição: Gera bases sintéticas (synthetic_sales.py) em cada escala e
+           cronometra as etapas do ETL, cada DataFrame agregado, as partes
+           do caminho de renderização (cubo, filtros, formatação e série
+           temporal) e a execução completa de cada página (AppTest);
+           grava os resultados em JSON para comparar commits
+============================================================================
+
+Uso:
+    python bench_suite.py --rows 100000 1000000 [--repeat 3] [--output resultados.json]
+    python bench_suite.py --rows 100000 --compare results/bench_<commit>.json
+
+As etapas do ETL medidas são as do lado do Python (leitura + transformação
+em blocos, montagem dos registros e TSV do LOAD DATA); a escrita no MySQL
+depende do servidor e não entra na suíte.
+"""
+
+import argparse
+import ast
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+sys.path.insert(0, str(ROOT_DIR / 'dataframes'))
+sys.path.insert(0, str(ROOT_DIR / 'database'))
+
+from aggregations import FRAME_ORDER, build_aggregates  # noqa: E402
+from frame_store import write_store  # noqa: E402
+from generate_dataframes import add_derived_columns, build_dataframes, load_sales  # noqa: E402
+from load_data import build_records, iter_csv_chunks, write_tsv  # noqa: E402
+from synthetic_sales import write_sales_csv  # noqa: E402
+from utils import data_access  # noqa: E402
+from utils.cube import Cube  # noqa: E402
+from utils.formatting import DISPLAY_COLUMNS, display_frame  # noqa: E402
+from utils.timeseries import TimeSeries, month_bounds  # noqa: E402
+
+BENCH_DIR = Path(__file__).resolve().parent
+DATA_DIR = BENCH_DIR / 'data'
+RESULTS_DIR = BENCH_DIR / 'results'
+PAGES_DIR = ROOT_DIR / 'pages'
+
+# Tempo máximo da execução de uma página no AppTest (inclui montar o cubo)
+PAGE_TIMEOUT = 600
+
+# Combinação de filtros usada no caminho "filtrado" de cada página
+SAMPLE_FILTERS = {
+    'YearMonth': [f'2022-{month:02d}' for month in range(3, 10)],
+    'Dealer_Region': ['Austin', 'Pasco'],
+    'Gender': ['Male']
+}
+
+# Variação (tempo atual / tempo de referência) considerada regressão
+REGRESSION_RATIO = 1.2
+
+# Diferenças absolutas abaixo disto são ruído de medição, não regressão
+NOISE_SECONDS = 0.005
+
+
+def page_frames(pages_dir=PAGES_DIR):
+    """DataFrames de cada página, lidos das chamadas a load_filtered_frames em pages/"""
+    frames = {}
+    for path in sorted(Path(pages_dir).glob('*.py')):
+        for node in ast.walk(ast.parse(path.read_text(encoding='utf-8'))):
+            if isinstance(node, ast.Call) and getattr(node.func, 'id', None) == 'load_filtered_frames':
+                frames.setdefault(path.stem, []).extend(
+                    arg.value for arg in node.args
+                    if isinstance(arg, ast.Constant) and isinstance(arg.value, str)
+                )
+    return frames
+
+
+# DataFrames de cada página (mesmas listas de load_filtered_frames em pages/)
+PAGE_FRAMES = page_frames()
+
+
+def measure(function, setup=None, repeat=3):
+    """Executa `function` `repeat` vezes; `setup` (fora do tempo) prepara os argumentos"""
+    runs = []
+    for _ in range(repeat):
+        args = setup() if setup else ()
+        start = time.perf_counter()
+        function(*args)
+        runs.append(time.perf_counter() - start)
+    return {'seconds': min(runs), 'median': statistics.median(runs), 'runs': runs}
+
+
+def synthetic_csv(rows, seed, data_dir=DATA_DIR):
+    """CSV sintético da escala (gerado uma vez e reaproveitado entre execuções)"""
+    path = Path(data_dir) / f'car_sales_{rows}_{seed}.csv'
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_sales_csv(path, rows, seed)
+    return path
+
+
+def bench_etl(csv_file, repeat):
+    """Etapas do ETL de load_data.py que não dependem do servidor MySQL"""
+    results = {'etl.read_transform': measure(lambda: sum(len(c) for c in iter_csv_chunks(csv_file)),
+                                             repeat=repeat)}
+    transformed = pd.concat(iter_csv_chunks(csv_file), ignore_index=True)
+    results['etl.build_records'] = measure(lambda: sum(len(b) for b in build_records(transformed)),
+                                           repeat=repeat)
+    with tempfile.TemporaryFile('w', encoding='utf-8', newline='') as handle:
+        def rewind():
+            handle.seek(0)
+            handle.truncate()
+            return ()
+
+        results['etl.write_tsv'] = measure(lambda: write_tsv(transformed, handle),
+                                           setup=rewind, repeat=repeat)
+    return results
+
+
+def bench_dataframes(csv_file, repeat):
+    """Etapas de generate_dataframes.py e cada DataFrame agregado isoladamente"""
+    results = {'dataframes.load_sales': measure(lambda: load_sales(csv_file), repeat=repeat)}
+    raw = load_sales(csv_file)
+    results['dataframes.add_derived_columns'] = measure(add_derived_columns,
+                                                        setup=lambda: (raw.copy(),), repeat=repeat)
+    df = add_derived_columns(raw)
+
+    for name in FRAME_ORDER:
+        results[f'frame.{name}'] = measure(lambda: build_aggregates(df, [name]), repeat=repeat)
+    results['dataframes.build_all'] = measure(lambda: build_dataframes(df), repeat=repeat)
+
+    frames = build_dataframes(df)
+    with tempfile.TemporaryDirectory() as directory:
+        results['dataframes.write_store'] = measure(lambda: write_store(frames, directory), repeat=repeat)
+    return results, df, frames
+
+
+def bench_pages(df, frames, repeat):
+    """Caminho de renderização das páginas: cubo, DataFrames filtrados, formatação e série"""
+    results = {'cube.build': measure(lambda: Cube.from_frame(df), repeat=repeat)}
+    cube = Cube.from_frame(df)
+
+    for page, names in PAGE_FRAMES.items():
+        results[f'page.{page}.frames'] = measure(lambda: cube.frames(names), repeat=repeat)
+        results[f'page.{page}.frames_filtered'] = measure(lambda: cube.frames(names, SAMPLE_FILTERS),
+                                                          repeat=repeat)
+        page_frames = cube.frames(names)
+        results[f'page.{page}.display'] = measure(
+            lambda: [display_frame(page_frames[n], DISPLAY_COLUMNS[n]) for n in names if n in DISPLAY_COLUMNS],
+            repeat=repeat
+        )
+
+    results['timeseries.build'] = measure(lambda: TimeSeries.from_frame(frames['df_evolucao']), repeat=repeat)
+    series = TimeSeries.from_frame(frames['df_evolucao'])
+    period = month_bounds(SAMPLE_FILTERS['YearMonth'])
+    results['timeseries.series'] = measure(lambda: series.series(*period), repeat=repeat)
+    return results
+
+
+def _page_app(page, filters=None):
+    """AppTest da página pronto para o rerun medido
+
+    Sem `filters`, a página ainda não foi executada (o rerun é a abertura);
+    com `filters`, ela já abriu e os filtros estão marcados na barra lateral.
+    """
+    app = AppTest.from_file(str(PAGES_DIR / f'{page}.py'), default_timeout=PAGE_TIMEOUT)
+    if filters:
+        app.run()
+        for widget in app.sidebar.multiselect:
+            dim = widget.key.removeprefix('filtro_')
+            if dim in filters:
+                widget.set_value([member for member in filters[dim] if member in widget.options])
+    return (app,)
+
+
+def _rerun(app):
+    app.run()
+    if app.exception:
+        raise RuntimeError(app.exception[0].value)
+
+
+def bench_page_scripts(df, frames, repeat):
+    """Execução completa de cada página (streamlit.testing.AppTest) sobre o store da escala
+
+    O cubo e os caches de st.cache_resource são aquecidos por uma execução
+    inicial de cada página; os tempos são de reruns com o cache quente, como
+    no servidor depois do primeiro acesso.
+    """
+    results = {}
+    store_dir = data_access.STORE_DIR
+    with tempfile.TemporaryDirectory() as directory:
+        write_store({**frames, 'df_original': df}, directory)
+        data_access.STORE_DIR = Path(directory)
+        st.cache_resource.clear()
+        try:
+            for page in PAGE_FRAMES:
+                _rerun(*_page_app(page, SAMPLE_FILTERS))
+                results[f'page.{page}.script'] = measure(_rerun, setup=lambda: _page_app(page),
+                                                         repeat=repeat)
+                results[f'page.{page}.script_filtered'] = measure(
+                    _rerun, setup=lambda: _page_app(page, SAMPLE_FILTERS), repeat=repeat
+                )
+        finally:
+            data_access.STORE_DIR = store_dir
+            st.cache_resource.clear()
+    return results
+
+
+def git_commit():
+    """Commit atual (ou None fora de um repositório git)"""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(scales, seed=42, repeat=3, data_dir=DATA_DIR):
+    """Executa a suíte em cada escala; retorna o documento de resultados"""
+    report = {
+        'commit': git_commit(),
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'seed': seed,
+        'repeat': repeat,
+        'scales': {}
+    }
+    for rows in scales:
+        print(f"\n→ Escala: {rows:,} vendas")
+        start = time.perf_counter()
+        csv_file = synthetic_csv(rows, seed, data_dir)
+        print(f"  • base sintética pronta em {time.perf_counter() - start:.1f}s ({csv_file.name})")
+
+        results = bench_etl(csv_file, repeat)
+        frame_results, df, frames = bench_dataframes(csv_file, repeat)
+        results.update(frame_results)
+        results.update(bench_pages(df, frames, repeat))
+        results.update(bench_page_scripts(df, frames, repeat))
+        report['scales'][str(rows)] = results
+
+        for stage, result in results.items():
+            print(f"  • {stage:<50} {result['seconds']:10.4f}s")
+    return report
+
+
+def compare(report, baseline, threshold=REGRESSION_RATIO):
+    """Compara com um resultado anterior; retorna as etapas que ficaram mais lentas"""
+    regressions = []
+    print("\n" + "="*80)
+    print(f"COMPARAÇÃO COM {baseline.get('commit')} (regressão: > {threshold:.2f}x)")
+    print("="*80)
+    for rows, results in report['scales'].items():
+        previous = baseline.get('scales', {}).get(rows)
+        if previous is None:
+            print(f"\n  Escala {rows} ausente na referência")
+            continue
+        print(f"\n  Escala {int(rows):,}")
+        for stage, result in results.items():
+            if stage not in previous:
+                continue
+            ratio = result['seconds'] / previous[stage]['seconds'] if previous[stage]['seconds'] else float('inf')
+            slower = ratio > threshold and result['seconds'] - previous[stage]['seconds'] > NOISE_SECONDS
+            flag = '✗' if slower else '✓'
+            print(f"  {flag} {stage:<50} {previous[stage]['seconds']:10.4f}s → {result['seconds']:10.4f}s ({ratio:.2f}x)")
+            if slower:
+                regressions.append((rows, stage, ratio))
+    return regressions
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do ETL, dos DataFrames e das páginas em escala")
+    parser.add_argument('--rows', type=int, nargs='+', default=[100_000],
+                        help="Escalas (quantidade de vendas sintéticas), ex.: 1000000 10000000")
+    parser.add_argument('--seed', type=int, default=42, help="Semente da base sintética")
+    parser.add_argument('--repeat', type=int, default=3, help="Execuções por etapa (vale a menor)")
+    parser.add_argument('--data-dir', default=str(DATA_DIR), help="Onde guardar os CSVs sintéticos")
+    parser.add_argument('--output', help="Arquivo JSON de resultados (padrão: results/bench_<commit>.json)")
+    parser.add_argument('--compare', metavar='JSON',
+                        help="Resultado anterior para comparação (código de saída 1 se houver regressão)")
+    parser.add_argument('--threshold', type=float, default=REGRESSION_RATIO,
+                        help="Razão atual/referência acima da qual a etapa é regressão")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("="*80)
+    print("SUÍTE DE BENCHMARKS")
+    print("="*80)
+
+    report = run_suite(args.rows, args.seed, args.repeat, args.data_dir)
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"bench_{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding='utf-8')
+    print(f"\n✓ Resultados gravados em {output}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding='utf-8'))
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n✗ {len(regressions)} etapa(s) mais lentas que a referência")
+            return 1
+        print("\n✓ Nenhuma regressão")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
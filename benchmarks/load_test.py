@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Teste de Carga do Dashboard (Sessões Simultâneas)
+Descrição: Simula N analistas navegando ao mesmo tempo pela Homepage e
+           pelas três páginas, alterando filtros da barra lateral, com um
+           cliente websocket local que fala o protocolo do Streamlit (o
+           mesmo do navegador); mede vazão, latência p50/p99 de cada rerun
+           e a memória do servidor por sessão
+============================================================================
+
+Uso:
+    # Sobe um servidor local (streamlit run Homepage.py) só para o teste
+    python load_test.py --sessions 1 5 20 [--iterations 3]
+
+    # Contra um servidor já em execução (ex.: dentro do container do docker-compose)
+    python load_test.py --url http://localhost:8501 --server-pid 1 --sessions 10
+
+Tudo roda offline: o cliente usa o tornado (dependência do Streamlit) e as
+mensagens protobuf do próprio pacote streamlit.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.httpclient import AsyncHTTPClient, HTTPRequest
+from tornado.websocket import websocket_connect
+
+from bench_suite import RESULTS_DIR, git_commit
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+# Tempo máximo de um rerun antes de contá-lo como erro
+RERUN_TIMEOUT = 120
+
+# Pausa entre as ações de um analista (segundos, sorteada neste intervalo)
+THINK_TIME = (0.0, 0.2)
+
+
+class DashboardSession:
+    """Uma aba do navegador: websocket próprio, uma sessão no servidor"""
+
+    def __init__(self, url):
+        self.url = url.rstrip('/').replace('http', 'ws', 1) + '/_stcore/stream'
+        self.ws = None
+        self.pages = {}        # nome da página → page_script_hash
+        self.multiselects = {}  # rótulo → (id do widget, opções)
+
+    async def connect(self):
+        request = HTTPRequest(self.url, headers={'Sec-WebSocket-Protocol': 'streamlit, PLACEHOLDER_AUTH_TOKEN'})
+        self.ws = await websocket_connect(request)
+
+    async def rerun(self, page=None, widget=None, values=None):
+        """Pede um rerun (troca de página e/ou valor de um multiselect) e espera o fim
+
+        Retorna (segundos, erro ou None).
+        """
+        message = BackMsg()
+        state = message.rerun_script
+        state.query_string = ''
+        state.page_script_hash = self.pages.get(page, '')
+        if widget is not None:
+            widget_state = state.widget_states.widgets.add()
+            widget_state.id = widget
+            widget_state.string_array_value.data.extend(values)
+
+        self.multiselects = {}
+        start = time.perf_counter()
+        await self.ws.write_message(message.SerializeToString(), binary=True)
+        error = None
+        while True:
+            data = await asyncio.wait_for(self.ws.read_message(), RERUN_TIMEOUT)
+            if data is None:
+                return time.perf_counter() - start, 'conexão encerrada'
+            forward = ForwardMsg()
+            forward.ParseFromString(data)
+            kind = forward.WhichOneof('type')
+
+            if kind == 'navigation':
+                self.pages = {page.page_name: page.page_script_hash for page in forward.navigation.app_pages}
+            elif kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                element = forward.delta.new_element
+                if element.WhichOneof('type') == 'exception':
+                    error = element.exception.message
+                elif element.WhichOneof('type') == 'multiselect':
+                    self.multiselects[element.multiselect.label] = (element.multiselect.id,
+                                                                    list(element.multiselect.options))
+            elif kind == 'script_finished':
+                if forward.script_finished == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if forward.script_finished == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    error = 'erro de compilação'
+                return time.perf_counter() - start, error
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+
+async def analyst(url, number, iterations, seed, samples, done, release):
+    """Um analista: abre o dashboard e percorre as páginas mudando filtros"""
+    rng = random.Random(seed * 1000 + number)
+    session = DashboardSession(url)
+    await session.connect()
+
+    async def timed(page, action, **change):
+        try:
+            seconds, error = await session.rerun(page, **change)
+        except asyncio.TimeoutError:
+            seconds, error = RERUN_TIMEOUT, 'timeout'
+        samples.append({'session': number, 'page': page or 'Homepage', 'action': action,
+                        'seconds': seconds, 'error': error})
+        await asyncio.sleep(rng.uniform(*THINK_TIME))
+
+    await timed(None, 'abrir')
+    for _ in range(iterations):
+        for page in list(session.pages):
+            await timed(page, 'navegar')
+            if session.multiselects:
+                label = rng.choice(sorted(session.multiselects))
+                widget, options = session.multiselects[label]
+                values = rng.sample(options, k=min(len(options), rng.randint(1, 2)))
+                await timed(page, f'filtro {label}', widget=widget, values=values)
+
+    # Mantém a sessão aberta até todas terminarem (memória medida com N sessões vivas)
+    done.release()
+    await release.wait()
+    session.close()
+
+
+def server_rss_mb(pid):
+    """Memória residente do processo do servidor (Linux)"""
+    if pid is None:
+        return None
+    try:
+        with open(f'/proc/{pid}/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except OSError:
+        return None
+
+
+async def run_level(url, sessions, iterations, seed, pid):
+    """Executa `sessions` analistas simultâneos; retorna o resumo do nível"""
+    baseline = server_rss_mb(pid)
+    samples = []
+    done, release = asyncio.Semaphore(0), asyncio.Event()
+    peak = baseline
+
+    start = time.perf_counter()
+    tasks = [asyncio.create_task(analyst(url, number, iterations, seed, samples, done, release))
+             for number in range(sessions)]
+    for _ in range(sessions):
+        while True:
+            try:
+                await asyncio.wait_for(done.acquire(), 0.5)
+                break
+            except asyncio.TimeoutError:
+                peak = max(peak or 0, server_rss_mb(pid) or 0) or None
+                failed = [task for task in tasks if task.done() and task.exception()]
+                if failed:
+                    raise failed[0].exception()
+    elapsed = time.perf_counter() - start
+    loaded = server_rss_mb(pid)
+    release.set()
+    await asyncio.gather(*tasks)
+
+    seconds = np.array([s['seconds'] for s in samples])
+    per_page = {}
+    for sample in samples:
+        per_page.setdefault(sample['page'], []).append(sample['seconds'])
+
+    def ms(values, q):
+        return round(float(np.percentile(values, q)) * 1000, 1)
+
+    return {
+        'sessions': sessions,
+        'reruns': len(samples),
+        'errors': sum(1 for s in samples if s['error']),
+        'error_messages': sorted({s['error'] for s in samples if s['error']})[:5],
+        'elapsed_s': round(elapsed, 3),
+        'throughput_rps': round(len(samples) / elapsed, 2),
+        'p50_ms': ms(seconds, 50),
+        'p99_ms': ms(seconds, 99),
+        'pages': {page: {'reruns': len(v), 'p50_ms': ms(v, 50), 'p99_ms': ms(v, 99)}
+                  for page, v in per_page.items()},
+        'server_rss_baseline_mb': baseline and round(baseline, 1),
+        'server_rss_peak_mb': peak and round(max(peak, loaded or 0), 1),
+        'server_rss_per_session_mb': round((loaded - baseline) / sessions, 2) if baseline and loaded else None
+    }
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+async def wait_healthy(url, timeout=60):
+    client = AsyncHTTPClient()
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            await client.fetch(url.rstrip('/') + '/_stcore/health', raise_error=True)
+            return True
+        except Exception:
+            await asyncio.sleep(0.5)
+    return False
+
+
+def start_server(port):
+    """Sobe `streamlit run Homepage.py` sem interface, só para o teste"""
+    return subprocess.Popen(
+        [sys.executable, '-m', 'streamlit', 'run', 'Homepage.py', '--server.headless', 'true',
+         '--server.port', str(port), '--browser.gatherUsageStats', 'false'],
+        cwd=ROOT_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+
+def print_level(result):
+    print(f"\n→ {result['sessions']} sessões simultâneas")
+    print(f"  • {result['reruns']} reruns em {result['elapsed_s']:.1f}s "
+          f"({result['throughput_rps']:.1f} reruns/s), {result['errors']} erros")
+    print(f"  • Latência: p50 {result['p50_ms']:.0f} ms · p99 {result['p99_ms']:.0f} ms")
+    for page, stats in result['pages'].items():
+        print(f"    - {page:<22} p50 {stats['p50_ms']:8.0f} ms · p99 {stats['p99_ms']:8.0f} ms")
+    if result['server_rss_per_session_mb'] is not None:
+        print(f"  • Memória do servidor: {result['server_rss_baseline_mb']:.0f} MB → pico "
+              f"{result['server_rss_peak_mb']:.0f} MB ({result['server_rss_per_session_mb']:.2f} MB/sessão)")
+    for message in result['error_messages']:
+        print(f"  ✗ {message[:120]}")
+
+
+async def run(args):
+    server = None
+    url, pid = args.url, args.server_pid
+    if url is None:
+        port = free_port()
+        server = start_server(port)
+        url, pid = f'http://localhost:{port}', server.pid
+        print(f"→ Servidor local iniciado em {url} (pid {pid})")
+
+    try:
+        if not await wait_healthy(url):
+            print(f"✗ Servidor não respondeu em {url}")
+            return None
+        # Aquecimento: uma sessão carrega cubo, caches e módulos antes das medições
+        await run_level(url, 1, 1, args.seed, pid)
+        levels = []
+        for sessions in args.sessions:
+            levels.append(await run_level(url, sessions, args.iterations, args.seed, pid))
+            print_level(levels[-1])
+        return {'url': url, 'levels': levels}
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Teste de carga do dashboard com sessões simultâneas")
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 5, 10],
+                        help="Quantidades de sessões simultâneas (um nível por valor)")
+    parser.add_argument('--iterations', type=int, default=2,
+                        help="Voltas por todas as páginas em cada sessão")
+    parser.add_argument('--url', help="Servidor já em execução (padrão: sobe um servidor local)")
+    parser.add_argument('--server-pid', type=int,
+                        help="PID do servidor em --url, para medir a memória (/proc)")
+    parser.add_argument('--seed', type=int, default=42, help="Semente das escolhas de filtros")
+    parser.add_argument('--output', help="Arquivo JSON de resultados (padrão: results/load_<commit>.json)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    print("="*80)
+    print("TESTE DE CARGA DO DASHBOARD")
+    print("="*80)
+
+    report = asyncio.run(run(args))
+    if report is None:
+        return 1
+
+    report.update({'commit': git_commit(), 'created_at': datetime.now().isoformat(timespec='seconds'),
+                   'iterations': args.iterations, 'seed': args.seed})
+    output = Path(args.output) if args.output else RESULTS_DIR / f"load_{report['commit'] or 'local'}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding='utf-8')
+    print(f"\n✓ Resultados gravados em {output}")
+    return 1 if any(level['errors'] for level in report['levels']) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Gerador Sintético de Vendas (car_sales.csv)
+Descrição: Gera, de forma determinística (mesma semente = mesmo arquivo),
+           um CSV com o schema de car_sales.csv em qualquer escala, com
+           distribuições próximas às da base original: concessionárias e
+           regiões, mix de marcas/modelos, renda concentrada no piso e
+           assimétrica, e sazonalidade por mês e dia da semana
+============================================================================
+
+Uso:
+    python synthetic_sales.py --rows 1000000 --output car_sales_1m.csv [--seed 42]
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Linhas geradas por bloco: o arquivo é escrito em partes (memória constante)
+# e cada bloco tem sua própria semente, então o resultado não depende da memória
+CHUNK_ROWS = 500_000
+
+# Colunas na ordem do CSV original (inclusive o espaço em 'Dealer_No ')
+COLUMNS = [
+    'Car_id', 'Date', 'Customer Name', 'Gender', 'Annual Income', 'Dealer_Name',
+    'Company', 'Model', 'Engine', 'Transmission', 'Color', 'Price ($)',
+    'Dealer_No ', 'Body Style', 'Phone', 'Dealer_Region'
+]
+
+# Concessionária → (Dealer_No, peso relativo de vendas)
+DEALERS = [
+    ('Progressive Shippers Cooperative Association No', '53546-9427', 2),
+    ('Rabun Used Car Sales', '85257-3102', 2),
+    ('Race Car Help', '78758-7841', 2),
+    ('Saab-Belle Dodge', '60504-7114', 2),
+    ('Star Enterprises Inc', '99301-3882', 2),
+    ('Tri-State Mack Inc', '85257-3102', 2),
+    ('Ryder Truck Rental and Leasing', '06457-3834', 2),
+    ('U-Haul CO', '78758-7841', 2),
+    ('Scrivener Performance Engineering', '38701-8047', 2),
+    ('Suburban Ford', '53546-9427', 2),
+    ('Nebo Chevrolet', '06457-3834', 1),
+    ('Pars Auto Sales', '38701-8047', 1),
+    ('New Castle Ford Lincoln Mercury', '60504-7114', 1),
+    ('McKinney Dodge Chrysler Jeep', '85257-3102', 1),
+    ('Hatfield Volkswagen', '99301-3882', 1),
+    ('Gartner Buick Hyundai Saab', '38701-8047', 1),
+    ('Capitol KIA', '38701-8047', 1),
+    ('Pitre Buick-Pontiac-Gmc of Scottsdale', '99301-3882', 1),
+    ('Clay Johnson Auto Sales', '78758-7841', 1),
+    ("Buddy Storbeck's Diesel Service Inc", '06457-3834', 1),
+    ('Iceberg Rentals', '53546-9427', 1),
+    ('Motor Vehicle Branch Office', '78758-7841', 1),
+    ('Chrysler of Tri-Cities', '99301-3882', 1),
+    ('C & M Motors Inc', '60504-7114', 1),
+    ('Enterprise Rent A Car', '60504-7114', 1),
+    ('Chrysler Plymouth', '53546-9427', 1),
+    ('Diehl Motor CO Inc', '06457-3834', 1),
+    ('Classic Chevy', '85257-3102', 1),
+]
+
+# Região → participação nas vendas (%); as concessionárias vendem em todas
+REGIONS = {
+    'Austin': 17.3, 'Janesville': 16.0, 'Scottsdale': 14.4, 'Pasco': 13.1,
+    'Aurora': 13.1, 'Greenville': 13.1, 'Middletown': 13.0
+}
+
+# Marca → (participação em ‰, preço mediano, [(modelo, carroceria)] do mais ao menos vendido)
+COMPANIES = {
+    'Chevrolet': (76, 22000, [('Prizm', 'Hardtop'), ('Metro', 'Passenger'), ('Corvette', 'SUV'), ('Malibu', 'Hardtop'), ('Cavalier', 'SUV'), ('Lumina', 'Passenger'), ('Monte Carlo', 'Hatchback'), ('Camaro', 'Sedan'), ('Impala', 'Hatchback')]),
+    'Dodge': (70, 23000, [('Ram Pickup', 'Hardtop'), ('Durango', 'SUV'), ('Viper', 'SUV'), ('Ram Van', 'Hatchback'), ('Caravan', 'Hardtop'), ('Avenger', 'Passenger'), ('Ram Wagon', 'Passenger'), ('Stratus', 'Hatchback'), ('Intrepid', 'Sedan'), ('Dakota', 'Sedan'), ('Neon', 'Hardtop')]),
+    'Ford': (68, 22200, [('Explorer', 'Hatchback'), ('Expedition', 'SUV'), ('Mustang', 'Hatchback'), ('Taurus', 'SUV'), ('Crown Victoria', 'Passenger'), ('Focus', 'Hardtop'), ('Windstar', 'Sedan'), ('Ranger', 'Hardtop'), ('Contour', 'Sedan'), ('F-Series', 'Passenger'), ('Escort', 'Passenger')]),
+    'Volkswagen': (56, 22000, [('Passat', 'Hatchback'), ('Jetta', 'Passenger'), ('GTI', 'SUV'), ('Cabrio', 'Sedan'), ('Golf', 'Hardtop'), ('Beetle', 'Hardtop')]),
+    'Mercedes-B': (54, 22000, [('S-Class', 'SUV'), ('SLK', 'Passenger'), ('SL-Class', 'Hardtop'), ('C-Class', 'Hatchback'), ('CL500', 'SUV'), ('SLK230', 'Hatchback'), ('M-Class', 'Hardtop'), ('E-Class', 'Sedan'), ('CLK Coupe', 'Sedan')]),
+    'Mitsubishi': (53, 21500, [('Diamante', 'Hatchback'), ('3000GT', 'Sedan'), ('Montero Sport', 'Hardtop'), ('Eclipse', 'Hardtop'), ('Galant', 'Passenger'), ('Montero', 'SUV'), ('Mirage', 'SUV')]),
+    'Chrysler': (47, 22000, [('LHS', 'Hatchback'), ('300M', 'SUV'), ('Concorde', 'Hardtop'), ('Sebring Coupe', 'Sedan'), ('Cirrus', 'Passenger'), ('Town & Country', 'Sedan'), ('Sebring Conv.', 'SUV')]),
+    'Oldsmobile': (46, 26700, [('Silhouette', 'Sedan'), ('Bravada', 'Hatchback'), ('Cutlass', 'Sedan'), ('Intrigue', 'SUV'), ('Aurora', 'Passenger'), ('Alero', 'Hardtop')]),
+    'Toyota': (46, 27000, [('Tacoma', 'Hardtop'), ('Celica', 'SUV'), ('Camry', 'Hatchback'), ('Sienna', 'Passenger'), ('RAV4', 'Hatchback'), ('Land Cruiser', 'SUV'), ('Corolla', 'Passenger'), ('4Runner', 'Sedan'), ('Avalon', 'Sedan')]),
+    'Nissan': (37, 21000, [('Pathfinder', 'Hardtop'), ('Frontier', 'Hatchback'), ('Maxima', 'Sedan'), ('Quest', 'SUV'), ('Xterra', 'Passenger'), ('Altima', 'Hatchback'), ('Sentra', 'Passenger')]),
+    'Mercury': (37, 22300, [('Grand Marquis', 'SUV'), ('Sable', 'Sedan'), ('Cougar', 'Hatchback'), ('Villager', 'Passenger'), ('Mountaineer', 'Hardtop'), ('Mystique', 'Passenger')]),
+    'Lexus': (34, 27000, [('LS400', 'Sedan'), ('GS400', 'Hatchback'), ('LX470', 'SUV'), ('ES300', 'Hardtop'), ('GS300', 'Passenger'), ('RX300', 'Hardtop')]),
+    'Pontiac': (33, 23300, [('Sunfire', 'Sedan'), ('Bonneville', 'Hatchback'), ('Grand Am', 'SUV'), ('Grand Prix', 'Passenger'), ('Firebird', 'Hardtop')]),
+    'BMW': (33, 21000, [('528i', 'SUV'), ('323i', 'Hatchback'), ('328i', 'Sedan')]),
+    'Volvo': (33, 24000, [('S40', 'Sedan'), ('C70', 'Hatchback'), ('S70', 'Hardtop'), ('S80', 'Sedan'), ('V70', 'Passenger'), ('V40', 'SUV')]),
+    'Honda': (30, 26000, [('Accord', 'Sedan'), ('CR-V', 'SUV'), ('Passport', 'Hardtop'), ('Civic', 'Hatchback'), ('Odyssey', 'Passenger')]),
+    'Acura': (29, 24000, [('RL', 'SUV'), ('TL', 'Hatchback'), ('Integra', 'Passenger')]),
+    'Cadillac': (27, 34000, [('Eldorado', 'Passenger'), ('Escalade', 'Sedan'), ('Catera', 'Hatchback'), ('Seville', 'Hardtop'), ('DeVille', 'SUV')]),
+    'Plymouth': (26, 22000, [('Neon', 'SUV'), ('Voyager', 'Passenger'), ('Prowler', 'Hatchback'), ('Breeze', 'Hardtop')]),
+    'Saturn': (25, 25100, [('LW', 'Hatchback'), ('SC', 'Hardtop'), ('LS', 'Sedan'), ('SW', 'Passenger'), ('SL', 'SUV')]),
+    'Lincoln': (21, 26000, [('Continental', 'Passenger'), ('Town car', 'Hatchback'), ('Navigator', 'Sedan')]),
+    'Audi': (20, 24000, [('A6', 'SUV'), ('A4', 'Hardtop'), ('A8', 'Passenger')]),
+    'Buick': (18, 29000, [('Park Avenue', 'Hatchback'), ('Regal', 'Passenger'), ('Century', 'Hardtop'), ('LeSabre', 'Sedan')]),
+    'Subaru': (17, 22000, [('Forester', 'Hardtop'), ('Outback', 'SUV')]),
+    'Jeep': (15, 19000, [('Wrangler', 'Hatchback'), ('Grand Cherokee', 'SUV'), ('Cherokee', 'Sedan')]),
+    'Porsche': (15, 22000, [('Carrera Coupe', 'Hardtop'), ('Carrera Cabrio', 'Passenger'), ('Boxter', 'SUV')]),
+    'Hyundai': (11, 20000, [('Sonata', 'SUV'), ('Elantra', 'Sedan'), ('Accent', 'Hatchback')]),
+    'Saab': (9, 27200, [('3-Sep', 'Sedan'), ('5-Sep', 'Hatchback')]),
+    'Infiniti': (8, 22000, [('I30', 'Hardtop')]),
+    'Jaguar': (8, 21000, [('S-Type', 'Passenger')]),
+}
+
+# Sazonalidade: participação de cada mês (jan..dez) e dia da semana (seg..dom)
+MONTH_WEIGHTS = [3.3, 3.1, 6.4, 6.9, 7.9, 7.2, 7.2, 7.1, 13.8, 7.7, 14.5, 14.8]
+WEEKDAY_WEIGHTS = [16.7, 18.5, 13.6, 5.6, 11.1, 17.4, 17.1]
+
+# Motor e câmbio andam juntos na base original (texto do motor como no CSV)
+ENGINES = {'Auto': 'Double\u00c2\u00a0Overhead Camshaft', 'Manual': 'Overhead Camshaft'}
+
+GENDERS = {'Male': 78.6, 'Female': 21.4}
+COLORS = {'Pale White': 47.1, 'Black': 32.9, 'Red': 20.0}
+
+CUSTOMER_NAMES = [
+    'Thomas', 'Emma', 'Lucas', 'Nathan', 'Louis', 'Lea', 'Chloe', 'Paul', 'Theo', 'Sarah',
+    'Hugo', 'Leo', 'Alexis', 'Dylan', 'Victor', 'Camille', 'Benjamin', 'Samuel', 'Antoine',
+    'Jordan', 'Julie', 'Anthony', 'Riley', 'Eva', 'Laura', 'Zoe', 'Noah', 'Nicolas', 'Alice',
+    'Gabriel', 'Ryan', 'Charlotte', 'Tristan', 'Evan', 'Ariel', 'Jade', 'William', 'Clara'
+]
+
+# Renda anual: ~22% no piso da base (13.500) e o restante log-normal
+INCOME_FLOOR, INCOME_FLOOR_SHARE = 13_500, 0.22
+INCOME_MEDIAN, INCOME_SIGMA = 850_000, 0.65
+INCOME_LIMITS = (10_080, 11_200_000)
+
+PRICE_SIGMA = 0.5
+PRICE_LIMITS = (1_200, 85_800)
+
+
+def _probabilities(weights):
+    weights = np.asarray(weights, dtype='float64')
+    return weights / weights.sum()
+
+
+def _catalog():
+    """Arrays do catálogo: modelo, marca, carroceria, preço mediano e probabilidade"""
+    rows = []
+    company_share = _probabilities([share for share, _, _ in COMPANIES.values()])
+    for (company, (_, price, models)), share in zip(COMPANIES.items(), company_share):
+        # Dentro da marca, o modelo de posição k vende proporcional a 1/(k+1)
+        model_share = _probabilities([1 / (rank + 1) for rank in range(len(models))])
+        for (model, body_style), within in zip(models, model_share):
+            rows.append((company, model, body_style, price, share * within))
+    return pd.DataFrame(rows, columns=['Company', 'Model', 'Body Style', 'Mediana', 'p'])
+
+
+def _calendar(start, end):
+    """Dias do período, rótulos no formato do CSV (m/d/AAAA) e probabilidade de cada dia"""
+    days = pd.date_range(start, end, freq='D')
+    weights = (np.take(MONTH_WEIGHTS, days.month - 1) / days.days_in_month
+               * np.take(WEEKDAY_WEIGHTS, days.dayofweek))
+    labels = np.array([f'{d.month}/{d.day}/{d.year}' for d in days], dtype=object)
+    return labels, _probabilities(weights)
+
+
+def generate_chunk(rng, first_id, rows, catalog, calendar):
+    """Um bloco de `rows` vendas a partir do identificador `first_id`"""
+    labels, day_p = calendar
+    dealer_names = np.array([name for name, _, _ in DEALERS], dtype=object)
+    dealer_numbers = np.array([number for _, number, _ in DEALERS], dtype=object)
+
+    # Datas ordenadas dentro do bloco, como no arquivo original
+    day = np.sort(rng.choice(len(labels), rows, p=day_p))
+    dealer = rng.choice(len(DEALERS), rows, p=_probabilities([w for _, _, w in DEALERS]))
+    model = rng.choice(len(catalog), rows, p=catalog['p'].to_numpy())
+    transmission = rng.choice(list(ENGINES), rows, p=[0.526, 0.474])
+
+    income = np.exp(rng.normal(np.log(INCOME_MEDIAN), INCOME_SIGMA, rows)).round(-3)
+    income = np.where(rng.random(rows) < INCOME_FLOOR_SHARE, INCOME_FLOOR, income)
+    price = catalog['Mediana'].to_numpy()[model] * np.exp(rng.normal(0, PRICE_SIGMA, rows))
+
+    return pd.DataFrame({
+        'Car_id': [f'C_CND_{i:06d}' for i in range(first_id, first_id + rows)],
+        'Date': labels[day],
+        'Customer Name': rng.choice(CUSTOMER_NAMES, rows),
+        'Gender': rng.choice(list(GENDERS), rows, p=_probabilities(list(GENDERS.values()))),
+        'Annual Income': np.clip(income, *INCOME_LIMITS).astype('int64'),
+        'Dealer_Name': dealer_names[dealer],
+        'Company': catalog['Company'].to_numpy()[model],
+        'Model': catalog['Model'].to_numpy()[model],
+        'Engine': pd.Series(transmission).map(ENGINES).to_numpy(),
+        'Transmission': transmission,
+        'Color': rng.choice(list(COLORS), rows, p=_probabilities(list(COLORS.values()))),
+        'Price ($)': np.clip(price.round(-2), *PRICE_LIMITS).astype('int64'),
+        'Dealer_No ': dealer_numbers[dealer],
+        'Body Style': catalog['Body Style'].to_numpy()[model],
+        'Phone': rng.integers(6_000_000, 10_000_000, rows),
+        'Dealer_Region': rng.choice(list(REGIONS), rows, p=_probabilities(list(REGIONS.values())))
+    }, columns=COLUMNS)
+
+
+def generate_sales(rows, seed=42, start='2022-01-01', end='2023-12-31'):
+    """Gera as vendas em blocos de CHUNK_ROWS linhas (iterador de DataFrames)"""
+    catalog = _catalog()
+    calendar = _calendar(start, end)
+    for index, first in enumerate(range(0, rows, CHUNK_ROWS)):
+        rng = np.random.default_rng([seed, index])
+        yield generate_chunk(rng, first + 1, min(CHUNK_ROWS, rows - first), catalog, calendar)
+
+
+def write_sales_csv(path, rows, seed=42, start='2022-01-01', end='2023-12-31'):
+    """Grava o CSV sintético bloco a bloco; retorna o número de linhas gravadas"""
+    total = 0
+    for index, chunk in enumerate(generate_sales(rows, seed, start, end)):
+        chunk.to_csv(path, mode='w' if index == 0 else 'a', header=index == 0, index=False)
+        total += len(chunk)
+    return total
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gera um car_sales.csv sintético e determinístico")
+    parser.add_argument('--rows', type=int, default=1_000_000, help="Quantidade de vendas")
+    parser.add_argument('--output', default='car_sales_synthetic.csv', help="Arquivo CSV de saída")
+    parser.add_argument('--seed', type=int, default=42, help="Semente (mesma semente = mesmo arquivo)")
+    parser.add_argument('--start', default='2022-01-01', help="Primeira data de venda (AAAA-MM-DD)")
+    parser.add_argument('--end', default='2023-12-31', help="Última data de venda (AAAA-MM-DD)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    print(f"→ Gerando {args.rows:,} vendas sintéticas em {args.output} (semente {args.seed})...")
+    start = time.perf_counter()
+    total = write_sales_csv(args.output, args.rows, args.seed, args.start, args.end)
+    print(f"✓ {total:,} linhas gravadas em {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
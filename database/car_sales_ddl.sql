@@ -117,11 +117,12 @@ DROP VIEW IF EXISTS vw_customer_profile;
 CREATE VIEW vw_customer_profile AS
 SELECT 
     gender,
+    -- Faixas de renda: mesmo CASE de dataframes/income_brackets.py (sql_case)
     CASE 
         WHEN annual_income < 50000 THEN 'Baixa (< 50k)'
-        WHEN annual_income BETWEEN 50000 AND 100000 THEN 'Média-Baixa (50k-100k)'
-        WHEN annual_income BETWEEN 100001 AND 500000 THEN 'Média (100k-500k)'
-        WHEN annual_income BETWEEN 500001 AND 1000000 THEN 'Média-Alta (500k-1M)'
+        WHEN annual_income < 100000 THEN 'Média-Baixa (50k-100k)'
+        WHEN annual_income < 500000 THEN 'Média (100k-500k)'
+        WHEN annual_income < 1000000 THEN 'Média-Alta (500k-1M)'
         ELSE 'Alta (> 1M)'
     END AS income_bracket,
     COUNT(car_id) AS customer_count,
@@ -136,11 +137,12 @@ ORDER BY gender, avg_income;
 DROP VIEW IF EXISTS vw_income_preferences;
 CREATE VIEW vw_income_preferences AS
 SELECT 
+    -- Faixas de renda: mesmo CASE de dataframes/income_brackets.py (sql_case)
     CASE 
         WHEN annual_income < 50000 THEN 'Baixa (< 50k)'
-        WHEN annual_income BETWEEN 50000 AND 100000 THEN 'Média-Baixa (50k-100k)'
-        WHEN annual_income BETWEEN 100001 AND 500000 THEN 'Média (100k-500k)'
-        WHEN annual_income BETWEEN 500001 AND 1000000 THEN 'Média-Alta (500k-1M)'
+        WHEN annual_income < 100000 THEN 'Média-Baixa (50k-100k)'
+        WHEN annual_income < 500000 THEN 'Média (100k-500k)'
+        WHEN annual_income < 1000000 THEN 'Média-Alta (500k-1M)'
         ELSE 'Alta (> 1M)'
     END AS income_bracket,
     company,
@@ -252,6 +254,191 @@ CREATE TABLE fact_sales (
     INDEX idx_price (price)
 ) ENGINE=InnoDB COMMENT='Tabela fato de vendas para análise OLAP';
 
+-- ============================================================================
+-- CONTROLE DE CARGA INCREMENTAL
+-- ============================================================================
+
+-- Estado da última carga por arquivo de origem (marca d'água e checksum)
+DROP TABLE IF EXISTS etl_load_state;
+CREATE TABLE etl_load_state (
+    source VARCHAR(255) PRIMARY KEY COMMENT 'Arquivo de origem da carga',
+    file_checksum CHAR(64) NOT NULL COMMENT 'SHA-256 do arquivo na última carga',
+    max_sale_date DATE COMMENT 'Marca d''água: maior sale_date carregada',
+    rows_loaded INT NOT NULL DEFAULT 0 COMMENT 'Registros enviados pela última carga (CSV inteiro ou delta)',
+    loaded_at DATETIME NOT NULL COMMENT 'Data/hora da última carga'
+) ENGINE=InnoDB COMMENT='Controle de cargas incrementais do ETL';
+
+-- ============================================================================
+-- TABELAS DE RESUMO (VIEWS MATERIALIZADAS)
+-- ============================================================================
+-- Resultado das views vw_* pré-agregado por mês de venda (sale_month) e
+-- atualizado pelo ETL (database/summary_tables.py): na carga completa todas
+-- as linhas são recalculadas; na incremental, apenas os meses afetados.
+-- As views mv_* consultam estas tabelas em vez de varrer car_sales.
+
+-- Resumo mensal (vw_sales_performance)
+DROP TABLE IF EXISTS sum_sales_monthly;
+CREATE TABLE sum_sales_monthly (
+    sale_month CHAR(7) PRIMARY KEY COMMENT 'Mês da venda (AAAA-MM)',
+    year INT NOT NULL,
+    month INT NOT NULL,
+    quarter INT NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(16,2) NOT NULL,
+    min_price DECIMAL(10,2),
+    max_price DECIMAL(10,2)
+) ENGINE=InnoDB COMMENT='Resumo mensal de vendas';
+
+-- Resumo por marca e modelo (vw_sales_by_model)
+DROP TABLE IF EXISTS sum_sales_model;
+CREATE TABLE sum_sales_model (
+    sale_month CHAR(7) NOT NULL,
+    company VARCHAR(50) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(16,2) NOT NULL,
+    min_price DECIMAL(10,2),
+    max_price DECIMAL(10,2),
+    PRIMARY KEY (sale_month, company, model)
+) ENGINE=InnoDB COMMENT='Resumo mensal por marca e modelo';
+
+-- Resumo por concessionária (vw_regional_analysis, vw_dealer_ranking)
+DROP TABLE IF EXISTS sum_sales_dealer;
+CREATE TABLE sum_sales_dealer (
+    sale_month CHAR(7) NOT NULL,
+    dealer_region VARCHAR(50) NOT NULL,
+    dealer_name VARCHAR(100) NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(16,2) NOT NULL,
+    PRIMARY KEY (sale_month, dealer_region, dealer_name)
+) ENGINE=InnoDB COMMENT='Resumo mensal por concessionária';
+
+-- Resumo por faixa de renda (vw_customer_profile, vw_income_preferences)
+DROP TABLE IF EXISTS sum_sales_income;
+CREATE TABLE sum_sales_income (
+    sale_month CHAR(7) NOT NULL,
+    gender ENUM('Male', 'Female') NOT NULL,
+    income_bracket VARCHAR(50) NOT NULL,
+    company VARCHAR(50) NOT NULL,
+    model VARCHAR(100) NOT NULL,
+    body_style VARCHAR(30) NOT NULL,
+    sales_count INT NOT NULL,
+    total_revenue DECIMAL(16,2) NOT NULL,
+    total_income DECIMAL(18,2) NOT NULL,
+    total_effort DOUBLE NOT NULL COMMENT 'Soma de price / annual_income',
+    PRIMARY KEY (sale_month, gender, income_bracket, company, model, body_style)
+) ENGINE=InnoDB COMMENT='Resumo mensal por perfil de renda e veículo';
+
+-- Última atualização de cada tabela de resumo
+DROP TABLE IF EXISTS summary_refresh_state;
+CREATE TABLE summary_refresh_state (
+    summary_table VARCHAR(64) PRIMARY KEY,
+    refreshed_at DATETIME NOT NULL COMMENT 'Data/hora da última atualização',
+    refresh_mode ENUM('full', 'incremental') NOT NULL,
+    months_refreshed INT COMMENT 'Meses recalculados (NULL na atualização completa)',
+    rows_refreshed INT NOT NULL DEFAULT 0
+) ENGINE=InnoDB COMMENT='Controle de atualização das tabelas de resumo';
+
+-- Defasagem: resumos atualizados antes da última carga estão desatualizados
+DROP VIEW IF EXISTS vw_summary_staleness;
+CREATE VIEW vw_summary_staleness AS
+SELECT
+    s.summary_table,
+    s.refresh_mode,
+    s.refreshed_at,
+    l.last_load_at,
+    l.last_load_at IS NOT NULL AND s.refreshed_at < l.last_load_at AS is_stale
+FROM summary_refresh_state s
+CROSS JOIN (SELECT MAX(loaded_at) AS last_load_at FROM etl_load_state) l;
+
+-- View 1 (materializada): Desempenho de vendas por mês
+DROP VIEW IF EXISTS mv_sales_performance;
+CREATE VIEW mv_sales_performance AS
+SELECT
+    sale_month,
+    year,
+    month,
+    quarter,
+    sales_count AS total_sales_volume,
+    total_revenue,
+    total_revenue / sales_count AS average_ticket,
+    min_price,
+    max_price
+FROM sum_sales_monthly
+ORDER BY sale_month;
+
+-- View 2 (materializada): Vendas por modelo e marca
+DROP VIEW IF EXISTS mv_sales_by_model;
+CREATE VIEW mv_sales_by_model AS
+SELECT
+    company,
+    model,
+    SUM(sales_count) AS sales_count,
+    SUM(total_revenue) AS total_revenue,
+    SUM(total_revenue) / SUM(sales_count) AS average_price,
+    MIN(min_price) AS min_price,
+    MAX(max_price) AS max_price
+FROM sum_sales_model
+GROUP BY company, model
+ORDER BY sales_count DESC;
+
+-- View 3 (materializada): Análise regional (percentual via janela, sem subconsulta)
+DROP VIEW IF EXISTS mv_regional_analysis;
+CREATE VIEW mv_regional_analysis AS
+SELECT
+    dealer_region,
+    dealer_name,
+    SUM(sales_count) AS sales_volume,
+    SUM(total_revenue) AS total_revenue,
+    SUM(total_revenue) / SUM(sales_count) AS average_ticket,
+    ROUND(SUM(total_revenue) * 100.0 / SUM(SUM(total_revenue)) OVER (), 2) AS revenue_percentage
+FROM sum_sales_dealer
+GROUP BY dealer_region, dealer_name
+ORDER BY total_revenue DESC;
+
+-- View 4 (materializada): Perfil do cliente
+DROP VIEW IF EXISTS mv_customer_profile;
+CREATE VIEW mv_customer_profile AS
+SELECT
+    gender,
+    income_bracket,
+    SUM(sales_count) AS customer_count,
+    SUM(total_revenue) / SUM(sales_count) AS avg_purchase_price,
+    SUM(total_income) / SUM(sales_count) AS avg_income,
+    SUM(total_effort) / SUM(sales_count) AS financial_effort_index
+FROM sum_sales_income
+GROUP BY gender, income_bracket
+ORDER BY gender, avg_income;
+
+-- View 5 (materializada): Preferências por faixa de renda
+DROP VIEW IF EXISTS mv_income_preferences;
+CREATE VIEW mv_income_preferences AS
+SELECT
+    income_bracket,
+    company,
+    model,
+    body_style,
+    SUM(sales_count) AS purchase_count,
+    SUM(total_revenue) / SUM(sales_count) AS avg_price
+FROM sum_sales_income
+GROUP BY income_bracket, company, model, body_style
+ORDER BY income_bracket, purchase_count DESC;
+
+-- View 6 (materializada): Ranking de concessionárias
+DROP VIEW IF EXISTS mv_dealer_ranking;
+CREATE VIEW mv_dealer_ranking AS
+SELECT
+    RANK() OVER (ORDER BY SUM(sales_count) DESC) AS ranking_volume,
+    RANK() OVER (ORDER BY SUM(total_revenue) DESC) AS ranking_revenue,
+    dealer_name,
+    dealer_region,
+    SUM(sales_count) AS sales_volume,
+    SUM(total_revenue) AS total_revenue,
+    SUM(total_revenue) / SUM(sales_count) AS average_ticket
+FROM sum_sales_dealer
+GROUP BY dealer_name, dealer_region
+ORDER BY sales_volume DESC;
+
 -- ============================================================================
 -- FIM DO SCRIPT DDL
 -- ============================================================================
@@ -26,6 +26,10 @@ USE car_sales_db;
 -- PARTE 2: POPULAR DIMENSÕES PARA MODELO STAR SCHEMA
 -- ============================================================================
 
+-- NOTA: O load_data.py popula dimensões e fato via dimension_loader.py, com as
+-- chaves substitutas resolvidas em memória (somente membros novos são inseridos).
+-- Os comandos abaixo reconstroem tudo a partir de car_sales e servem para carga manual.
+
 -- Popular Dimensão Tempo
 INSERT INTO dim_time (date_key, day, month, quarter, year, month_name, quarter_name, day_of_week, day_name, is_weekend)
 SELECT DISTINCT
@@ -47,11 +51,12 @@ INSERT INTO dim_customer (customer_name, gender, income_bracket, annual_income,
 SELECT DISTINCT
     customer_name,
     gender,
+    -- Faixas de renda: mesmo CASE de dataframes/income_brackets.py (sql_case)
     CASE 
         WHEN annual_income < 50000 THEN 'Baixa (< 50k)'
-        WHEN annual_income BETWEEN 50000 AND 100000 THEN 'Média-Baixa (50k-100k)'
-        WHEN annual_income BETWEEN 100001 AND 500000 THEN 'Média (100k-500k)'
-        WHEN annual_income BETWEEN 500001 AND 1000000 THEN 'Média-Alta (500k-1M)'
+        WHEN annual_income < 100000 THEN 'Média-Baixa (50k-100k)'
+        WHEN annual_income < 500000 THEN 'Média (100k-500k)'
+        WHEN annual_income < 1000000 THEN 'Média-Alta (500k-1M)'
         ELSE 'Alta (> 1M)'
     END AS income_bracket,
     annual_income,
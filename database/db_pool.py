@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Pool de Conexões MySQL
+Descrição: Pool de conexões compartilhado pelo ETL (load_data.py,
+           summary_tables.py) e pela origem MySQL dos DataFrames
+           (dataframes/db_source.py), configurado por variáveis de ambiente
+============================================================================
+
+Variáveis de ambiente:
+    MYSQL_HOST, MYSQL_PORT, MYSQL_USER, MYSQL_PASSWORD, MYSQL_DATABASE
+    MYSQL_POOL_NAME, MYSQL_POOL_SIZE, MYSQL_POOL_TIMEOUT (segundos)
+"""
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
+
+
+def db_config():
+    """Configuração de conexão lida das variáveis de ambiente"""
+    return {
+        'host': os.getenv('MYSQL_HOST', 'localhost'),
+        'port': int(os.getenv('MYSQL_PORT', '3306')),
+        'user': os.getenv('MYSQL_USER', 'root'),
+        'password': os.getenv('MYSQL_PASSWORD', 'senha'),
+        'database': os.getenv('MYSQL_DATABASE', 'car_sales_db')
+    }
+
+
+POOL_NAME = os.getenv('MYSQL_POOL_NAME', 'car_sales_pool')
+POOL_SIZE = int(os.getenv('MYSQL_POOL_SIZE', '5'))
+POOL_TIMEOUT = float(os.getenv('MYSQL_POOL_TIMEOUT', '10'))
+
+# Limite de conexões de um pool do conector (init_pool não passa disto)
+MAX_POOL_SIZE = pooling.CNX_POOL_MAXSIZE
+
+_pool = None
+_lock = threading.Lock()
+_metrics = {
+    'checkouts': 0,
+    'in_use': 0,
+    'max_in_use': 0,
+    'waits': 0,
+    'wait_seconds': 0.0,
+    'reconnects': 0,
+    'failures': 0
+}
+
+
+def init_pool(pool_size=None, **options):
+    """Cria o pool (uma vez por processo); `options` são repassadas ao conector
+
+    O tamanho é limitado a MAX_POOL_SIZE: quem precisa de mais conexões
+    simultâneas (ex.: workers da carga paralela) deve validar antes.
+    """
+    global _pool
+    with _lock:
+        if _pool is None:
+            size = min(pool_size or POOL_SIZE, MAX_POOL_SIZE)
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME,
+                pool_size=size,
+                pool_reset_session=True,
+                **db_config(),
+                **options
+            )
+        return _pool
+
+
+def get_pool():
+    """Retorna o pool do processo, criando-o com a configuração padrão se preciso"""
+    return _pool or init_pool()
+
+
+def _update(**changes):
+    with _lock:
+        for name, delta in changes.items():
+            _metrics[name] += delta
+        _metrics['max_in_use'] = max(_metrics['max_in_use'], _metrics['in_use'])
+
+
+def acquire_connection(timeout=None):
+    """Empresta uma conexão ativa do pool; devolva com connection.close()
+
+    Aguarda até `timeout` segundos quando o pool está esgotado e reconecta
+    conexões que o servidor derrubou (health check antes de entregar).
+    """
+    pool = get_pool()
+    deadline = time.monotonic() + (POOL_TIMEOUT if timeout is None else timeout)
+    start = time.monotonic()
+    waited = False
+    while True:
+        try:
+            connection = pool.get_connection()
+            break
+        except PoolError:
+            if time.monotonic() >= deadline:
+                _update(failures=1)
+                raise
+            waited = True
+            time.sleep(0.05)
+        except Error:
+            _update(failures=1)
+            raise
+
+    if waited:
+        _update(waits=1, wait_seconds=time.monotonic() - start)
+
+    try:
+        if not connection.is_connected():
+            connection.reconnect(attempts=3, delay=1)
+            _update(reconnects=1)
+    except Error:
+        connection.close()
+        _update(failures=1)
+        raise
+
+    _update(checkouts=1, in_use=1)
+    return _Tracked(connection)
+
+
+class _Tracked:
+    """Conexão emprestada do pool que atualiza as métricas ao ser devolvida"""
+
+    def __init__(self, connection):
+        self._connection = connection
+        self._returned = False
+
+    def close(self):
+        if not self._returned:
+            self._returned = True
+            _update(in_use=-1)
+            self._connection.close()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+@contextmanager
+def pooled_connection(timeout=None):
+    """Context manager que empresta uma conexão do pool e a devolve ao final"""
+    connection = acquire_connection(timeout)
+    try:
+        yield connection
+    except Error:
+        _update(failures=1)
+        try:
+            connection.rollback()
+        except Error:
+            pass
+        raise
+    finally:
+        connection.close()
+
+
+def health_check():
+    """Verifica se o banco responde através do pool"""
+    try:
+        with pooled_connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+        return True
+    except Error:
+        return False
+
+
+def pool_metrics():
+    """Métricas do pool: empréstimos, conexões em uso, esperas, reconexões e falhas"""
+    with _lock:
+        metrics = dict(_metrics)
+    metrics['pool_name'] = POOL_NAME
+    metrics['pool_size'] = _pool.pool_size if _pool is not None else 0
+    return metrics
+
+
+def read_frame(query, params=None):
+    """Executa uma consulta usando o pool e retorna o resultado como DataFrame"""
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        cursor.execute(query, params)
+        rows = cursor.fetchall()
+        columns = cursor.column_names
+        cursor.close()
+    return pd.DataFrame(rows, columns=columns)
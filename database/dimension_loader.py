@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Carga das Dimensões e da Tabela Fato (Star Schema)
+Descrição: Popula dim_time, dim_customer, dim_dealer, dim_vehicle e
+           fact_sales a partir dos registros transformados de car_sales,
+           resolvendo as chaves substitutas em memória
+============================================================================
+"""
+
+import sys
+from decimal import Decimal
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Faixas de renda compartilhadas com a geração dos DataFrames (dataframes/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dataframes'))
+
+from income_brackets import income_bracket  # noqa: E402
+
+# Dimensões com chave substituta: chave natural e colunas derivadas
+DIMENSIONS = {
+    'dim_customer': {
+        'key': 'customer_key',
+        'natural_key': ['customer_name', 'gender', 'annual_income', 'phone'],
+        'derived': {
+            'income_bracket': lambda df: income_bracket(df['annual_income']).astype(str)
+        }
+    },
+    'dim_dealer': {
+        'key': 'dealer_key',
+        'natural_key': ['dealer_name', 'dealer_no', 'dealer_region'],
+        'derived': {}
+    },
+    'dim_vehicle': {
+        'key': 'vehicle_key',
+        'natural_key': ['company', 'model', 'body_style', 'engine', 'transmission', 'color'],
+        'derived': {}
+    }
+}
+
+DIM_TIME_COLUMNS = [
+    'date_key', 'day', 'month', 'quarter', 'year', 'month_name',
+    'quarter_name', 'day_of_week', 'day_name', 'is_weekend'
+]
+
+FACT_QUERY = """
+INSERT INTO fact_sales (
+    car_id, date_key, customer_key, dealer_key, vehicle_key,
+    price, annual_income, financial_effort_ratio
+) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    date_key = VALUES(date_key),
+    customer_key = VALUES(customer_key),
+    dealer_key = VALUES(dealer_key),
+    vehicle_key = VALUES(vehicle_key),
+    price = VALUES(price),
+    annual_income = VALUES(annual_income),
+    financial_effort_ratio = VALUES(financial_effort_ratio)
+"""
+
+
+def _normalize(value):
+    """Uniformiza valores vindos do MySQL e do pandas para uso como chave de dicionário"""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def _rows(frame):
+    """Converte um DataFrame em tuplas de tipos Python (NaN → None)"""
+    return [tuple(_normalize(v) for v in row) for row in zip(*(frame[c].tolist() for c in frame.columns))]
+
+
+class DimensionLoader:
+    """Mantém os mapas chave natural → chave substituta e carrega dimensões e fato
+
+    Os mapas são lidos do banco uma única vez (load_existing); a cada chamada de
+    load() apenas os membros novos recebem chave e são inseridos, e as linhas de
+    fact_sales já saem com as chaves resolvidas, sem JOIN por colunas de texto.
+    """
+
+    def __init__(self, batch_size=1000):
+        self.batch_size = batch_size
+        self.key_maps = {table: {} for table in DIMENSIONS}
+        self.next_keys = {table: 1 for table in DIMENSIONS}
+        self.dates = set()
+
+    def load_existing(self, connection):
+        """Carrega os membros já existentes das dimensões"""
+        cursor = connection.cursor()
+
+        for table, spec in DIMENSIONS.items():
+            cursor.execute(f"SELECT {spec['key']}, {', '.join(spec['natural_key'])} FROM {table}")
+            key_map = self.key_maps[table]
+            for key, *natural in cursor.fetchall():
+                key_map[tuple(_normalize(v) for v in natural)] = key
+            self.next_keys[table] = max(key_map.values(), default=0) + 1
+
+        cursor.execute("SELECT date_key FROM dim_time")
+        self.dates = {row[0] for row in cursor.fetchall()}
+
+        cursor.close()
+        print(f"✓ Dimensões carregadas em memória: "
+              + ", ".join(f"{table} ({len(m)})" for table, m in self.key_maps.items())
+              + f", dim_time ({len(self.dates)})")
+
+    def _insert(self, cursor, query, rows):
+        for i in range(0, len(rows), self.batch_size):
+            cursor.executemany(query, rows[i:i + self.batch_size])
+
+    def _load_time(self, cursor, df):
+        """Insere em dim_time apenas as datas ainda não cadastradas"""
+        dates = pd.Series(df['sale_date'].dt.normalize().unique())
+        dates = dates[~dates.dt.date.isin(self.dates)]
+        if dates.empty:
+            return 0
+
+        dow = (dates.dt.dayofweek + 1) % 7 + 1  # DAYOFWEEK do MySQL: 1 = domingo
+        new_rows = pd.DataFrame({
+            'date_key': dates.dt.strftime('%Y-%m-%d'),
+            'day': dates.dt.day,
+            'month': dates.dt.month,
+            'quarter': dates.dt.quarter,
+            'year': dates.dt.year,
+            'month_name': dates.dt.month_name(),
+            'quarter_name': 'Q' + dates.dt.quarter.astype(str),
+            'day_of_week': dow,
+            'day_name': dates.dt.day_name(),
+            'is_weekend': dow.isin([1, 7])
+        })
+        self._insert(cursor, f"""
+            INSERT INTO dim_time ({', '.join(DIM_TIME_COLUMNS)})
+            VALUES ({', '.join(['%s'] * len(DIM_TIME_COLUMNS))})
+        """, _rows(new_rows))
+        self.dates.update(dates.dt.date)
+        return len(new_rows)
+
+    def _resolve(self, cursor, table, df):
+        """Retorna a chave substituta de cada linha, cadastrando os membros novos"""
+        spec = DIMENSIONS[table]
+        key_map = self.key_maps[table]
+        natural = df[spec['natural_key']]
+
+        # Cada combinação distinta é resolvida uma única vez
+        codes = natural.groupby(spec['natural_key'], sort=False, dropna=False).ngroup().to_numpy()
+        unique = natural.drop_duplicates()
+        members = _rows(unique)
+
+        group_keys = np.empty(len(members), dtype=np.int64)
+        new_positions = []
+        for position, member in enumerate(members):
+            key = key_map.get(member)
+            if key is None:
+                key = self.next_keys[table]
+                self.next_keys[table] += 1
+                key_map[member] = key
+                new_positions.append(position)
+            group_keys[position] = key
+
+        if new_positions:
+            new_members = unique.iloc[new_positions]
+            columns = [spec['key'], *spec['natural_key'], *spec['derived']]
+            new_rows = pd.concat([
+                pd.Series(group_keys[new_positions], index=new_members.index, name=spec['key']),
+                new_members,
+                pd.DataFrame({name: derive(new_members) for name, derive in spec['derived'].items()},
+                             index=new_members.index)
+            ], axis=1)[columns]
+            self._insert(cursor, f"""
+                INSERT INTO {table} ({', '.join(columns)})
+                VALUES ({', '.join(['%s'] * len(columns))})
+            """, _rows(new_rows))
+
+        return group_keys[codes], len(new_positions)
+
+    def load(self, connection, df):
+        """Carrega dimensões e fato para as vendas do DataFrame (ou bloco)"""
+        cursor = connection.cursor()
+
+        new_dates = self._load_time(cursor, df)
+        keys = {}
+        new_members = {'dim_time': new_dates}
+        for table, spec in DIMENSIONS.items():
+            keys[spec['key']], new_members[table] = self._resolve(cursor, table, df)
+
+        income = df['annual_income'].astype('float64')
+        price = df['price'].astype('float64')
+        fact = pd.DataFrame({
+            'car_id': df['car_id'],
+            'date_key': df['sale_date'].dt.strftime('%Y-%m-%d'),
+            'customer_key': keys['customer_key'],
+            'dealer_key': keys['dealer_key'],
+            'vehicle_key': keys['vehicle_key'],
+            'price': price,
+            'annual_income': income,
+            'financial_effort_ratio': (price / income).where(income > 0)
+        }, index=df.index)
+        self._insert(cursor, FACT_QUERY, _rows(fact))
+
+        connection.commit()
+        cursor.close()
+
+        print("  → Novos membros: " + ", ".join(f"{t} ({n})" for t, n in new_members.items())
+              + f"; fact_sales ({len(fact)})")
+        return new_members
@@ -10,27 +10,38 @@ Descrição: Script Python para carregar dados do CSV para o MySQL
 """
 
 import pandas as pd
-import mysql.connector
 from mysql.connector import Error
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import csv
+import hashlib
+import os
 import sys
+import tempfile
+from pathlib import Path
 
-# Configurações do banco de dados
-DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',  # Alterar conforme necessário
-    'password': 'senha',  # Alterar conforme necessário
-    'database': 'car_sales_db'
-}
+from db_pool import MAX_POOL_SIZE, acquire_connection, db_config, init_pool, pool_metrics, pooled_connection
+from dimension_loader import DimensionLoader
+from sql_script import is_read_only, split_statements
+from summary_tables import affected_months, refresh_summaries
+
+# Instrumentação compartilhada com a geração dos DataFrames (dataframes/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dataframes'))
+
+from instrumentation import add_arguments, configure_from_args, instrumented, print_summary, span  # noqa: E402
+
+# Configurações do banco de dados (variáveis de ambiente MYSQL_*, ver db_pool.py)
+DB_CONFIG = db_config()
 
 # Arquivo CSV de origem
 CSV_FILE = 'car_sales.csv'
 
 
 def create_connection():
-    """Cria conexão com o banco de dados MySQL"""
+    """Obtém uma conexão com o banco de dados MySQL a partir do pool"""
     try:
-        connection = mysql.connector.connect(**DB_CONFIG)
+        connection = acquire_connection()
         if connection.is_connected():
             print("✓ Conexão com MySQL estabelecida com sucesso")
             return connection
@@ -39,6 +50,78 @@ def create_connection():
         return None
 
 
+# Renomear colunas para corresponder ao schema do banco
+COLUMN_MAPPING = {
+    'Car_id': 'car_id',
+    'Date': 'sale_date',
+    'Customer Name': 'customer_name',
+    'Gender': 'gender',
+    'Annual Income': 'annual_income',
+    'Dealer_Name': 'dealer_name',
+    'Company': 'company',
+    'Model': 'model',
+    'Engine': 'engine',
+    'Transmission': 'transmission',
+    'Color': 'color',
+    'Price ($)': 'price',
+    'Dealer_No': 'dealer_no',
+    'Body Style': 'body_style',
+    'Phone': 'phone',
+    'Dealer_Region': 'dealer_region'
+}
+
+# Tipos explícitos para a leitura em blocos (dimensões de baixa cardinalidade como categóricas)
+CSV_DTYPES = {
+    'Car_id': 'object',
+    'Date': 'object',
+    'Customer Name': 'object',
+    'Gender': 'category',
+    'Annual Income': 'float64',
+    'Dealer_Name': 'object',
+    'Company': 'category',
+    'Model': 'object',
+    'Engine': 'object',
+    'Transmission': 'category',
+    'Color': 'category',
+    'Price ($)': 'float64',
+    'Dealer_No': 'object',
+    'Body Style': 'category',
+    'Phone': 'float64',
+    'Dealer_Region': 'category'
+}
+
+
+@instrumented('etl.transform_data', rows='df')
+def transform_data(df):
+    """Aplica as transformações do ETL a um DataFrame (ou bloco) lido do CSV"""
+    # Converter data para formato MySQL
+    df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y')
+    
+    # Limpar espaços em branco nas colunas
+    df.columns = df.columns.str.strip()
+    
+    df = df.rename(columns=COLUMN_MAPPING)
+    
+    # Tratar valores nulos
+    df['phone'] = df['phone'].fillna(0).astype('int64')
+    
+    # Limpar strings
+    for col in df.select_dtypes(include=['object']).columns:
+        if col not in ['sale_date', 'car_id']:
+            df[col] = df[col].str.strip()
+    
+    # Nas categóricas basta limpar as categorias, não cada valor
+    for col in df.select_dtypes(include=['category']).columns:
+        categories = df[col].cat.categories.str.strip()
+        if categories.is_unique:
+            df[col] = df[col].cat.rename_categories(categories)
+        else:
+            df[col] = df[col].astype(str).str.strip().astype('category')
+    
+    return df
+
+
+@instrumented('etl.load_csv_data', rows=len)
 def load_csv_data(csv_file):
     """Carrega e transforma os dados do CSV"""
     try:
@@ -50,43 +133,7 @@ def load_csv_data(csv_file):
         
         # Transformações necessárias
         print("\n→ Aplicando transformações nos dados...")
-        
-        # Converter data para formato MySQL
-        df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y')
-        
-        # Limpar espaços em branco nas colunas
-        df.columns = df.columns.str.strip()
-        
-        # Renomear colunas para corresponder ao schema do banco
-        column_mapping = {
-            'Car_id': 'car_id',
-            'Date': 'sale_date',
-            'Customer Name': 'customer_name',
-            'Gender': 'gender',
-            'Annual Income': 'annual_income',
-            'Dealer_Name': 'dealer_name',
-            'Company': 'company',
-            'Model': 'model',
-            'Engine': 'engine',
-            'Transmission': 'transmission',
-            'Color': 'color',
-            'Price ($)': 'price',
-            'Dealer_No': 'dealer_no',
-            'Body Style': 'body_style',
-            'Phone': 'phone',
-            'Dealer_Region': 'dealer_region'
-        }
-        
-        df = df.rename(columns=column_mapping)
-        
-        # Tratar valores nulos
-        df['phone'] = df['phone'].fillna(0)
-        
-        # Limpar strings
-        for col in df.select_dtypes(include=['object']).columns:
-            if col not in ['sale_date', 'car_id']:
-                df[col] = df[col].str.strip()
-        
+        df = transform_data(df)
         print("✓ Transformações aplicadas com sucesso")
         
         return df
@@ -96,53 +143,64 @@ def load_csv_data(csv_file):
         return None
 
 
+def iter_csv_chunks(csv_file, chunksize=100000):
+    """Lê o CSV em blocos de tamanho fixo, já transformados, sem carregar o arquivo inteiro"""
+    # O cabeçalho original pode ter espaços (ex.: 'Dealer_No ')
+    header = pd.read_csv(csv_file, nrows=0).columns
+    dtype = {col: CSV_DTYPES[col.strip()] for col in header if col.strip() in CSV_DTYPES}
+    
+    with pd.read_csv(csv_file, dtype=dtype, chunksize=chunksize) as reader:
+        for chunk in reader:
+            yield transform_data(chunk)
+
+
+# Ordem das colunas no INSERT da tabela car_sales
+CAR_SALES_COLUMNS = [
+    'car_id', 'sale_date', 'customer_name', 'gender', 'annual_income', 'phone',
+    'dealer_name', 'dealer_no', 'dealer_region', 'company', 'model', 'body_style',
+    'engine', 'transmission', 'color', 'price'
+]
+
+# Query de inserção
+INSERT_QUERY = f"""
+INSERT INTO car_sales (
+    {', '.join(CAR_SALES_COLUMNS)}
+) VALUES (
+    {', '.join(['%s'] * len(CAR_SALES_COLUMNS))}
+)
+"""
+
+
+def build_records(df, batch_size=1000):
+    """Gera os registros de inserção em lotes, convertendo colunas inteiras de uma vez"""
+    # Conversões vetorizadas (uma única passada por coluna)
+    converted = {
+        'sale_date': df['sale_date'].dt.strftime('%Y-%m-%d'),
+        'annual_income': df['annual_income'].astype('float64'),
+        'phone': df['phone'].astype('int64'),
+        'price': df['price'].astype('float64'),
+    }
+    columns = [converted.get(col, df[col]) for col in CAR_SALES_COLUMNS]
+    
+    # Tuplas montadas apenas para o lote corrente
+    for start in range(0, len(df), batch_size):
+        values = [col.iloc[start:start + batch_size].tolist() for col in columns]
+        yield list(zip(*values))
+
+
+@instrumented('etl.insert_data_batch', rows='df')
 def insert_data_batch(connection, df, batch_size=1000):
     """Insere dados no banco em lotes"""
     try:
         cursor = connection.cursor()
         
-        # Query de inserção
-        insert_query = """
-        INSERT INTO car_sales (
-            car_id, sale_date, customer_name, gender, annual_income, phone,
-            dealer_name, dealer_no, dealer_region, company, model, body_style,
-            engine, transmission, color, price
-        ) VALUES (
-            %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s
-        )
-        """
-        
         total_records = len(df)
         print(f"\n→ Iniciando inserção de {total_records} registros...")
         
-        # Converter DataFrame para lista de tuplas
-        records = []
-        for _, row in df.iterrows():
-            record = (
-                row['car_id'],
-                row['sale_date'].strftime('%Y-%m-%d'),
-                row['customer_name'],
-                row['gender'],
-                float(row['annual_income']),
-                int(row['phone']),
-                row['dealer_name'],
-                row['dealer_no'],
-                row['dealer_region'],
-                row['company'],
-                row['model'],
-                row['body_style'],
-                row['engine'],
-                row['transmission'],
-                row['color'],
-                float(row['price'])
-            )
-            records.append(record)
-        
         # Inserir em lotes
         inserted = 0
-        for i in range(0, len(records), batch_size):
-            batch = records[i:i + batch_size]
-            cursor.executemany(insert_query, batch)
+        for batch in build_records(df, batch_size):
+            cursor.executemany(INSERT_QUERY, batch)
             connection.commit()
             inserted += len(batch)
             print(f"  → Inseridos {inserted}/{total_records} registros ({(inserted/total_records)*100:.1f}%)")
@@ -158,29 +216,503 @@ def insert_data_batch(connection, df, batch_size=1000):
         return False
 
 
-def execute_sql_file(connection, sql_file):
-    """Executa um arquivo SQL"""
+def insert_data_stream(connection, chunks, loader=insert_data_batch, **options):
+    """Insere no banco cada bloco recebido, sem manter o CSV inteiro em memória"""
     try:
+        total = 0
+        for number, chunk in enumerate(chunks, start=1):
+            print(f"\n→ Bloco {number}")
+            if not loader(connection, chunk, **options):
+                return False
+            total += len(chunk)
+        
+        print(f"\n✓ Streaming concluído: {total} registros inseridos")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Erro ao processar blocos do CSV: {e}")
+        return False
+
+
+def count_rows(chunks, counter):
+    """Repassa os blocos somando suas linhas em counter['rows'] (total esperado no streaming)"""
+    for chunk in chunks:
+        counter['rows'] += len(chunk)
+        yield chunk
+
+
+def partition_data(df, workers):
+    """Divide o DataFrame em partições pelo hash do car_id"""
+    buckets = pd.util.hash_pandas_object(df['car_id'], index=False).to_numpy() % workers
+    return [df[buckets == worker] for worker in range(workers)]
+
+
+class PartitionLoadError(Exception):
+    """Falha na carga de uma partição, com as linhas que já tinham sido confirmadas"""
+
+    def __init__(self, committed, error):
+        super().__init__(f"{type(error).__name__}: {error}")
+        self.committed = committed
+
+
+@instrumented('etl.load_partition', rows='df')
+def _load_partition(df, batch_size, commit_interval):
+    """Insere uma partição com uma conexão própria do pool (executado em uma thread)
+
+    Em caso de erro desfaz os lotes ainda não confirmados e gera
+    PartitionLoadError com o número de linhas já confirmadas.
+    """
+    committed = 0
+    with pooled_connection() as connection:
+        cursor = connection.cursor()
+        try:
+            pending = 0
+            for number, batch in enumerate(build_records(df, batch_size), start=1):
+                cursor.executemany(INSERT_QUERY, batch)
+                pending += len(batch)
+                if number % commit_interval == 0:
+                    connection.commit()
+                    committed, pending = committed + pending, 0
+            connection.commit()
+            return len(df)
+        except Exception as e:
+            connection.rollback()
+            raise PartitionLoadError(committed, e) from e
+        finally:
+            cursor.close()
+
+
+@instrumented('etl.parallel_load_data', rows='df')
+def parallel_load_data(connection, df, workers=4, batch_size=1000, commit_interval=10):
+    """Insere os dados em paralelo, com uma conexão por worker
+    
+    A conexão principal não é usada na inserção; cada partição usa uma conexão do pool.
+    `commit_interval` é o número de lotes entre commits em cada worker. Cada
+    partição confirma seus próprios lotes: se alguma falhar, as demais já estão
+    gravadas e o relatório indica quais partições (e quantas linhas) ficaram na tabela.
+    """
+    total_records = len(df)
+    print(f"\n→ Iniciando inserção paralela de {total_records} registros "
+          f"({workers} workers, lotes de {batch_size}, commit a cada {commit_interval} lotes)...")
+    
+    partitions = partition_data(df, workers)
+    inserted = 0
+    committed, failed = [], {}
+    
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {
+            executor.submit(_load_partition, part, batch_size, commit_interval): number
+            for number, part in enumerate(partitions, start=1)
+        }
+        for future in as_completed(futures):
+            number = futures[future]
+            try:
+                rows = future.result()
+            except Exception as e:
+                print(f"  ✗ Partição {number}: {e}")
+                failed[number] = getattr(e, 'committed', 0)
+                continue
+            committed.append(number)
+            inserted += rows
+            print(f"  → Partição {number}: {rows} registros "
+                  f"({inserted}/{total_records}, {(inserted/total_records)*100:.1f}%)")
+    
+    if failed:
+        partial = sum(failed.values())
+        print("✗ Erro ao inserir dados em paralelo")
+        print(f"  • Partições confirmadas: {', '.join(map(str, sorted(committed))) or 'nenhuma'} "
+              f"({inserted} registros já gravados em car_sales)")
+        print(f"  • Partições com falha: {', '.join(map(str, sorted(failed)))} "
+              f"({partial} registros confirmados antes do erro)")
+        print("  • Antes de repetir a carga, esvazie car_sales ou use --incremental (upsert)")
+        return False
+    
+    print(f"✓ Total de {inserted} registros inseridos com sucesso!")
+    return True
+
+
+# Inserção com atualização das vendas já existentes (recarga idempotente)
+UPSERT_QUERY = INSERT_QUERY + "ON DUPLICATE KEY UPDATE " + ", ".join(
+    f"{col} = VALUES({col})" for col in CAR_SALES_COLUMNS[1:]
+)
+
+def with_dimensions(chunks, connection, loader):
+    """Repassa os blocos e popula dimensões e fato de cada um após a sua carga
+
+    Só serve para mecanismos que confirmam cada bloco antes de pedir o
+    próximo (insert e parallel); o bulk usa load_dimensions_stream.
+    """
+    for chunk in chunks:
+        yield chunk
+        loader.load(connection, chunk)
+
+
+@instrumented('etl.load_dimensions', rows='df')
+def load_dimensions(connection, df, loader):
+    """Popula dimensões e fato para as vendas carregadas"""
+    try:
+        print("\n→ Populando tabelas dimensionais e fato...")
+        loader.load(connection, df)
+        print("✓ Dimensões e fato atualizados")
+        return True
+    except Error as e:
+        print(f"✗ Erro ao popular dimensões: {e}")
+        connection.rollback()
+        return False
+
+
+@instrumented('etl.load_dimensions')
+def load_dimensions_stream(connection, chunks, loader):
+    """Popula dimensões e fato bloco a bloco, depois de a base já estar confirmada"""
+    try:
+        print("\n→ Populando tabelas dimensionais e fato (em blocos)...")
+        for chunk in chunks:
+            loader.load(connection, chunk)
+        print("✓ Dimensões e fato atualizados")
+        return True
+    except Error as e:
+        print(f"✗ Erro ao popular dimensões: {e}")
+        connection.rollback()
+        return False
+
+
+def file_checksum(path, block_size=1 << 20):
+    """Calcula o SHA-256 do arquivo de origem, lendo em blocos"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def get_load_state(connection, source):
+    """Retorna o estado da última carga da origem (checksum e marca d'água) ou None"""
+    cursor = connection.cursor(dictionary=True)
+    cursor.execute(
+        "SELECT file_checksum, max_sale_date, rows_loaded, loaded_at FROM etl_load_state WHERE source = %s",
+        (source,)
+    )
+    state = cursor.fetchone()
+    cursor.close()
+    return state
+
+
+def save_load_state(connection, source, checksum, max_sale_date, rows_loaded):
+    """Registra o checksum e a marca d'água (maior sale_date) da carga concluída
+
+    `rows_loaded` é sempre o número de registros enviados por esta carga
+    (o CSV inteiro na completa, o delta na incremental), não o total da tabela.
+    """
+    cursor = connection.cursor()
+    cursor.execute("""
+        INSERT INTO etl_load_state (source, file_checksum, max_sale_date, rows_loaded, loaded_at)
+        VALUES (%s, %s, %s, %s, NOW())
+        ON DUPLICATE KEY UPDATE
+            file_checksum = VALUES(file_checksum),
+            max_sale_date = VALUES(max_sale_date),
+            rows_loaded = VALUES(rows_loaded),
+            loaded_at = VALUES(loaded_at)
+    """, (source, checksum, max_sale_date, rows_loaded))
+    connection.commit()
+    cursor.close()
+
+
+def mark_full_load(connection, csv_file, rows_loaded):
+    """Registra a marca d'água após uma carga completa, habilitando as incrementais
+
+    `rows_loaded` é o número de registros lidos do CSV nesta carga.
+    """
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT MAX(sale_date) FROM car_sales")
+        max_sale_date, = cursor.fetchone()
+        cursor.close()
+        save_load_state(connection, os.path.basename(csv_file), file_checksum(csv_file),
+                        max_sale_date, rows_loaded)
+        print(f"✓ Marca d'água registrada: {max_sale_date}")
+        return True
+    except Error as e:
+        print(f"✗ Erro ao registrar a marca d'água: {e}")
+        return False
+
+
+@instrumented('etl.incremental_load')
+def incremental_load(connection, csv_file, chunksize=None, batch_size=1000, refresh=True):
+    """Carga incremental: somente vendas a partir da marca d'água, com dimensões e fato
+    
+    Linhas com sale_date igual à marca d'água são reenviadas e tratadas pelo
+    ON DUPLICATE KEY UPDATE, cobrindo vendas do último dia que chegaram depois.
+    Com refresh=True as tabelas de resumo são recalculadas nos meses afetados.
+    """
+    try:
+        source = os.path.basename(csv_file)
+        print(f"\n→ Carga incremental da origem: {source}")
+        
+        # 1. Arquivo inalterado desde a última carga: nada a fazer
+        checksum = file_checksum(csv_file)
+        state = get_load_state(connection, source)
+        if state and state['file_checksum'] == checksum:
+            print(f"✓ Arquivo sem alterações desde {state['loaded_at']}, nenhuma venda nova")
+            return True
+        
+        high_water = state['max_sale_date'] if state else None
+        print(f"  → Marca d'água atual: {high_water or 'nenhuma (primeira carga)'}")
+        
+        # 2. Ler o CSV (inteiro ou em blocos) e manter apenas o delta
+        if chunksize:
+            chunks = iter_csv_chunks(csv_file, chunksize)
+        else:
+            df = load_csv_data(csv_file)
+            if df is None:
+                return False
+            chunks = [df]
+        
+        # 3. Upsert do delta em car_sales e, na sequência, em dimensões e fato
+        loader = DimensionLoader(batch_size)
+        loader.load_existing(connection)
         cursor = connection.cursor()
         
-        print(f"\n→ Executando arquivo SQL: {sql_file}")
+        total = 0
+        max_sale_date = high_water
+        months = set()
+        for chunk in chunks:
+            if high_water is not None:
+                chunk = chunk[chunk['sale_date'] >= pd.Timestamp(high_water)]
+            if chunk.empty:
+                continue
+            
+            for batch in build_records(chunk, batch_size):
+                cursor.executemany(UPSERT_QUERY, batch)
+                connection.commit()
+            loader.load(connection, chunk)
+            
+            total += len(chunk)
+            months.update(affected_months(chunk['sale_date']))
+            chunk_max = chunk['sale_date'].max().date()
+            max_sale_date = chunk_max if max_sale_date is None else max(max_sale_date, chunk_max)
+            print(f"  → {total} vendas novas ou atualizadas")
         
-        with open(sql_file, 'r', encoding='utf-8') as f:
-            sql_script = f.read()
+        cursor.close()
         
-        # Dividir por comandos (separados por ;)
-        commands = sql_script.split(';')
+        # 4. Registrar a nova marca d'água
+        save_load_state(connection, source, checksum, max_sale_date, total)
+        print(f"✓ Carga incremental concluída: {total} registros (marca d'água: {max_sale_date})")
         
-        for command in commands:
-            command = command.strip()
-            if command and not command.startswith('--'):
-                try:
-                    cursor.execute(command)
-                    connection.commit()
-                except Error as e:
-                    # Ignorar erros de comandos vazios ou comentários
-                    if 'empty query' not in str(e).lower():
-                        print(f"  ⚠ Aviso: {e}")
+        # 5. Recalcular os resumos apenas dos meses que receberam vendas
+        if refresh:
+            return refresh_summaries(connection, months)
+        return True
+        
+    except Exception as e:
+        print(f"✗ Erro na carga incremental: {e}")
+        connection.rollback()
+        return False
+
+
+# Índices secundários da tabela car_sales (nome → coluna), conforme o DDL
+SECONDARY_INDEXES = {
+    'idx_sale_date': 'sale_date',
+    'idx_dealer_region': 'dealer_region',
+    'idx_dealer_name': 'dealer_name',
+    'idx_company': 'company',
+    'idx_model': 'model',
+    'idx_gender': 'gender',
+    'idx_price': 'price',
+    'idx_annual_income': 'annual_income'
+}
+
+
+# Nulos no TSV: \N com o escape padrão do LOAD DATA (ESCAPED BY '\\'); textos
+# iguais a "NULL" continuam sendo texto
+TSV_NULL = '\\N'
+
+# Caracteres escapados nos textos do TSV (a barra invertida primeiro)
+TSV_ESCAPES = (('\\', '\\\\'), ('\0', '\\0'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r'))
+
+# Avisos do LOAD DATA mostrados quando a carga é rejeitada
+MAX_WARNINGS_SHOWN = 5
+
+
+def escape_tsv(values):
+    """Escapa barra invertida, NUL, tabulação e quebras de linha de uma coluna de texto"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.rename_categories(escape_tsv(values.cat.categories.to_series()).to_numpy())
+    for char, escaped in TSV_ESCAPES:
+        values = values.str.replace(char, escaped, regex=False)
+    return values
+
+
+def write_tsv(df, handle, chunksize=100000):
+    """Grava o DataFrame transformado em TSV no formato esperado pelo LOAD DATA
+
+    Os textos são escapados com escape_tsv (o LOAD DATA usa o escape padrão,
+    sem aspas), e os nulos são gravados como \\N.
+    """
+    df = df[CAR_SALES_COLUMNS]
+    text = [column for column in df.columns
+            if isinstance(df[column].dtype, pd.CategoricalDtype)
+            or pd.api.types.infer_dtype(df[column]) == 'string']
+    if text:
+        df = df.assign(**{column: escape_tsv(df[column]) for column in text})
+    df.to_csv(
+        handle,
+        sep='\t',
+        header=False,
+        index=False,
+        date_format='%Y-%m-%d',
+        na_rep=TSV_NULL,
+        quoting=csv.QUOTE_NONE,
+        chunksize=chunksize
+    )
+
+
+def load_warnings(cursor, limit=MAX_WARNINGS_SHOWN):
+    """Primeiros avisos do último comando (SHOW WARNINGS)"""
+    cursor.execute(f"SHOW WARNINGS LIMIT {int(limit)}")
+    return [f"{level} {code}: {message}" for level, code, message in cursor.fetchall()]
+
+
+@instrumented('etl.bulk_load_data')
+def bulk_load_data(connection, data):
+    """Carrega os dados via LOAD DATA LOCAL INFILE a partir de um TSV temporário
+    
+    `data` pode ser um DataFrame ou um iterável de blocos (ver iter_csv_chunks).
+    O LOAD DATA LOCAL transforma chaves duplicadas e erros de conversão em
+    avisos: a carga só é confirmada se todas as linhas do TSV entrarem sem
+    nenhum aviso; caso contrário é desfeita (rollback) e a função retorna False.
+    """
+    tsv_path = None
+    cursor = None
+    try:
+        cursor = connection.cursor()
+        
+        print("\n→ Iniciando carga em massa...")
+        
+        # 1. Gravar o TSV temporário (bloco a bloco no modo streaming)
+        chunks = [data] if isinstance(data, pd.DataFrame) else data
+        total_records = 0
+        with span('etl.bulk.write_tsv') as record, \
+                tempfile.NamedTemporaryFile('w', suffix='.tsv', delete=False,
+                                            encoding='utf-8', newline='') as f:
+            tsv_path = f.name
+            for chunk in chunks:
+                write_tsv(chunk, f)
+                total_records += len(chunk)
+            record['rows'] = total_records
+        print(f"  → Arquivo temporário gerado: {tsv_path} ({total_records} registros)")
+        
+        # 2. Desligar verificações e a manutenção dos índices secundários
+        # (InnoDB não suporta DISABLE KEYS; os índices são removidos e recriados)
+        cursor.execute("SET unique_checks = 0")
+        cursor.execute("SET foreign_key_checks = 0")
+        cursor.execute(
+            "ALTER TABLE car_sales "
+            + ", ".join(f"DROP INDEX {name}" for name in SECONDARY_INDEXES)
+        )
+        print(f"  → {len(SECONDARY_INDEXES)} índices secundários desativados")
+        
+        try:
+            # 3. Carregar o arquivo
+            with span('etl.bulk.load_data_infile') as record:
+                cursor.execute(f"""
+                    LOAD DATA LOCAL INFILE '{tsv_path.replace(os.sep, '/')}'
+                    INTO TABLE car_sales
+                    CHARACTER SET utf8mb4
+                    FIELDS TERMINATED BY '\\t'
+                    LINES TERMINATED BY '\\n'
+                    ({', '.join(CAR_SALES_COLUMNS)})
+                """)
+                loaded = record['rows'] = cursor.rowcount
+                warning_count = record['warnings'] = cursor.warning_count or 0
+
+            # Linhas puladas (chave duplicada) ou convertidas com aviso: desfaz a carga
+            # antes de recriar os índices (o ALTER TABLE faz commit implícito)
+            if loaded != total_records or warning_count:
+                warnings = load_warnings(cursor) if warning_count else []
+                connection.rollback()
+                for warning in warnings:
+                    print(f"  ⚠ {warning}")
+                raise RuntimeError(f"{loaded} de {total_records} registros carregados, "
+                                   f"{warning_count} avisos; carga desfeita")
+            connection.commit()
+        finally:
+            # 4. Recriar os índices em uma única passada e religar as verificações
+            with span('etl.bulk.rebuild_indexes', indexes=len(SECONDARY_INDEXES)):
+                cursor.execute(
+                    "ALTER TABLE car_sales "
+                    + ", ".join(f"ADD INDEX {name} ({column})" for name, column in SECONDARY_INDEXES.items())
+                )
+            cursor.execute("SET unique_checks = 1")
+            cursor.execute("SET foreign_key_checks = 1")
+            print(f"  → {len(SECONDARY_INDEXES)} índices secundários reconstruídos")
+        
+        print(f"✓ Total de {loaded} registros carregados com sucesso!")
+        return True
+        
+    except Exception as e:
+        print(f"✗ Erro na carga em massa: {e}")
+        connection.rollback()
+        return False
+        
+    finally:
+        if cursor is not None:
+            cursor.close()
+        if tsv_path and os.path.exists(tsv_path):
+            os.remove(tsv_path)
+
+
+@instrumented('etl.execute_sql_file')
+def execute_sql_file(connection, sql_file, mode='all'):
+    """Executa um arquivo SQL em uma única transação, cronometrando cada comando
+    
+    mode: 'all' executa tudo, 'writes' pula as consultas somente leitura
+    (SELECT, SHOW...) e 'queries' executa apenas elas.
+    """
+    try:
+        cursor = connection.cursor()
+        
+        print(f"\n→ Executando arquivo SQL: {sql_file}")
+        
+        with open(sql_file, 'r', encoding='utf-8') as f:
+            statements = split_statements(f.read())
+        
+        totals = {'escrita': [0, 0.0], 'consulta': [0, 0.0]}
+        skipped = failed = 0
+        
+        for statement in statements:
+            read_only = is_read_only(statement.sql)
+            if (mode == 'writes' and read_only) or (mode == 'queries' and not read_only):
+                skipped += 1
+                continue
+            
+            kind = 'consulta' if read_only else 'escrita'
+            try:
+                with span('etl.sql_statement', file=os.path.basename(sql_file),
+                          line=statement.line, kind=kind) as record:
+                    cursor.execute(statement.sql)
+                    rows = record['rows'] = len(cursor.fetchall()) if cursor.with_rows else cursor.rowcount
+            except Error as e:
+                print(f"  ⚠ Aviso (linha {statement.line}): {e}")
+                failed += 1
+                continue
+            elapsed = record['wall_s']
+            
+            totals[kind][0] += 1
+            totals[kind][1] += elapsed
+            description = statement.label or statement.sql.splitlines()[0]
+            print(f"  → [{kind}] linha {statement.line:>4}: {elapsed * 1000:9.1f} ms, "
+                  f"{rows} linhas - {description[:60]}")
+        
+        # Um único commit para todos os comandos (DDL já faz commit implícito no MySQL)
+        connection.commit()
+        
+        for kind, (count, elapsed) in totals.items():
+            if count:
+                print(f"  • {count} comandos de {kind}: {elapsed:.3f}s")
+        if skipped:
+            print(f"  • {skipped} comandos pulados (modo '{mode}')")
+        if failed:
+            print(f"  • {failed} comandos com erro")
         
         print(f"✓ Arquivo SQL executado com sucesso")
         cursor.close()
@@ -188,10 +720,12 @@ def execute_sql_file(connection, sql_file):
         
     except Exception as e:
         print(f"✗ Erro ao executar SQL: {e}")
+        connection.rollback()
         return False
 
 
-def verify_data(connection):
+@instrumented('etl.verify_data')
+def verify_data(connection, expected_total=None):
     """Verifica os dados carregados"""
     try:
         cursor = connection.cursor(dictionary=True)
@@ -205,6 +739,12 @@ def verify_data(connection):
         result = cursor.fetchone()
         print(f"\n✓ Total de registros na tabela: {result['total']}")
         
+        # Conferir com o total esperado (ex.: soma das partições da carga paralela)
+        if expected_total is not None and result['total'] != expected_total:
+            print(f"✗ Divergência: esperados {expected_total} registros, encontrados {result['total']}")
+            cursor.close()
+            return False
+        
         # Estatísticas básicas
         cursor.execute("""
             SELECT 
@@ -252,41 +792,171 @@ def verify_data(connection):
         return False
 
 
+def parse_args():
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description='Carga de dados do CSV para o MySQL')
+    parser.add_argument(
+        '--engine',
+        choices=['insert', 'bulk', 'parallel'],
+        default='insert',
+        help="Mecanismo de carga: 'insert' (executemany em lotes), 'bulk' (LOAD DATA LOCAL INFILE) "
+             "ou 'parallel' (várias conexões simultâneas)"
+    )
+    parser.add_argument(
+        '--chunksize',
+        type=int,
+        default=None,
+        help='Lê o CSV em blocos deste tamanho (modo streaming, memória constante)'
+    )
+    parser.add_argument('--batch-size', type=int, default=1000, help='Registros por lote de inserção')
+    parser.add_argument(
+        '--sql-file',
+        action='append',
+        default=[],
+        help='Script SQL a executar após a carga (pode ser repetido)'
+    )
+    parser.add_argument(
+        '--sql-mode',
+        choices=['all', 'writes', 'queries'],
+        default='all',
+        help="Comandos dos scripts SQL: 'all', 'writes' (pula SELECTs) ou 'queries' (só SELECTs, cronometrados)"
+    )
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help="Carrega apenas as vendas novas desde a última carga (marca d'água em etl_load_state)"
+    )
+    parser.add_argument(
+        '--skip-summaries',
+        action='store_true',
+        help='Não atualiza as tabelas de resumo (sum_*) após a carga'
+    )
+    parser.add_argument('--workers', type=int, default=4, help="Conexões simultâneas no modo 'parallel'")
+    parser.add_argument(
+        '--commit-interval',
+        type=int,
+        default=10,
+        help="Lotes entre commits em cada worker no modo 'parallel'"
+    )
+    add_arguments(parser)
+    args = parser.parse_args()
+    
+    # A carga incremental usa sempre o upsert em lotes (o delta costuma ser pequeno)
+    if args.incremental and args.engine != 'insert':
+        parser.error(f"--engine {args.engine} não se aplica a --incremental (a carga incremental usa upsert em lotes)")
+    
+    # Uma conexão do pool por worker + a conexão principal
+    if not 1 <= args.workers <= MAX_POOL_SIZE - 1:
+        parser.error(f"--workers deve estar entre 1 e {MAX_POOL_SIZE - 1} "
+                     f"(o pool do conector tem no máximo {MAX_POOL_SIZE} conexões, uma é a principal)")
+    return args
+
+
 def main():
     """Função principal"""
+    args = parse_args()
+    configure_from_args(args)
+    
     print("="*80)
     print("PROJETO INTEGRADOR - CARGA DE DADOS")
     print("="*80)
     print(f"Início: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     
-    # 1. Conectar ao banco
+    # 1. Conectar ao banco (pool com uma conexão por worker + a principal)
+    init_pool(pool_size=args.workers + 1, allow_local_infile=(args.engine == 'bulk'))
     connection = create_connection()
     if not connection:
         sys.exit(1)
     
-    # 2. Carregar e transformar dados do CSV
-    df = load_csv_data(CSV_FILE)
-    if df is None:
-        connection.close()
-        sys.exit(1)
+    expected_total = None
+    if args.incremental:
+        # 2-4. Carga incremental: apenas o delta, já propagado para dimensões e fato
+        if not incremental_load(connection, CSV_FILE, args.chunksize, args.batch_size,
+                                refresh=not args.skip_summaries):
+            connection.close()
+            sys.exit(1)
+    else:
+        loader = DimensionLoader(args.batch_size)
+        
+        # 2. Carregar e transformar dados do CSV
+        streamed = {'rows': 0}
+        if args.chunksize:
+            # Modo streaming: cada bloco segue direto para a etapa de carga
+            print(f"\n→ Lendo {CSV_FILE} em blocos de {args.chunksize} registros")
+            loader.load_existing(connection)
+            data = count_rows(iter_csv_chunks(CSV_FILE, args.chunksize), streamed)
+            if args.engine != 'bulk':
+                data = with_dimensions(data, connection, loader)
+        else:
+            data = load_csv_data(CSV_FILE)
+            if data is None:
+                connection.close()
+                sys.exit(1)
     
-    # 3. Inserir dados no banco
-    success = insert_data_batch(connection, df)
-    if not success:
-        connection.close()
-        sys.exit(1)
+        # 3. Inserir dados no banco
+        if args.engine == 'bulk':
+            success = bulk_load_data(connection, data)
+        elif args.engine == 'parallel':
+            options = dict(workers=args.workers, batch_size=args.batch_size,
+                           commit_interval=args.commit_interval)
+            if args.chunksize:
+                success = insert_data_stream(connection, data, parallel_load_data, **options)
+            else:
+                success = parallel_load_data(connection, data, **options)
+        elif args.chunksize:
+            success = insert_data_stream(connection, data, batch_size=args.batch_size)
+        else:
+            success = insert_data_batch(connection, data, args.batch_size)
+        if not success:
+            connection.close()
+            sys.exit(1)
+        
+        # Total esperado em car_sales: linhas lidas do CSV (inteiro ou em blocos)
+        expected_total = streamed['rows'] if args.chunksize else len(data)
     
-    # 4. Executar script DML para popular dimensões
-    print("\n→ Populando tabelas dimensionais...")
-    execute_sql_file(connection, 'car_sales_dml.sql')
+        # 4. Popular dimensões e fato (no streaming com insert/parallel, já feito bloco a bloco)
+        if not args.chunksize:
+            loader.load_existing(connection)
+            success = load_dimensions(connection, data, loader)
+        elif args.engine == 'bulk':
+            # O LOAD DATA só é confirmado depois do último bloco: o CSV é relido
+            # para não deixar vendas órfãs no fato caso a carga da base falhe
+            success = load_dimensions_stream(connection, iter_csv_chunks(CSV_FILE, args.chunksize), loader)
+        if not success:
+            connection.close()
+            sys.exit(1)
+        
+        # Registrar a marca d'água para as próximas cargas incrementais
+        if not mark_full_load(connection, CSV_FILE, expected_total):
+            connection.close()
+            sys.exit(1)
+        
+        # Recalcular todas as tabelas de resumo (views materializadas)
+        if not args.skip_summaries and not refresh_summaries(connection):
+            connection.close()
+            sys.exit(1)
+    
+    # Scripts SQL adicionais (ex.: consultas OLAP de car_sales_dml.sql)
+    for sql_file in args.sql_file:
+        execute_sql_file(connection, sql_file, args.sql_mode)
     
     # 5. Verificar dados carregados
-    verify_data(connection)
+    if not verify_data(connection, expected_total):
+        connection.close()
+        sys.exit(1)
     
     # 6. Fechar conexão
     connection.close()
     print("\n✓ Conexão fechada")
     
+    metrics = pool_metrics()
+    print(f"  • Pool '{metrics['pool_name']}': {metrics['checkouts']} empréstimos, "
+          f"máximo de {metrics['max_in_use']}/{metrics['pool_size']} em uso, "
+          f"{metrics['reconnects']} reconexões, {metrics['failures']} falhas")
+    
+    if args.profile:
+        print_summary()
+    
     print(f"\nFim: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("="*80)
     print("✓ PROCESSO CONCLUÍDO COM SUCESSO!")
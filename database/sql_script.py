@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Leitura de Scripts SQL
+Descrição: Divide scripts SQL (DDL/DML) em comandos, respeitando
+           comentários, strings entre aspas e a diretiva DELIMITER
+============================================================================
+"""
+
+import re
+from collections import namedtuple
+
+# Comando do script: texto SQL, último comentário antes dele e linha inicial
+Statement = namedtuple('Statement', ['sql', 'label', 'line'])
+
+# Comandos que apenas leem dados (podem ser pulados ou cronometrados à parte)
+READ_ONLY_KEYWORDS = {'SELECT', 'WITH', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN', 'TABLE'}
+
+# Palavras que, em qualquer ponto do comando, indicam escrita ou bloqueio:
+# DML depois de um WITH (ou de um EXPLAIN ANALYZE), SELECT ... INTO
+# OUTFILE/DUMPFILE/@variável e SELECT ... FOR UPDATE/SHARE ou LOCK IN SHARE MODE
+WRITE_KEYWORDS = {'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'INTO', 'FOR', 'LOCK', 'CALL'}
+
+DELIMITER_RE = re.compile(r'DELIMITER[ \t]+(\S+)[^\n]*', re.IGNORECASE)
+WORD_RE = re.compile(r'\w+')
+
+
+def _quoted_end(script, start):
+    """Retorna a posição logo após o fechamento da string iniciada em `start`"""
+    quote = script[start]
+    i = start + 1
+    n = len(script)
+    while i < n:
+        c = script[i]
+        if c == '\\' and quote != '`':
+            i += 2
+        elif c == quote:
+            # Aspas duplicadas representam a própria aspa dentro da string
+            if i + 1 < n and script[i + 1] == quote:
+                i += 2
+            else:
+                return i + 1
+        else:
+            i += 1
+    return n
+
+
+def split_statements(script):
+    """Divide o script em comandos (lista de Statement)"""
+    statements = []
+    delimiter = ';'
+    buffer = []
+    has_content = False
+    label = None
+    trailing = False  # ainda na linha do delimitador do comando anterior
+    start = 0
+    line, counted = 1, 0
+    i = 0
+    n = len(script)
+
+    def flush():
+        nonlocal buffer, has_content, label, line, counted
+        sql = ''.join(buffer).strip()
+        if sql:
+            line += script.count('\n', counted, start)
+            counted = start
+            statements.append(Statement(sql, label, line))
+        buffer = []
+        has_content = False
+        label = None
+
+    while i < n:
+        c = script[i]
+
+        # Diretiva DELIMITER (apenas no início de um comando)
+        if not has_content and c in 'Dd':
+            match = DELIMITER_RE.match(script, i)
+            if match:
+                delimiter = match.group(1)
+                i = match.end()
+                continue
+
+        if script.startswith(delimiter, i):
+            flush()
+            trailing = True
+            i += len(delimiter)
+            continue
+
+        # Comentários de linha: "-- " e "#"
+        if (c == '-' and script.startswith('--', i)
+                and (i + 2 >= n or script[i + 2].isspace())) or c == '#':
+            end = script.find('\n', i)
+            end = n if end == -1 else end
+            text = script[i:end].lstrip('-#').strip()
+            # Comentário no fim da linha de um comando não rotula o próximo
+            if not has_content and not trailing and re.search(r'\w', text):
+                label = text
+            i = end
+            continue
+
+        # Comentários de bloco (os executáveis /*! ... */ fazem parte do comando)
+        if c == '/' and script.startswith('/*', i) and not script.startswith('/*!', i):
+            end = script.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            continue
+
+        if c in '\'"`':
+            end = _quoted_end(script, i)
+            if not has_content:
+                has_content, start = True, i
+            buffer.append(script[i:end])
+            i = end
+            continue
+
+        if c == '\n':
+            trailing = False
+        if not has_content and not c.isspace():
+            has_content, start = True, i
+        buffer.append(c)
+        i += 1
+
+    flush()
+    return statements
+
+
+def _words(sql):
+    """Palavras do comando em maiúsculas, sem strings, identificadores entre crases e comentários"""
+    parts = []
+    i = 0
+    n = len(sql)
+    while i < n:
+        c = sql[i]
+        if c in '\'"`':
+            i = _quoted_end(sql, i)
+            parts.append(' ')
+        elif (c == '-' and sql.startswith('--', i) and (i + 2 >= n or sql[i + 2].isspace())) or c == '#':
+            end = sql.find('\n', i)
+            i = n if end == -1 else end
+        elif c == '/' and sql.startswith('/*', i) and not sql.startswith('/*!', i):
+            end = sql.find('*/', i + 2)
+            i = n if end == -1 else end + 2
+            parts.append(' ')
+        else:
+            parts.append(c)
+            i += 1
+    return WORD_RE.findall(''.join(parts).upper())
+
+
+def is_read_only(sql):
+    """Indica se o comando apenas lê dados (SELECT, SHOW, EXPLAIN...)
+
+    Na dúvida responde False: um WITH seguido de DELETE/UPDATE, um SELECT ...
+    INTO OUTFILE ou um SELECT ... FOR UPDATE não são somente leitura.
+    """
+    words = _words(sql)
+    if not words or words[0] not in READ_ONLY_KEYWORDS:
+        return False
+    return WRITE_KEYWORDS.isdisjoint(words)
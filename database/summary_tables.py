@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Atualização das Tabelas de Resumo (Views Materializadas)
+Descrição: Recalcula as tabelas sum_* a partir de car_sales, por completo
+           ou apenas nos meses afetados por uma carga incremental, e
+           registra a data/hora de cada atualização
+============================================================================
+
+Uso (atualização manual):
+    python summary_tables.py                      # todas as linhas
+    python summary_tables.py --months 2023-11 2023-12
+"""
+
+import argparse
+import sys
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+from mysql.connector import Error
+
+# Faixas de renda e instrumentação compartilhadas com a geração dos DataFrames (dataframes/)
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'dataframes'))
+
+from income_brackets import sql_case  # noqa: E402
+from instrumentation import span  # noqa: E402
+
+# Mês da venda no formato AAAA-MM (LEFT sobre a data evita '%' na consulta
+# parametrizada, que seria interpretado pelo conector)
+SALE_MONTH = "LEFT(sale_date, 7)"
+
+# Tabela de resumo → SELECT que a popula a partir de car_sales ({where}: filtro de meses)
+SUMMARIES = {
+    'sum_sales_monthly': f"""
+        SELECT {SALE_MONTH}, YEAR(sale_date), MONTH(sale_date), QUARTER(sale_date),
+               COUNT(car_id), SUM(price), MIN(price), MAX(price)
+        FROM car_sales
+        WHERE {{where}}
+        GROUP BY 1, 2, 3, 4
+    """,
+    'sum_sales_model': f"""
+        SELECT {SALE_MONTH}, company, model,
+               COUNT(car_id), SUM(price), MIN(price), MAX(price)
+        FROM car_sales
+        WHERE {{where}}
+        GROUP BY 1, 2, 3
+    """,
+    'sum_sales_dealer': f"""
+        SELECT {SALE_MONTH}, dealer_region, dealer_name, COUNT(car_id), SUM(price)
+        FROM car_sales
+        WHERE {{where}}
+        GROUP BY 1, 2, 3
+    """,
+    'sum_sales_income': f"""
+        SELECT {SALE_MONTH}, gender, {sql_case('annual_income')}, company, model, body_style,
+               COUNT(car_id), SUM(price), SUM(annual_income),
+               SUM((price + 0E0) / annual_income)
+        FROM car_sales
+        WHERE {{where}}
+        GROUP BY 1, 2, 3, 4, 5, 6
+    """
+}
+
+STATE_QUERY = """
+INSERT INTO summary_refresh_state
+    (summary_table, refreshed_at, refresh_mode, months_refreshed, rows_refreshed)
+VALUES (%s, NOW(), %s, %s, %s)
+ON DUPLICATE KEY UPDATE
+    refreshed_at = VALUES(refreshed_at),
+    refresh_mode = VALUES(refresh_mode),
+    months_refreshed = VALUES(months_refreshed),
+    rows_refreshed = VALUES(rows_refreshed)
+"""
+
+
+def affected_months(dates):
+    """Meses (AAAA-MM) presentes em uma série de datas de venda"""
+    return set(pd.to_datetime(dates).dt.strftime('%Y-%m').dropna())
+
+
+def _month_range(month):
+    """Primeiro dia do mês e primeiro dia do mês seguinte"""
+    start = date(int(month[:4]), int(month[5:7]), 1)
+    end = date(start.year + start.month // 12, start.month % 12 + 1, 1)
+    return start, end
+
+
+def refresh_summaries(connection, months=None):
+    """Recalcula as tabelas de resumo (todas as linhas ou apenas `months`)
+
+    Cada mês afetado é apagado e recalculado por completo a partir de
+    car_sales (intervalos de sale_date, usando idx_sale_date), o que mantém
+    corretos MIN/MAX e vendas atualizadas pelo upsert. Tudo em uma transação.
+    """
+    mode = 'full' if months is None else 'incremental'
+    months = None if months is None else sorted(months)
+    if months == []:
+        return True
+
+    if months is None:
+        where, params, delete = "1 = 1", [], "DELETE FROM {table}"
+    else:
+        where = " OR ".join(["(sale_date >= %s AND sale_date < %s)"] * len(months))
+        params = [bound for month in months for bound in _month_range(month)]
+        delete = "DELETE FROM {table} WHERE sale_month IN (" + ", ".join(["%s"] * len(months)) + ")"
+
+    try:
+        print(f"\n→ Atualizando tabelas de resumo ({'todos os meses' if months is None else ', '.join(months)})")
+        cursor = connection.cursor()
+
+        for table, select in SUMMARIES.items():
+            with span('summary.refresh_table', table=table, mode=mode) as record:
+                cursor.execute(delete.format(table=table), months or None)
+                cursor.execute(f"INSERT INTO {table} {select.format(where=where)}", params or None)
+                rows = record['rows'] = cursor.rowcount
+                cursor.execute(STATE_QUERY, (table, mode, None if months is None else len(months), rows))
+            print(f"  → {table}: {rows} linhas em {record['wall_s']:.3f}s")
+
+        connection.commit()
+        cursor.close()
+        print("✓ Tabelas de resumo atualizadas")
+        return True
+
+    except Error as e:
+        print(f"✗ Erro ao atualizar tabelas de resumo: {e}")
+        connection.rollback()
+        return False
+
+
+def parse_args():
+    """Lê os argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(description='Atualiza as tabelas de resumo (sum_*)')
+    parser.add_argument('--months', nargs='+', metavar='AAAA-MM',
+                        help='Recalcula apenas estes meses (padrão: todos)')
+    return parser.parse_args()
+
+
+def main():
+    from db_pool import pooled_connection
+
+    args = parse_args()
+    with pooled_connection() as connection:
+        success = refresh_summaries(connection, args.months)
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    main()
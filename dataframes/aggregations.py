@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Especificação e Motor de Agregação dos DataFrames
+Descrição: Cada DataFrame agregado é descrito por chaves, medidas e passos
+           finais; o motor agrupa cada conjunto distinto de chaves uma única
+           vez e deriva dele todos os DataFrames que o utilizam
+============================================================================
+"""
+
+import pandas as pd
+
+try:
+    from instrumentation import span
+    from schema import compact_aggregate, decode_dates
+except ImportError:  # importado como pacote (dataframes.aggregations) pelo Streamlit
+    from dataframes.instrumentation import span
+    from dataframes.schema import compact_aggregate, decode_dates
+
+# Medidas disponíveis: nome → (coluna de origem, função de agregação)
+MEASURES = {
+    'quantidade': ('Car_id', 'count'),
+    'receita': ('Price ($)', 'sum'),
+    'preco_medio': ('Price ($)', 'mean'),
+    'renda_media': ('Annual Income', 'mean'),
+    'esforco_medio': ('Esforco_Financeiro', 'mean'),
+    'concessionarias': ('Dealer_Name', 'nunique')
+}
+
+# DataFrames agregados: chaves do groupby, medidas (na ordem das colunas),
+# nomes finais das colunas e passos aplicados depois da agregação
+AGGREGATES = {
+    'df_vendas_mes': {
+        'keys': ['YearMonth'],
+        'measures': ['quantidade', 'receita'],
+        'columns': ['Mês', 'Quantidade', 'Receita'],
+        'steps': [('pct_change', 'Receita', 'Crescimento (%)')]
+    },
+    'df_modelos_vendidos': {
+        'keys': ['Company', 'Model'],
+        'measures': ['quantidade', 'receita', 'preco_medio'],
+        'columns': ['Marca', 'Modelo', 'Quantidade', 'Receita Total', 'Preço Médio'],
+        'steps': [('sort', 'Quantidade', False)]
+    },
+    'df_sazonalidade': {
+        'keys': ['Year', 'Quarter'],
+        'measures': ['quantidade', 'receita'],
+        'columns': ['Ano', 'Trimestre', 'Quantidade', 'Receita'],
+        'steps': []
+    },
+    'df_agrupar_faixa_renda': {
+        'keys': ['Faixa_Renda'],
+        'measures': ['quantidade', 'preco_medio', 'renda_media'],
+        'columns': ['Faixa de Renda', 'Quantidade', 'Preço Médio', 'Renda Média'],
+        'steps': [('share_of_rows', 'Quantidade', 'Percentual (%)')]
+    },
+    'df_genero': {
+        'keys': ['Gender'],
+        'measures': ['quantidade', 'preco_medio', 'renda_media'],
+        'columns': ['Gênero', 'Quantidade', 'Preço Médio', 'Renda Média'],
+        'steps': [('share_of_rows', 'Quantidade', 'Percentual (%)')]
+    },
+    'df_renda_x_modelo': {
+        'keys': ['Faixa_Renda', 'Model'],
+        'measures': ['quantidade', 'preco_medio', 'esforco_medio'],
+        'columns': ['Faixa de Renda', 'Modelo', 'Quantidade', 'Preço Médio', 'Esforço Financeiro'],
+        'steps': [('sort', ['Faixa de Renda', 'Quantidade'], [True, False])]
+    },
+    'df_preferencias': {
+        'keys': ['Faixa_Renda', 'Gender', 'Company'],
+        'measures': ['quantidade', 'preco_medio'],
+        'columns': ['Faixa de Renda', 'Gênero', 'Marca', 'Quantidade', 'Preço Médio'],
+        'steps': [('sort', ['Faixa de Renda', 'Quantidade'], [True, False])]
+    },
+    'df_receita_regiao': {
+        'keys': ['Dealer_Region'],
+        'measures': ['quantidade', 'receita'],
+        'columns': ['Região', 'Quantidade', 'Receita Total'],
+        'steps': [
+            ('share_of_total', 'Receita Total', 'Percentual (%)'),
+            ('ratio', 'Receita Total', 'Quantidade', 'Ticket Médio'),
+            ('round', 'Ticket Médio', 2),
+            ('sort', 'Receita Total', False)
+        ]
+    },
+    'df_ticket_medio_concessionaria': {
+        'keys': ['Dealer_Name', 'Dealer_Region'],
+        'measures': ['quantidade', 'receita', 'preco_medio'],
+        'columns': ['Concessionária', 'Região', 'Quantidade', 'Receita Total', 'Ticket Médio'],
+        'steps': [('sort', 'Ticket Médio', False)]
+    },
+    'df_ranking': {
+        'keys': ['Dealer_Name', 'Dealer_Region'],
+        'measures': ['quantidade', 'receita'],
+        'columns': ['Concessionária', 'Região', 'Quantidade', 'Receita Total'],
+        'steps': [('sort', 'Quantidade', False), ('rank', 'Ranking')]
+    },
+    'df_comparacao_regioes': {
+        'keys': ['Dealer_Region'],
+        'measures': ['concessionarias', 'quantidade', 'receita', 'preco_medio'],
+        'columns': ['Região', 'Nº Concessionárias', 'Quantidade', 'Receita Total', 'Ticket Médio'],
+        'steps': [('ratio', 'Receita Total', 'Nº Concessionárias', 'Receita por Concessionária')]
+    },
+    'df_body_style': {
+        'keys': ['Body Style'],
+        'measures': ['quantidade', 'receita', 'preco_medio'],
+        'columns': ['Tipo de Carroceria', 'Quantidade', 'Receita Total', 'Preço Médio'],
+        'steps': [('sort', 'Quantidade', False)]
+    },
+    'df_transmission': {
+        'keys': ['Transmission'],
+        'measures': ['quantidade', 'preco_medio'],
+        'columns': ['Transmissão', 'Quantidade', 'Preço Médio'],
+        'steps': []
+    },
+    'df_color': {
+        'keys': ['Color'],
+        'measures': ['quantidade', 'preco_medio'],
+        'columns': ['Cor', 'Quantidade', 'Preço Médio'],
+        'steps': [('sort', 'Quantidade', False)]
+    },
+    'df_top_marcas': {
+        'keys': ['Company'],
+        'measures': ['quantidade', 'receita', 'preco_medio'],
+        'columns': ['Marca', 'Quantidade', 'Receita Total', 'Preço Médio'],
+        'steps': [('sort', 'Quantidade', False), ('head', 10)]
+    },
+    'df_share_marca': {
+        'keys': ['Company'],
+        'measures': ['quantidade'],
+        'columns': ['Marca', 'Quantidade'],
+        'steps': [
+            ('share_of_total', 'Quantidade', 'Share (%)'),
+            ('sort', 'Share (%)', False)
+        ]
+    },
+    'df_share_receita': {
+        'keys': ['Company'],
+        'measures': ['receita'],
+        'columns': ['Marca', 'Receita Total'],
+        'steps': [
+            ('share_of_total', 'Receita Total', 'Share Receita (%)'),
+            ('sort', 'Share Receita (%)', False)
+        ]
+    },
+    'df_receita_marca': {
+        'keys': ['Company'],
+        'measures': ['receita'],
+        'columns': ['Marca', 'Receita Total'],
+        'steps': []
+    },
+    'df_evolucao': {
+        'keys': ['Date'],
+        'measures': ['quantidade', 'receita'],
+        'columns': ['Data', 'Quantidade', 'Receita'],
+        'steps': [('date', 'Data')]
+    }
+}
+
+
+def total_frame(count):
+    """1. Volume total de vendas"""
+    return pd.DataFrame({
+        'Métrica': ['Total de Vendas'],
+        'Valor': [count]
+    })
+
+
+def receita_total_frame(total, mean):
+    """2. Receita total e média"""
+    return pd.DataFrame({
+        'Métrica': ['Receita Total', 'Ticket Médio'],
+        'Valor': [total, mean]
+    })
+
+
+# Variáveis numéricas da matriz de correlação (df_correlacao)
+CORRELATION_COLUMNS = ['Annual Income', 'Price ($)', 'Esforco_Financeiro']
+
+
+def _correlacao(df):
+    """20. Matriz de correlação entre variáveis numéricas"""
+    return df[CORRELATION_COLUMNS].corr()
+
+
+# DataFrames que não vêm de um groupby
+SPECIAL_FRAMES = {
+    'df_total': lambda df: total_frame(len(df)),
+    'df_receita_total': lambda df: receita_total_frame(df['Price ($)'].sum(), df['Price ($)'].mean()),
+    'df_correlacao': _correlacao
+}
+
+# Ordem de saída dos DataFrames
+FRAME_ORDER = [
+    'df_total', 'df_receita_total', 'df_vendas_mes', 'df_modelos_vendidos',
+    'df_sazonalidade', 'df_agrupar_faixa_renda', 'df_genero', 'df_renda_x_modelo',
+    'df_preferencias', 'df_receita_regiao', 'df_ticket_medio_concessionaria',
+    'df_ranking', 'df_comparacao_regioes', 'df_body_style', 'df_transmission',
+    'df_color', 'df_top_marcas', 'df_share_marca', 'df_share_receita',
+    'df_receita_marca', 'df_evolucao', 'df_correlacao'
+]
+
+
+def _apply_step(frame, step, rows):
+    """Aplica um passo final (percentual, ordenação, ranking...) ao DataFrame"""
+    kind, *args = step
+    if kind == 'sort':
+        by, ascending = args
+        return frame.sort_values(by, ascending=ascending)
+    if kind == 'head':
+        return frame.head(args[0])
+    if kind == 'rank':
+        frame[args[0]] = range(1, len(frame) + 1)
+    elif kind == 'pct_change':
+        source, target = args
+        frame[target] = frame[source].pct_change() * 100
+    elif kind == 'share_of_rows':
+        source, target = args
+        frame[target] = (frame[source] / rows) * 100
+    elif kind == 'share_of_total':
+        source, target = args
+        frame[target] = (frame[source] / frame[source].sum()) * 100
+    elif kind == 'ratio':
+        numerator, denominator, target = args
+        frame[target] = frame[numerator] / frame[denominator]
+    elif kind == 'round':
+        column, decimals = args
+        frame[column] = frame[column].round(decimals)
+    elif kind == 'date':
+        frame[args[0]] = decode_dates(frame[args[0]])  # AAAAMMDD → datetime64
+    else:
+        raise ValueError(f"Passo de agregação desconhecido: {kind}")
+    return frame
+
+
+def grouping_sets(specs):
+    """Conjuntos distintos de chaves → união das medidas pedidas para cada um"""
+    measures_by_keys = {}
+    for spec in specs.values():
+        measures = measures_by_keys.setdefault(tuple(spec['keys']), [])
+        measures.extend(m for m in spec['measures'] if m not in measures)
+    return measures_by_keys
+
+
+def group_measures(df, specs):
+    """Agrupa cada conjunto distinto de chaves uma única vez, com a união das medidas
+
+    observed=True: com chaves categóricas (schema.py) só os grupos com vendas
+    entram no resultado, como no groupby sobre texto.
+    """
+    grouped = {}
+    for keys, measures in grouping_sets(specs).items():
+        with span('aggregate.groupby', rows=len(df), keys='+'.join(keys)):
+            grouped[keys] = df.groupby(list(keys), observed=True).agg(**{m: MEASURES[m] for m in measures}).reset_index()
+    return grouped
+
+
+def select_specs(names=None):
+    """Nomes pedidos (na ordem de FRAME_ORDER) e especificações dos agregados entre eles"""
+    names = FRAME_ORDER if names is None else [name for name in FRAME_ORDER if name in names]
+    return names, {name: AGGREGATES[name] for name in names if name in AGGREGATES}
+
+
+def assemble_aggregates(names, specs, grouped, special, rows):
+    """Monta os DataFrames finais a partir dos agrupamentos já calculados
+
+    `grouped` segue o formato de group_measures (chaves ordenadas + medidas),
+    `special` traz os DataFrames que não vêm de groupby e `rows` é o total de
+    vendas usado nos percentuais. Serve tanto à base em memória quanto ao MySQL.
+    Os DataFrames saem nos tipos compactos de schema.compact_aggregate.
+    """
+    frames = {}
+    for name in names:
+        if name in SPECIAL_FRAMES:
+            frames[name] = compact_aggregate(special[name])
+            continue
+
+        spec = specs[name]
+        frame = grouped[tuple(spec['keys'])][spec['keys'] + spec['measures']].copy()
+        frame.columns = spec['columns']
+        for step in spec['steps']:
+            frame = _apply_step(frame, step, rows)
+        frames[name] = compact_aggregate(frame)
+
+    return frames
+
+
+def build_aggregates(df, names=None):
+    """Gera os DataFrames agregados (todos ou apenas `names`) a partir da base"""
+    names, specs = select_specs(names)
+    special = {name: SPECIAL_FRAMES[name](df) for name in names if name in SPECIAL_FRAMES}
+    return assemble_aggregates(names, specs, group_measures(df, specs), special, len(df))
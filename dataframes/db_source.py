@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+DataFrames Agregados a partir do MySQL (Star Schema)
+Descrição: Executa no banco as mesmas agregações de aggregations.py sobre
+           fact_sales + dimensões e busca apenas os resultados agrupados;
+           o histórico completo de vendas nunca é carregado no Python
+============================================================================
+
+Uso (verificação de paridade entre o CSV e o banco):
+    python db_source.py --check [--input car_sales.csv]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    from aggregations import (
+        CORRELATION_COLUMNS, assemble_aggregates, build_aggregates, grouping_sets,
+        receita_total_frame, select_specs, total_frame
+    )
+    from instrumentation import instrumented, span
+    from schema import encode_dates
+except ImportError:  # importado como pacote (dataframes.db_source)
+    from dataframes.aggregations import (
+        CORRELATION_COLUMNS, assemble_aggregates, build_aggregates, grouping_sets,
+        receita_total_frame, select_specs, total_frame
+    )
+    from dataframes.instrumentation import instrumented, span
+    from dataframes.schema import encode_dates
+
+DATABASE_DIR = Path(__file__).resolve().parent.parent / 'database'
+
+# Dimensões do star schema: alias → cláusula de junção com fact_sales (f)
+DIMENSION_JOINS = {
+    't': "JOIN dim_time t ON t.date_key = f.date_key",
+    'c': "JOIN dim_customer c ON c.customer_key = f.customer_key",
+    'd': "JOIN dim_dealer d ON d.dealer_key = f.dealer_key",
+    'v': "JOIN dim_vehicle v ON v.vehicle_key = f.vehicle_key"
+}
+
+# Colação das colunas de texto nas agregações: as tabelas usam
+# utf8mb4_unicode_ci, e com ela o GROUP BY e o COUNT(DISTINCT) juntariam
+# 'Ford' e 'FORD' (ou 'Jose' e 'José'), que o pandas mantém separados. A
+# utf8mb4_bin compara como o pandas, exceto por espaços no fim (PAD SPACE),
+# que o ETL já remove. A ordem das linhas não depende da colação: o
+# resultado é reordenado no pandas (_grouped_frame).
+TEXT_COLLATION = 'utf8mb4_bin'
+
+
+def _text(column):
+    """Coluna de texto comparada com TEXT_COLLATION"""
+    return f"{column} COLLATE {TEXT_COLLATION}"
+
+
+# Chave de agrupamento da base CSV → (expressão SQL, dimensão necessária)
+KEY_SQL = {
+    'Date': ("f.date_key", None),
+    'YearMonth': ("DATE_FORMAT(t.date_key, '%Y-%m')", 't'),
+    'Year': ("t.year", 't'),
+    'Quarter': ("t.quarter", 't'),
+    'Gender': (_text("c.gender"), 'c'),
+    'Faixa_Renda': (_text("c.income_bracket"), 'c'),
+    'Dealer_Name': (_text("d.dealer_name"), 'd'),
+    'Dealer_Region': (_text("d.dealer_region"), 'd'),
+    'Company': (_text("v.company"), 'v'),
+    'Model': (_text("v.model"), 'v'),
+    'Body Style': (_text("v.body_style"), 'v'),
+    'Transmission': (_text("v.transmission"), 'v'),
+    'Color': (_text("v.color"), 'v')
+}
+
+# Medida de aggregations.MEASURES → (expressão SQL, dimensão necessária)
+# (+ 0E0 força a divisão em ponto flutuante, como no pandas, em vez de DECIMAL)
+MEASURE_SQL = {
+    'quantidade': ("COUNT(f.car_id)", None),
+    'receita': ("SUM(f.price)", None),
+    'preco_medio': ("AVG(f.price)", None),
+    'renda_media': ("AVG(f.annual_income)", None),
+    'esforco_medio': ("AVG((f.price + 0E0) / f.annual_income)", None),
+    'concessionarias': (f"COUNT(DISTINCT {_text('d.dealer_name')})", 'd')
+}
+
+TOTALS_QUERY = """
+SELECT COUNT(car_id) AS quantidade, SUM(price) AS receita, AVG(price) AS preco_medio
+FROM fact_sales
+"""
+
+# Somas dos produtos dos desvios em relação à média (correlação de Pearson
+# calculada no banco em duas passadas, numericamente estável)
+CORRELATION_QUERY = """
+SELECT
+    SUM(di * di) AS ii, SUM(dp * dp) AS pp, SUM(de * de) AS ee,
+    SUM(di * dp) AS ip, SUM(di * de) AS ie, SUM(dp * de) AS pe
+FROM (
+    SELECT
+        f.annual_income - m.renda AS di,
+        f.price - m.preco AS dp,
+        (f.price + 0E0) / f.annual_income - m.esforco AS de
+    FROM fact_sales f
+    CROSS JOIN (
+        SELECT
+            AVG(annual_income + 0E0) AS renda,
+            AVG(price + 0E0) AS preco,
+            AVG((price + 0E0) / annual_income) AS esforco
+        FROM fact_sales
+    ) m
+) desvios
+"""
+
+
+def _db_pool():
+    """Módulo database/db_pool.py, importado na primeira consulta (só ela exige o conector)"""
+    try:
+        import db_pool
+    except ImportError:
+        try:
+            from database import db_pool
+        except ImportError:
+            # Executado como script a partir de dataframes/: database/ fica fora do caminho
+            sys.path.insert(0, str(DATABASE_DIR))
+            import db_pool
+    return db_pool
+
+
+def read_frame(query, params=None):
+    """Executa a consulta no pool de conexões e devolve o resultado como DataFrame"""
+    return _db_pool().read_frame(query, params)
+
+
+def grouping_query(keys, measures):
+    """SELECT ... GROUP BY que calcula as medidas para um conjunto de chaves"""
+    aliases = {KEY_SQL[key][1] for key in keys} | {MEASURE_SQL[m][1] for m in measures}
+    columns = [f"{KEY_SQL[key][0]} AS `{key}`" for key in keys]
+    columns += [f"{MEASURE_SQL[m][0]} AS {m}" for m in measures]
+    joins = [join for alias, join in DIMENSION_JOINS.items() if alias in aliases]
+    positions = ', '.join(str(i) for i in range(1, len(keys) + 1))
+    return "\n".join([
+        "SELECT " + ",\n       ".join(columns),
+        "FROM fact_sales f",
+        *joins,
+        f"GROUP BY {positions}"
+    ])
+
+
+def _grouped_frame(keys, measures):
+    """Executa a agregação no banco e devolve no formato de group_measures"""
+    with span('mysql.groupby', keys='+'.join(keys)) as record:
+        frame = read_frame(grouping_query(keys, measures))
+        record['rows'] = len(frame)
+
+    # DECIMAL chega como Decimal e DATE como datetime.date (AAAAMMDD, como em schema.py)
+    for measure in measures:
+        frame[measure] = pd.to_numeric(frame[measure])
+    if 'Date' in keys:
+        frame['Date'] = encode_dates(pd.to_datetime(frame['Date']))
+
+    # A ordenação é feita aqui: a collation do MySQL não ordena como o pandas
+    return (frame.dropna(subset=list(keys))
+                 .sort_values(list(keys), ignore_index=True))
+
+
+@instrumented('mysql.correlation')
+def _correlation_frame():
+    """Matriz de correlação a partir das somas calculadas no banco"""
+    sums = read_frame(CORRELATION_QUERY).iloc[0].astype('float64')
+    cov = np.array([
+        [sums['ii'], sums['ip'], sums['ie']],
+        [sums['ip'], sums['pp'], sums['pe']],
+        [sums['ie'], sums['pe'], sums['ee']]
+    ])
+    std = np.sqrt(np.diag(cov))
+    corr = cov / np.outer(std, std)
+    np.fill_diagonal(corr, 1.0)
+    return pd.DataFrame(corr, index=CORRELATION_COLUMNS, columns=CORRELATION_COLUMNS)
+
+
+@instrumented('mysql.build_aggregates')
+def build_aggregates_from_db(names=None):
+    """Gera os DataFrames agregados (todos ou apenas `names`) consultando o MySQL"""
+    names, specs = select_specs(names)
+
+    totals = read_frame(TOTALS_QUERY).iloc[0]
+    rows = int(totals['quantidade'])
+
+    special = {}
+    if 'df_total' in names:
+        special['df_total'] = total_frame(rows)
+    if 'df_receita_total' in names:
+        special['df_receita_total'] = receita_total_frame(float(totals['receita']),
+                                                          float(totals['preco_medio']))
+    if 'df_correlacao' in names:
+        special['df_correlacao'] = _correlation_frame()
+
+    grouped = {keys: _grouped_frame(keys, measures)
+               for keys, measures in grouping_sets(specs).items()}
+    return assemble_aggregates(names, specs, grouped, special, rows)
+
+
+def compare_frame(expected, actual, rtol=1e-6):
+    """Compara um DataFrame do CSV com o do banco (AssertionError se divergirem)
+
+    Colunas, índice, contagens e chaves são comparados exatamente (sem exigir
+    o mesmo dtype: DECIMAL chega como float64, int32 × int64). A tolerância
+    relativa `rtol` vale só para as medidas em ponto flutuante do CSV (médias,
+    percentuais e as colunas float32 do schema compacto, com ~7 dígitos).
+    """
+    pd.testing.assert_index_equal(expected.columns, actual.columns)
+    pd.testing.assert_index_equal(expected.index, actual.index, exact=False)
+    for column in expected.columns:
+        if expected[column].dtype.kind == 'f':
+            pd.testing.assert_series_equal(expected[column], actual[column], check_dtype=False,
+                                           check_exact=False, rtol=rtol)
+        else:
+            pd.testing.assert_series_equal(expected[column], actual[column], check_dtype=False,
+                                           check_exact=True)
+
+
+def compare_sources(csv_file, names=None, rtol=1e-6):
+    """Compara os DataFrames gerados do CSV e do MySQL; retorna as divergências
+
+    Cada DataFrame é comparado com compare_frame: exato para contagens e
+    chaves, tolerância `rtol` apenas nas medidas em ponto flutuante.
+    """
+    try:
+        from generate_dataframes import add_derived_columns, load_sales
+    except ImportError:
+        from dataframes.generate_dataframes import add_derived_columns, load_sales
+
+    expected = build_aggregates(add_derived_columns(load_sales(csv_file)), names)
+    actual = build_aggregates_from_db(names)
+
+    differences = {}
+    for name, frame in expected.items():
+        try:
+            compare_frame(frame, actual[name], rtol)
+        except AssertionError as e:
+            differences[name] = str(e)
+    return differences
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Agregações do dashboard calculadas no MySQL")
+    parser.add_argument('--check', action='store_true',
+                        help="Compara os DataFrames do CSV com os do banco (paridade)")
+    parser.add_argument('--input', default=str(Path(__file__).resolve().parent / 'car_sales.csv'),
+                        help="CSV usado como referência na verificação de paridade")
+    parser.add_argument('--frames', nargs='+', metavar='NOME',
+                        help="Limita a verificação a estes DataFrames")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    if not args.check:
+        frames = build_aggregates_from_db(args.frames)
+        for name, frame in frames.items():
+            print(f"{name}: {frame.shape}")
+        return 0
+
+    print("→ Verificando paridade CSV × MySQL...")
+    differences = compare_sources(args.input, args.frames)
+    if differences:
+        for name, message in differences.items():
+            print(f"\n✗ {name}:\n{message}")
+        print(f"\n✗ {len(differences)} DataFrame(s) divergentes")
+        return 1
+
+    print("✓ Todos os DataFrames são idênticos nas duas fontes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Armazenamento dos DataFrames em Arquivos Colunares
+Descrição: Um arquivo Feather (Arrow IPC, sem compressão) por DataFrame e
+           um manifest.json com formato e schema de cada um; a base bruta
+           fica separada em raw/, é gravada e lida no schema compacto
+           (schema.py) e só é lida quando solicitada
+============================================================================
+"""
+
+import json
+from pathlib import Path
+
+import pyarrow.feather as feather
+
+try:
+    from schema import apply_schema
+except ImportError:  # importado como pacote (dataframes.frame_store) pelo Streamlit
+    from dataframes.schema import apply_schema
+
+MANIFEST_FILE = 'manifest.json'
+
+# DataFrames gravados em raw/ (carregados apenas sob demanda)
+RAW_FRAMES = {'df_original'}
+
+
+def write_store(frames, directory, replace=True):
+    """Grava cada DataFrame em seu arquivo e o manifest com shapes e schema
+
+    Com replace=False apenas os DataFrames informados são regravados; os
+    demais já existentes no diretório são mantidos no manifest.
+    """
+    directory = Path(directory)
+    (directory / 'raw').mkdir(parents=True, exist_ok=True)
+
+    manifest = {}
+    if not replace and (directory / MANIFEST_FILE).exists():
+        manifest = read_manifest(directory)
+    for name, df in frames.items():
+        kind = 'raw' if name in RAW_FRAMES else 'aggregate'
+        if kind == 'raw':
+            df = apply_schema(df)  # categorias viram colunas dicionário no Arrow
+        path = Path('raw', f'{name}.feather') if kind == 'raw' else Path(f'{name}.feather')
+
+        # Sem compressão para permitir leitura mapeada em memória (zero-copy)
+        feather.write_feather(df, directory / path, compression='uncompressed')
+
+        manifest[name] = {
+            'path': path.as_posix(),
+            'kind': kind,
+            'rows': int(df.shape[0]),
+            'columns': [str(col) for col in df.columns],
+            'dtypes': {str(col): str(dtype) for col, dtype in df.dtypes.items()},
+            'memory_mb': round(float(df.memory_usage(deep=True).sum()) / 2**20, 3)
+        }
+
+    # Remove arquivos de DataFrames que deixaram de ser gerados
+    # (ou cuja entrada no manifest foi substituída)
+    expected = {directory / entry['path'] for entry in manifest.values()}
+    for stale in set(directory.glob('*.feather')) | set(directory.glob('raw/*.feather')):
+        if stale not in expected:
+            stale.unlink()
+
+    with open(directory / MANIFEST_FILE, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+    return manifest
+
+
+def read_manifest(directory):
+    """Lê o manifest do diretório de DataFrames"""
+    with open(Path(directory) / MANIFEST_FILE, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def read_frame(directory, name, manifest=None):
+    """Lê um DataFrame do diretório com o arquivo mapeado em memória
+
+    As colunas numéricas são convertidas sem cópia quando possível
+    (split_blocks); colunas dicionário voltam como categorias. A base bruta
+    passa por apply_schema, o que também converte stores gravados antes do
+    schema compacto.
+    """
+    manifest = manifest or read_manifest(directory)
+    if name not in manifest:
+        raise KeyError(f"DataFrame '{name}' não encontrado em {directory}")
+
+    table = feather.read_table(Path(directory) / manifest[name]['path'], memory_map=True)
+    frame = table.to_pandas(split_blocks=True)
+    return apply_schema(frame) if manifest[name]['kind'] == 'raw' else frame
@@ -7,282 +7,212 @@ Autor: David Carvalho
 Data: 10/11/2025
 Descrição: Gera DataFrames estruturados para visualização no Streamlit
 ============================================================================
-"""
 
-import pandas as pd
-import numpy as np
-from datetime import datetime
-import pickle
+Uso:
+    python generate_dataframes.py [--source csv|mysql] [--input car_sales.csv]
+                                  [--output-dir .]
+                                  [--format all|feather|csv]
+                                  [--frames df_vendas_mes df_genero ...]
 
-# Carregar dados do CSV
-print("="*80)
-print("GERAÇÃO DE DATAFRAMES PARA STREAMLIT")
-print("="*80)
+Também pode ser importado (load_sales, build_dataframes, save_dataframes)
+para regerar ou cronometrar DataFrames individualmente.
+"""
 
-print("\n→ Carregando dados do CSV...")
-df = pd.read_csv('car_sales.csv')
+import argparse
+import os
+import sys
+from pathlib import Path
 
-# Transformar data
-df['Date'] = pd.to_datetime(df['Date'], format='%m/%d/%Y')
-df['Year'] = df['Date'].dt.year
-df['Month'] = df['Date'].dt.month
-df['Quarter'] = df['Date'].dt.quarter
-df['YearMonth'] = df['Date'].dt.to_period('M').astype(str)
+import pandas as pd
+
+try:
+    from aggregations import FRAME_ORDER, build_aggregates
+    from frame_store import write_store
+    from income_brackets import income_bracket
+    from instrumentation import add_arguments, configure_from_args, instrumented
+    from instrumentation import print_summary as print_stage_summary
+    from schema import CSV_DTYPES, MISSING_PHONE, apply_schema, encode_car_ids, encode_dates, memory_mb
+except ImportError:  # importado como pacote (dataframes.generate_dataframes)
+    from dataframes.aggregations import FRAME_ORDER, build_aggregates
+    from dataframes.frame_store import write_store
+    from dataframes.income_brackets import income_bracket
+    from dataframes.instrumentation import add_arguments, configure_from_args, instrumented
+    from dataframes.instrumentation import print_summary as print_stage_summary
+    from dataframes.schema import (
+        CSV_DTYPES, MISSING_PHONE, apply_schema, encode_car_ids, encode_dates, memory_mb
+    )
+
+BASE_DIR = Path(__file__).resolve().parent
+CSV_FILE = BASE_DIR / 'car_sales.csv'
+
+# Todos os DataFrames que podem ser gerados (agregados + base bruta)
+ALL_FRAMES = FRAME_ORDER + ['df_original']
+
+OUTPUT_FORMATS = ('all', 'feather', 'csv')
+
+# Origem dos dados: CSV em memória ou agregação feita no MySQL (db_source.py)
+SOURCES = ('csv', 'mysql')
+
+
+@instrumented('dataframes.load_sales', rows=len)
+def load_sales(csv_file=CSV_FILE):
+    """Lê o CSV de vendas no schema compacto (schema.py) e cria as colunas de data"""
+    df = pd.read_csv(csv_file, dtype=CSV_DTYPES)
+    df['Car_id'] = encode_car_ids(df['Car_id'])
+    df['Phone'] = df['Phone'].fillna(MISSING_PHONE)
+
+    # Transformar data: cada data distinta (categoria) é convertida uma vez
+    # e as linhas recebem os valores pelos códigos
+    codes = df['Date'].cat.codes.to_numpy()
+    dates = pd.to_datetime(df['Date'].cat.categories, format='%m/%d/%Y')
+    df['Date'] = encode_dates(dates)[codes]
+    df['Year'] = dates.year.to_numpy()[codes]
+    df['Month'] = dates.month.to_numpy()[codes]
+    df['Quarter'] = dates.quarter.to_numpy()[codes]
+    df['YearMonth'] = pd.Categorical(dates.strftime('%Y-%m'))[codes]
+
+    return apply_schema(df)
 
-print(f"✓ Dados carregados: {len(df)} registros")
 
 # ============================================================================
-# DATAFRAMES PARA VENDAS E DESEMPENHO COMERCIAL
+# COLUNAS DERIVADAS
 # ============================================================================
 
-print("\n→ Gerando DataFrames de Vendas e Desempenho...")
-
-# 1. Volume total de vendas
-df_total = pd.DataFrame({
-    'Métrica': ['Total de Vendas'],
-    'Valor': [len(df)]
-})
-
-# 2. Receita total e média
-df_receita_total = pd.DataFrame({
-    'Métrica': ['Receita Total', 'Ticket Médio'],
-    'Valor': [df['Price ($)'].sum(), df['Price ($)'].mean()]
-})
-
-# 3. Taxa de crescimento mensal
-df_vendas_mes = df.groupby('YearMonth').agg({
-    'Car_id': 'count',
-    'Price ($)': 'sum'
-}).reset_index()
-df_vendas_mes.columns = ['Mês', 'Quantidade', 'Receita']
-df_vendas_mes['Crescimento (%)'] = df_vendas_mes['Receita'].pct_change() * 100
-
-# 4. Modelos e marcas mais vendidos
-df_modelos_vendidos = df.groupby(['Company', 'Model']).agg({
-    'Car_id': 'count',
-    'Price ($)': ['sum', 'mean']
-}).reset_index()
-df_modelos_vendidos.columns = ['Marca', 'Modelo', 'Quantidade', 'Receita Total', 'Preço Médio']
-df_modelos_vendidos = df_modelos_vendidos.sort_values('Quantidade', ascending=False)
-
-# 5. Vendas por trimestre (sazonalidade)
-df_sazonalidade = df.groupby(['Year', 'Quarter']).agg({
-    'Car_id': 'count',
-    'Price ($)': 'sum'
-}).reset_index()
-df_sazonalidade.columns = ['Ano', 'Trimestre', 'Quantidade', 'Receita']
-
-print("✓ DataFrames de vendas gerados")
+@instrumented('dataframes.add_derived_columns', rows='df')
+def add_derived_columns(df):
+    """Adiciona faixa de renda e índice de esforço financeiro à base"""
+    # Criar faixa de renda (limites definidos em income_brackets.py, os mesmos do SQL)
+    df['Faixa_Renda'] = income_bracket(df['Annual Income'])
 
-# ============================================================================
-# DATAFRAMES PARA PERFIL DO CLIENTE
-# ============================================================================
+    # Índice de esforço financeiro (preço / renda)
+    df['Esforco_Financeiro'] = df['Price ($)'] / df['Annual Income']
+
+    return apply_schema(df)
 
-print("\n→ Gerando DataFrames de Perfil do Cliente...")
-
-# 6. Criar faixa de renda
-def categorize_income(income):
-    if income < 50000:
-        return 'Baixa (< 50k)'
-    elif income < 100000:
-        return 'Média-Baixa (50k-100k)'
-    elif income < 500000:
-        return 'Média (100k-500k)'
-    elif income < 1000000:
-        return 'Média-Alta (500k-1M)'
-    else:
-        return 'Alta (> 1M)'
-
-df['Faixa_Renda'] = df['Annual Income'].apply(categorize_income)
-
-# 7. Distribuição por faixa de renda
-df_agrupar_faixa_renda = df.groupby('Faixa_Renda').agg({
-    'Car_id': 'count',
-    'Price ($)': 'mean',
-    'Annual Income': 'mean'
-}).reset_index()
-df_agrupar_faixa_renda.columns = ['Faixa de Renda', 'Quantidade', 'Preço Médio', 'Renda Média']
-df_agrupar_faixa_renda['Percentual (%)'] = (df_agrupar_faixa_renda['Quantidade'] / len(df)) * 100
-
-# 8. Percentual por gênero
-df_genero = df.groupby('Gender').agg({
-    'Car_id': 'count',
-    'Price ($)': 'mean',
-    'Annual Income': 'mean'
-}).reset_index()
-df_genero.columns = ['Gênero', 'Quantidade', 'Preço Médio', 'Renda Média']
-df_genero['Percentual (%)'] = (df_genero['Quantidade'] / len(df)) * 100
-
-# 9. Índice de esforço financeiro (preço / renda)
-df['Esforco_Financeiro'] = df['Price ($)'] / df['Annual Income']
-df_renda_x_modelo = df.groupby(['Faixa_Renda', 'Model']).agg({
-    'Car_id': 'count',
-    'Price ($)': 'mean',
-    'Esforco_Financeiro': 'mean'
-}).reset_index()
-df_renda_x_modelo.columns = ['Faixa de Renda', 'Modelo', 'Quantidade', 'Preço Médio', 'Esforço Financeiro']
-df_renda_x_modelo = df_renda_x_modelo.sort_values(['Faixa de Renda', 'Quantidade'], ascending=[True, False])
-
-# 10. Preferências por faixa de renda e gênero
-df_preferencias = df.groupby(['Faixa_Renda', 'Gender', 'Company']).agg({
-    'Car_id': 'count',
-    'Price ($)': 'mean'
-}).reset_index()
-df_preferencias.columns = ['Faixa de Renda', 'Gênero', 'Marca', 'Quantidade', 'Preço Médio']
-df_preferencias = df_preferencias.sort_values(['Faixa de Renda', 'Quantidade'], ascending=[True, False])
-
-print("✓ DataFrames de perfil do cliente gerados")
 
 # ============================================================================
-# DATAFRAMES PARA ANÁLISE REGIONAL
+# DATAFRAMES AGREGADOS
 # ============================================================================
 
-print("\n→ Gerando DataFrames de Análise Regional...")
-
-# 11. Receita por região
-df_receita_regiao = df.groupby('Dealer_Region').agg({
-    'Car_id': 'count',
-    'Price ($)': 'sum'
-}).reset_index()
-df_receita_regiao.columns = ['Região', 'Quantidade', 'Receita Total']
-df_receita_regiao['Percentual (%)'] = (df_receita_regiao['Receita Total'] / df_receita_regiao['Receita Total'].sum()) * 100
-df_receita_regiao = df_receita_regiao.sort_values('Receita Total', ascending=False)
-
-# 12. Ticket médio por concessionária
-df_ticket_medio_concessionaria = df.groupby(['Dealer_Name', 'Dealer_Region']).agg({
-    'Car_id': 'count',
-    'Price ($)': ['sum', 'mean']
-}).reset_index()
-df_ticket_medio_concessionaria.columns = ['Concessionária', 'Região', 'Quantidade', 'Receita Total', 'Ticket Médio']
-df_ticket_medio_concessionaria = df_ticket_medio_concessionaria.sort_values('Ticket Médio', ascending=False)
-
-# 13. Ranking de concessionárias
-df_ranking = df.groupby(['Dealer_Name', 'Dealer_Region']).agg({
-    'Car_id': 'count',
-    'Price ($)': 'sum'
-}).reset_index()
-df_ranking.columns = ['Concessionária', 'Região', 'Quantidade', 'Receita Total']
-df_ranking = df_ranking.sort_values('Quantidade', ascending=False)
-df_ranking['Ranking'] = range(1, len(df_ranking) + 1)
-
-# 14. Comparação entre regiões
-df_comparacao_regioes = df.groupby('Dealer_Region').agg({
-    'Dealer_Name': 'nunique',
-    'Car_id': 'count',
-    'Price ($)': ['sum', 'mean']
-}).reset_index()
-df_comparacao_regioes.columns = ['Região', 'Nº Concessionárias', 'Quantidade', 'Receita Total', 'Ticket Médio']
-df_comparacao_regioes['Receita por Concessionária'] = df_comparacao_regioes['Receita Total'] / df_comparacao_regioes['Nº Concessionárias']
-
-print("✓ DataFrames de análise regional gerados")
+@instrumented('dataframes.build_dataframes', rows='df')
+def build_dataframes(df, names=None):
+    """Gera os DataFrames (todos ou apenas `names`) a partir da base com colunas derivadas
 
-# ============================================================================
-# DATAFRAMES ADICIONAIS PARA VISUALIZAÇÕES
-# ============================================================================
+    A especificação de cada DataFrame está em aggregations.py; cada conjunto de
+    chaves (ex.: Dealer_Name + Dealer_Region) é agrupado uma única vez.
+    """
+    names = ALL_FRAMES if names is None else names
+    unknown = set(names) - set(ALL_FRAMES)
+    if unknown:
+        raise ValueError(f"DataFrames desconhecidos: {', '.join(sorted(unknown))}")
+
+    frames = build_aggregates(df, names)
+    if 'df_original' in names:
+        frames['df_original'] = df
+    return frames
 
-print("\n→ Gerando DataFrames adicionais...")
-
-# 15. Vendas por tipo de carroceria
-df_body_style = df.groupby('Body Style').agg({
-    'Car_id': 'count',
-    'Price ($)': ['sum', 'mean']
-}).reset_index()
-df_body_style.columns = ['Tipo de Carroceria', 'Quantidade', 'Receita Total', 'Preço Médio']
-df_body_style = df_body_style.sort_values('Quantidade', ascending=False)
-
-# 16. Vendas por transmissão
-df_transmission = df.groupby('Transmission').agg({
-    'Car_id': 'count',
-    'Price ($)': 'mean'
-}).reset_index()
-df_transmission.columns = ['Transmissão', 'Quantidade', 'Preço Médio']
-
-# 17. Vendas por cor
-df_color = df.groupby('Color').agg({
-    'Car_id': 'count',
-    'Price ($)': 'mean'
-}).reset_index()
-df_color.columns = ['Cor', 'Quantidade', 'Preço Médio']
-df_color = df_color.sort_values('Quantidade', ascending=False)
-
-# 18. Top 10 marcas
-df_top_marcas = df.groupby('Company').agg({
-    'Car_id': 'count',
-    'Price ($)': ['sum', 'mean']
-}).reset_index()
-df_top_marcas.columns = ['Marca', 'Quantidade', 'Receita Total', 'Preço Médio']
-df_top_marcas = df_top_marcas.sort_values('Quantidade', ascending=False).head(10)
-
-# 19. Evolução temporal das vendas
-df_evolucao = df.groupby('Date').agg({
-    'Car_id': 'count',
-    'Price ($)': 'sum'
-}).reset_index()
-df_evolucao.columns = ['Data', 'Quantidade', 'Receita']
-
-# 20. Matriz de correlação entre variáveis numéricas
-df_correlacao = df[['Annual Income', 'Price ($)', 'Esforco_Financeiro']].corr()
-
-print("✓ DataFrames adicionais gerados")
 
 # ============================================================================
 # SALVAR DATAFRAMES
 # ============================================================================
 
-print("\n→ Salvando DataFrames...")
-
-# Criar dicionário com todos os DataFrames
-dataframes = {
-    'df_total': df_total,
-    'df_receita_total': df_receita_total,
-    'df_vendas_mes': df_vendas_mes,
-    'df_modelos_vendidos': df_modelos_vendidos,
-    'df_sazonalidade': df_sazonalidade,
-    'df_agrupar_faixa_renda': df_agrupar_faixa_renda,
-    'df_genero': df_genero,
-    'df_renda_x_modelo': df_renda_x_modelo,
-    'df_preferencias': df_preferencias,
-    'df_receita_regiao': df_receita_regiao,
-    'df_ticket_medio_concessionaria': df_ticket_medio_concessionaria,
-    'df_ranking': df_ranking,
-    'df_comparacao_regioes': df_comparacao_regioes,
-    'df_body_style': df_body_style,
-    'df_transmission': df_transmission,
-    'df_color': df_color,
-    'df_top_marcas': df_top_marcas,
-    'df_evolucao': df_evolucao,
-    'df_correlacao': df_correlacao,
-    'df_original': df
-}
-
-# Salvar como pickle para uso no Streamlit
-with open('dataframes.pkl', 'wb') as f:
-    pickle.dump(dataframes, f)
-
-# Salvar também como CSV individuais
-import os
-os.makedirs('dataframes_csv', exist_ok=True)
+@instrumented('dataframes.save_dataframes')
+def save_dataframes(frames, output_dir=BASE_DIR, output_format='all', replace=True):
+    """Grava os DataFrames em `output_dir`/store (Feather) e/ou `output_dir`/dataframes_csv
+
+    Com replace=False os DataFrames não informados continuam no store
+    (regeração seletiva).
+    """
+    output_dir = Path(output_dir)
+
+    if output_format in ('all', 'feather'):
+        # Um arquivo colunar por DataFrame (df_original separado em store/raw/)
+        # para o Streamlit ler apenas o que cada página precisa
+        write_store(frames, output_dir / 'store', replace=replace)
+
+    if output_format in ('all', 'csv'):
+        os.makedirs(output_dir / 'dataframes_csv', exist_ok=True)
+        for name, data in frames.items():
+            if name != 'df_original':  # Não salvar o original novamente
+                data.to_csv(output_dir / 'dataframes_csv' / f'{name}.csv', index=False)
+
+
+def print_summary(frames):
+    """Imprime shape e colunas de cada DataFrame gerado"""
+    print("\n" + "="*80)
+    print("RESUMO DOS DATAFRAMES GERADOS")
+    print("="*80)
+
+    for name, data in frames.items():
+        if isinstance(data, pd.DataFrame):
+            print(f"\n{name}:")
+            print(f"  • Shape: {data.shape} ({memory_mb(data):.2f} MB)")
+            print(f"  • Colunas: {list(data.columns)}")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Gera os DataFrames do dashboard Streamlit")
+    parser.add_argument('--source', choices=SOURCES, default='csv',
+                        help="csv: agrega o CSV em memória; mysql: agrega no banco "
+                             "(fact_sales + dimensões), sem df_original")
+    parser.add_argument('--input', default=str(CSV_FILE),
+                        help="CSV de vendas (padrão: car_sales.csv ao lado do script)")
+    parser.add_argument('--output-dir', default=str(BASE_DIR),
+                        help="Diretório onde são criados store/ e dataframes_csv/")
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='all',
+                        help="Formato de saída: Feather (store/), CSV ou ambos")
+    parser.add_argument('--frames', nargs='+', choices=ALL_FRAMES, metavar='NOME',
+                        help="Gera apenas estes DataFrames, mantendo os demais já gravados")
+    parser.add_argument('--quiet', action='store_true',
+                        help="Não imprime o resumo dos DataFrames")
+    add_arguments(parser)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_from_args(args)
+
+    print("="*80)
+    print("GERAÇÃO DE DATAFRAMES PARA STREAMLIT")
+    print("="*80)
+
+    if args.source == 'mysql':
+        # Importado sob demanda: só esta origem exige o conector MySQL
+        try:
+            from db_source import build_aggregates_from_db
+        except ImportError:
+            from dataframes.db_source import build_aggregates_from_db
+
+        names = [name for name in (args.frames or ALL_FRAMES) if name != 'df_original']
+        print("\n→ Gerando DataFrames agregados no MySQL...")
+        frames = build_aggregates_from_db(names)
+        print(f"✓ {len(frames)} DataFrames gerados (df_original não é lido do banco)")
+        replace = False
+    else:
+        print(f"\n→ Carregando dados de {args.input}...")
+        df = add_derived_columns(load_sales(args.input))
+        print(f"✓ Dados carregados: {len(df)} registros")
 
-for name, data in dataframes.items():
-    if name != 'df_original':  # Não salvar o original novamente
-        data.to_csv(f'dataframes_csv/{name}.csv', index=False)
+        print("\n→ Gerando DataFrames agregados...")
+        frames = build_dataframes(df, args.frames)
+        print(f"✓ {len(frames)} DataFrames gerados")
+        replace = args.frames is None
 
-print("✓ DataFrames salvos em 'dataframes.pkl' e 'dataframes_csv/'")
+    print("\n→ Salvando DataFrames...")
+    save_dataframes(frames, args.output_dir, args.format, replace=replace)
+    print(f"✓ DataFrames salvos em '{args.output_dir}' ({args.format})")
 
-# ============================================================================
-# RESUMO
-# ============================================================================
+    if not args.quiet:
+        print_summary(frames)
+    if args.profile:
+        print_stage_summary()
 
-print("\n" + "="*80)
-print("RESUMO DOS DATAFRAMES GERADOS")
-print("="*80)
+    print("\n" + "="*80)
+    print("✓ PROCESSO CONCLUÍDO COM SUCESSO!")
+    print("="*80)
+    return 0
 
-for name, data in dataframes.items():
-    if isinstance(data, pd.DataFrame):
-        print(f"\n{name}:")
-        print(f"  • Shape: {data.shape}")
-        print(f"  • Colunas: {list(data.columns)}")
 
-print("\n" + "="*80)
-print("✓ PROCESSO CONCLUÍDO COM SUCESSO!")
-print("="*80)
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Faixas de Renda
+Descrição: Definição única das faixas de renda anual, usada pelo pandas
+           (generate_dataframes.py, dimension_loader.py) e como fonte do
+           CASE dos scripts SQL (views e dim_customer)
+============================================================================
+
+Cada faixa inclui o limite inferior e exclui o superior: [50000, 100000)
+é 'Média-Baixa (50k-100k)'; 1000000 já pertence a 'Alta (> 1M)'.
+
+Uso (imprime o CASE para colar nos scripts SQL):
+    python income_brackets.py [coluna]
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Limite inferior (inclusivo) → rótulo da faixa, em ordem crescente
+BRACKETS = [
+    (-np.inf, 'Baixa (< 50k)'),
+    (50000, 'Média-Baixa (50k-100k)'),
+    (100000, 'Média (100k-500k)'),
+    (500000, 'Média-Alta (500k-1M)'),
+    (1000000, 'Alta (> 1M)')
+]
+
+BINS = [lower for lower, _ in BRACKETS] + [np.inf]
+LABELS = [label for _, label in BRACKETS]
+
+
+def income_bracket(income):
+    """Faixa de renda de cada valor (Categorical ordenado, sem laço em Python)"""
+    return pd.cut(income, bins=BINS, labels=LABELS, right=False, ordered=True)
+
+
+def sql_case(column='annual_income'):
+    """Expressão CASE do SQL equivalente a income_bracket()"""
+    lines = ['CASE']
+    for (_, label), upper in zip(BRACKETS[:-1], BINS[1:-1]):
+        lines.append(f"    WHEN {column} < {upper:.0f} THEN '{label}'")
+    lines.append(f"    ELSE '{BRACKETS[-1][1]}'")
+    lines.append('END')
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    print(sql_case(*sys.argv[1:2]))
@@ -0,0 +1,298 @@
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Instrumentação das Etapas do ETL e da Agregação
+Descrição: Spans (gerenciador de contexto ou decorador) que medem tempo de
+           parede, tempo de CPU, linhas processadas, variação e pico da
+           memória residente e, opcionalmente, o pico de memória alocada
+           pelo Python (tracemalloc) de cada etapa, inclusive as aninhadas;
+           cada span vira uma linha JSON no log de métricas e a execução pode
+           terminar com uma tabela-resumo por etapa
+============================================================================
+
+Uso:
+    from instrumentation import instrumented, span
+
+    @instrumented('etl.load_csv_data', rows=len)
+    def load_csv_data(csv_file): ...
+
+    with span('aggregate.groupby', rows=len(df), keys='YearMonth'):
+        ...
+"""
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:  # Windows: sem ru_maxrss, o pico vem só da amostragem
+    resource = None
+
+# Log de métricas padrão (JSON Lines, uma linha por span) para jobs agendados
+METRICS_LOG_ENV = 'CAR_SALES_METRICS_LOG'
+
+# Spans concluídos e ainda não resumidos (só guardados com keep_records=True;
+# print_summary esvazia a lista)
+RECORDS = []
+
+# Intervalo entre leituras da memória residente enquanto há spans abertos
+RSS_SAMPLE_INTERVAL_S = 0.01
+
+_config = {'log': None, 'trace_memory': False, 'keep_records': False, 'run': uuid.uuid4().hex[:12]}
+_lock = threading.Lock()
+_local = threading.local()
+
+# Spans abertos (de todas as threads) → maior RSS amostrado desde o início
+_open_spans = {}
+_sampling = threading.Event()
+_sampler = None
+
+
+def configure(log_path=None, trace_memory=False, run=None, keep_records=False):
+    """Define o log JSON (None = não grava), o uso de tracemalloc e o id da execução
+
+    Com keep_records=True os spans ficam em RECORDS até o print_summary; sem
+    ele, processos longos (ex.: o dashboard) não acumulam registros.
+    """
+    if _config['log'] is not None:
+        _config['log'].close()
+    _config['log'] = open(log_path, 'a', encoding='utf-8') if log_path else None
+    _config['trace_memory'] = trace_memory
+    _config['keep_records'] = keep_records
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    if run:
+        _config['run'] = run
+
+
+def _rss_mb():
+    """Memória residente atual do processo (Linux; None em outros sistemas)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _max_rss_mb():
+    """Maior RSS do processo desde o início (ru_maxrss, em KB no Linux)"""
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10
+
+
+def _sample_rss():
+    """Thread de amostragem: atualiza o maior RSS visto por cada span aberto"""
+    while True:
+        _sampling.wait()
+        rss = _rss_mb()
+        if rss is not None:
+            with _lock:
+                for key, peak in _open_spans.items():
+                    _open_spans[key] = max(peak, rss)
+        time.sleep(RSS_SAMPLE_INTERVAL_S)
+
+
+def _open_span(key, rss):
+    """Registra o span na amostragem (a thread só roda com spans abertos)"""
+    global _sampler
+    with _lock:
+        _open_spans[key] = rss or 0.0
+        if _sampler is None:
+            _sampler = threading.Thread(target=_sample_rss, name='rss-sampler', daemon=True)
+            _sampler.start()
+        _sampling.set()
+
+
+def _close_span(key):
+    """Retira o span da amostragem e devolve o maior RSS amostrado"""
+    with _lock:
+        peak = _open_spans.pop(key)
+        if not _open_spans:
+            _sampling.clear()
+    return peak
+
+
+def _round(value):
+    return None if value is None else round(value, 1)
+
+
+def _stack():
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def _emit(record):
+    with _lock:
+        if _config['keep_records']:
+            RECORDS.append(record)
+        if _config['log'] is not None:
+            _config['log'].write(json.dumps(record, ensure_ascii=False, default=str) + '\n')
+            _config['log'].flush()
+
+
+@contextmanager
+def span(name, rows=None, **attrs):
+    """Mede o bloco; o dicionário devolvido aceita 'rows' e atributos extras
+
+    Spans aninhados registram o span pai. `rss_delta_mb` é a variação da
+    memória residente do processo entre o início e o fim do span;
+    `rss_peak_mb` é o maior RSS durante o span e `rss_peak_delta_mb`, quanto
+    ele passou do RSS inicial. O pico vem do ru_maxrss quando o span bate o
+    recorde do processo e, nos demais casos, de uma amostragem a cada
+    RSS_SAMPLE_INTERVAL_S (picos mais curtos que isso podem escapar).
+
+    O pico do tracemalloc é global ao processo: cada span da thread principal
+    guarda o pico acumulado até ali, reinicia-o e, ao terminar, repassa ao
+    span pai o maior valor entre o guardado e o seu, para que o pai não perca
+    o que ocorreu antes dos filhos. Spans de outras threads não o medem.
+    """
+    stack = _stack()
+    record = {'event': 'span', 'run': _config['run'], 'name': name,
+              'parent': stack[-1]['name'] if stack else None, 'depth': len(stack),
+              'started_at': datetime.now().isoformat(timespec='milliseconds'), 'rows': rows}
+    record.update(attrs)
+    tracing = (_config['trace_memory'] and tracemalloc.is_tracing()
+               and threading.current_thread() is threading.main_thread())
+    if tracing:
+        outer_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.reset_peak()
+    rss, max_rss = _rss_mb(), _max_rss_mb()
+    key = object()
+    _open_span(key, rss)
+    stack.append(record)
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    record['status'] = 'ok'
+    try:
+        yield record
+    except BaseException as e:
+        record['status'] = 'error'
+        record['error'] = f'{type(e).__name__}: {e}'
+        raise
+    finally:
+        record['wall_s'] = round(time.perf_counter() - wall, 6)
+        record['cpu_s'] = round(time.process_time() - cpu, 6)
+        stack.pop()
+        children_peak = record.pop('_py_children_peak', 0)  # repassado pelos spans filhos
+        if tracing:
+            py_peak = max(tracemalloc.get_traced_memory()[1], children_peak)
+            record['py_peak_mb'] = round(py_peak / 2**20, 3)
+            if stack:
+                parent = stack[-1]
+                parent['_py_children_peak'] = max(parent.get('_py_children_peak', 0), outer_peak, py_peak)
+        rows = record['rows']
+        record['rows_per_s'] = round(rows / record['wall_s'], 1) if rows and record['wall_s'] else None
+        rss_end = _rss_mb()
+        record['rss_mb'] = _round(rss_end)
+        record['rss_delta_mb'] = _round(rss_end - rss) if rss is not None and rss_end is not None else None
+        peak = max(_close_span(key), rss_end or 0.0)
+        max_rss_end = _max_rss_mb()
+        if max_rss is not None and max_rss_end > max_rss:
+            peak = max(peak, max_rss_end)  # o span bateu o recorde do processo
+        record['rss_peak_mb'] = _round(peak) if rss is not None else None
+        record['rss_peak_delta_mb'] = _round(peak - rss) if rss is not None else None
+        _emit(record)
+
+
+def _count(value):
+    try:
+        return len(value)
+    except TypeError:
+        return None
+
+
+def instrumented(name=None, rows=None):
+    """Decorador: executa a função dentro de um span
+
+    `rows` pode ser o nome de um argumento (conta suas linhas, ex.: 'df') ou
+    uma função aplicada ao resultado (ex.: len).
+    """
+    def decorator(function):
+        signature = inspect.signature(function)
+        label = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            count = None
+            if isinstance(rows, str):
+                count = _count(signature.bind(*args, **kwargs).arguments.get(rows))
+            with span(label, rows=count) as record:
+                result = function(*args, **kwargs)
+                if callable(rows) and result is not None:
+                    record['rows'] = rows(result)
+                return result
+        return wrapper
+    return decorator
+
+
+def summary_table(records=None):
+    """Tabela por etapa: chamadas, tempos somados, linhas, linhas/s e memória
+
+    As colunas de memória são, entre as chamadas, a maior variação de RSS
+    (fim - início), o maior pico de RSS acima do início e o maior pico do
+    tracemalloc (só com --trace-memory).
+    """
+    stages = {}
+    for record in RECORDS if records is None else records:
+        stage = stages.setdefault(record['name'], {'calls': 0, 'wall_s': 0.0, 'cpu_s': 0.0, 'rows': 0,
+                                                   'rss_delta_mb': None, 'rss_peak_delta_mb': None,
+                                                   'py_peak_mb': None})
+        stage['calls'] += 1
+        stage['wall_s'] += record['wall_s']
+        stage['cpu_s'] += record['cpu_s']
+        stage['rows'] += record['rows'] or 0
+        for peak in ('rss_delta_mb', 'rss_peak_delta_mb', 'py_peak_mb'):
+            if record.get(peak) is not None:
+                stage[peak] = max(stage[peak] or 0, record[peak])
+
+    def mb(value):
+        return f"{value:9.1f}" if value is not None else f"{'-':>9}"
+
+    lines = [f"{'Etapa':<36} {'Chamadas':>8} {'Parede (s)':>11} {'CPU (s)':>9} "
+             f"{'Linhas':>11} {'Linhas/s':>11} {'ΔRSS (MB)':>9} {'Pico (MB)':>9} {'Py (MB)':>9}"]
+    for name, stage in stages.items():
+        per_second = stage['rows'] / stage['wall_s'] if stage['rows'] and stage['wall_s'] else None
+        lines.append(
+            f"{name[:36]:<36} {stage['calls']:>8} {stage['wall_s']:>11.3f} {stage['cpu_s']:>9.3f} "
+            f"{stage['rows'] or '-':>11} {f'{per_second:,.0f}' if per_second else '-':>11} "
+            f"{mb(stage['rss_delta_mb'])} {mb(stage['rss_peak_delta_mb'])} {mb(stage['py_peak_mb'])}"
+        )
+    return "\n".join(lines)
+
+
+def print_summary():
+    """Imprime a tabela-resumo dos spans desta execução e esvazia RECORDS"""
+    print("\n" + "="*80)
+    print(f"RESUMO DAS ETAPAS (execução {_config['run']})")
+    print("="*80)
+    with _lock:
+        records = RECORDS[:]
+        RECORDS.clear()
+    print(summary_table(records))
+
+
+def add_arguments(parser):
+    """Opções de linha de comando comuns aos scripts instrumentados"""
+    parser.add_argument('--metrics-log', default=os.environ.get(METRICS_LOG_ENV),
+                        help=f"Grava cada etapa como uma linha JSON neste arquivo "
+                             f"(padrão: variável {METRICS_LOG_ENV})")
+    parser.add_argument('--profile', action='store_true',
+                        help="Imprime a tabela-resumo das etapas ao final")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Mede o pico de memória do Python por etapa (tracemalloc, mais lento)")
+    return parser
+
+
+def configure_from_args(args):
+    """Aplica as opções de add_arguments"""
+    configure(args.metrics_log, args.trace_memory, keep_records=args.profile)
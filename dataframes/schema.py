@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Schema Compacto dos DataFrames
+Descrição: Tipos de cada coluna da base (df_original) e regras dos
+           DataFrames agregados: categorias para as dimensões de texto,
+           inteiros de 32 bits (ou menores) para chaves e valores, float32
+           onde a precisão basta e datas como inteiros AAAAMMDD; aplicado na
+           geração, na gravação do store e na leitura pelo dashboard
+============================================================================
+
+Uso (memória da base no schema original × compacto):
+    python schema.py [--input car_sales.csv]
+"""
+
+import argparse
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Car_id 'C_CND_000123' é guardado como o inteiro 123
+CAR_ID_PREFIX = 'C_CND_'
+
+# Tipos de df_original (colunas do CSV + colunas derivadas)
+RAW_SCHEMA = {
+    'Car_id': 'int32',
+    'Date': 'int32',               # AAAAMMDD (encode_dates / decode_dates)
+    'Customer Name': 'category',
+    'Gender': 'category',
+    'Annual Income': 'int32',
+    'Dealer_Name': 'category',
+    'Company': 'category',
+    'Model': 'category',
+    'Engine': 'category',
+    'Transmission': 'category',
+    'Color': 'category',
+    'Price ($)': 'int32',
+    'Dealer_No ': 'category',
+    'Body Style': 'category',
+    'Phone': 'int32',
+    'Dealer_Region': 'category',
+    'Year': 'int16',
+    'Month': 'int8',
+    'Quarter': 'int8',
+    'YearMonth': 'category',
+    'Faixa_Renda': 'category',
+    'Esforco_Financeiro': 'float32'  # preço / renda: 7 dígitos significativos bastam
+}
+
+# Colunas criadas por generate_dataframes.py (não existem no CSV)
+DERIVED_COLUMNS = ('Year', 'Month', 'Quarter', 'YearMonth', 'Faixa_Renda', 'Esforco_Financeiro')
+
+# Colunas numéricas lidas do CSV como float64 (aceitam vazios e centavos) e
+# validadas/convertidas por apply_schema depois da leitura
+CSV_NUMERIC = ('Annual Income', 'Price ($)', 'Phone')
+
+# Tipos na leitura do CSV: Car_id é convertido depois e Date é lida como
+# categoria para que cada data distinta seja interpretada uma única vez
+CSV_DTYPES = {column: dtype for column, dtype in RAW_SCHEMA.items()
+              if column not in DERIVED_COLUMNS and column != 'Car_id'}
+CSV_DTYPES['Date'] = 'category'
+CSV_DTYPES.update(dict.fromkeys(CSV_NUMERIC, 'float64'))
+
+# Telefone ausente (o mesmo valor usado pelo ETL em load_data.py)
+MISSING_PHONE = 0
+
+# Contagens dos DataFrames agregados guardadas em int32
+AGGREGATE_INT32 = {'Quantidade', 'Nº Concessionárias', 'Ranking', 'Valor'}
+
+# Somas em dinheiro ficam com 64 bits: o groupby devolve int32 quando a soma
+# cabe, mas a série temporal e as páginas voltam a acumular esses valores
+AGGREGATE_INT64 = {'Receita', 'Receita Total'}
+
+# Colunas dos DataFrames agregados guardadas em float32 (percentuais e razões);
+# médias em dinheiro continuam float64
+AGGREGATE_FLOAT32 = {
+    'Percentual (%)', 'Crescimento (%)', 'Share (%)', 'Share Receita (%)', 'Esforço Financeiro'
+}
+
+
+def encode_dates(dates):
+    """Datas → inteiros AAAAMMDD (int32)"""
+    dates = pd.DatetimeIndex(dates)
+    return (dates.year * 10000 + dates.month * 100 + dates.day).to_numpy(dtype='int32')
+
+
+def decode_dates(values):
+    """Inteiros AAAAMMDD → datetime64"""
+    values = np.asarray(values, dtype='int64')
+    return pd.to_datetime(pd.DataFrame({'year': values // 10000, 'month': values // 100 % 100,
+                                        'day': values % 100}))
+
+
+def encode_car_ids(ids):
+    """'C_CND_000123' → 123 (int32); outros formatos continuam como categoria"""
+    ids = pd.Series(ids, dtype=object)
+    if not ids.str.fullmatch(rf'{re.escape(CAR_ID_PREFIX)}\d+').fillna(False).all():
+        return ids.astype('category')
+    return _downcast(ids.str.slice(len(CAR_ID_PREFIX)).astype('int64'), 'int32', 'Car_id')
+
+
+def _downcast(values, dtype, column):
+    """Converte inteiros (ou floats sem casas decimais) para `dtype`
+
+    Se algum valor não couber em `dtype` (ex.: telefone com 10 dígitos ou
+    renda acima de 2^31), usa int64. Gera ValueError se houver valores
+    ausentes ou se nem int64 comportar os valores.
+    """
+    missing = int(pd.isna(values).sum())
+    if missing:
+        raise ValueError(f"Coluna '{column}' tem {missing} valor(es) ausente(s)")
+    for target in (dtype, 'int64'):
+        info = np.iinfo(target)
+        if not len(values) or (values.min() >= info.min and values.max() <= info.max):
+            return values if values.dtype == target else values.astype(target)
+    raise ValueError(f"Coluna '{column}' não cabe em int64 "
+                     f"(valores entre {values.min()} e {values.max()})")
+
+
+def _categorical(values):
+    """Categoria sem ordem, com as categorias em ordem alfabética (a mesma do groupby)"""
+    if not isinstance(values.dtype, pd.CategoricalDtype):
+        return values.astype('category')
+    categories = values.cat.categories
+    if values.cat.ordered or not categories.is_monotonic_increasing:
+        return values.cat.set_categories(sorted(categories), ordered=False)
+    return values
+
+
+def apply_schema(df, schema=RAW_SCHEMA):
+    """Converte as colunas de `df` presentes em `schema` para os tipos compactos
+
+    Colunas já no tipo certo não são copiadas (categorias fora da ordem
+    alfabética, como as faixas de renda do pd.cut, são reordenadas); datas (datetime64) viram
+    AAAAMMDD e Car_id em texto vira inteiro. Colunas inteiras do schema com
+    valores fracionários (ex.: preços com centavos) ficam em float64 em vez
+    de truncadas; inteiros que não cabem no tipo ficam em int64. Valores
+    ausentes geram ValueError.
+    """
+    columns = {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+        if dtype == 'category':
+            categorical = _categorical(values)
+            if categorical is not values:
+                columns[column] = categorical
+        elif str(values.dtype) == dtype:
+            continue
+        elif column == 'Date' and not pd.api.types.is_integer_dtype(values):
+            columns[column] = encode_dates(pd.to_datetime(values))
+        elif column == 'Car_id' and not pd.api.types.is_integer_dtype(values):
+            columns[column] = encode_car_ids(values)
+        elif dtype.startswith('int'):
+            if values.dtype.kind == 'f' and values.notna().all() and not (values % 1 == 0).all():
+                if values.dtype != 'float64':
+                    columns[column] = values.astype('float64')
+                continue
+            downcast = _downcast(values, dtype, column)
+            if downcast is not values:
+                columns[column] = downcast
+        else:
+            columns[column] = values.astype(dtype)
+    return df.assign(**columns) if columns else df
+
+
+def compact_aggregate(frame):
+    """Tipos compactos de um DataFrame agregado
+
+    Contagens (AGGREGATE_INT32) vão para int32 quando cabem, somas em
+    dinheiro (AGGREGATE_INT64) ficam em int64 e os percentuais
+    (AGGREGATE_FLOAT32) vão para float32. Chaves categóricas voltam a texto: os
+    agregados têm no máximo algumas centenas de linhas e os gráficos (px)
+    seguiriam a ordem das categorias em vez da ordem das linhas.
+    """
+    columns = {}
+    for column in frame.columns:
+        values = frame[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            columns[column] = values.astype(object)
+        elif column in AGGREGATE_INT32 and values.dtype == 'int64':
+            info = np.iinfo('int32')
+            if not len(values) or (values.min() >= info.min and values.max() <= info.max):
+                columns[column] = values.astype('int32')
+        elif column in AGGREGATE_INT64 and values.dtype.kind == 'i' and values.dtype != 'int64':
+            columns[column] = values.astype('int64')
+        elif column in AGGREGATE_FLOAT32 and values.dtype == 'float64':
+            columns[column] = values.astype('float32')
+    return frame.assign(**columns) if columns else frame
+
+
+def memory_mb(df):
+    """Memória do DataFrame (inclusive os textos das colunas object), em MB"""
+    return df.memory_usage(deep=True).sum() / 2**20
+
+
+def main(argv=None):
+    try:
+        from generate_dataframes import CSV_FILE, add_derived_columns, load_sales
+    except ImportError:
+        from dataframes.generate_dataframes import CSV_FILE, add_derived_columns, load_sales
+
+    parser = argparse.ArgumentParser(description="Memória de df_original no schema original e no compacto")
+    parser.add_argument('--input', default=str(CSV_FILE), help="CSV de vendas")
+    args = parser.parse_args(argv)
+
+    compact = add_derived_columns(load_sales(args.input))
+    # Tipos anteriores ao schema: texto como object, inteiros de 64 bits e
+    # ano/mês/trimestre como int32 (acessores .dt)
+    original = compact.astype({column: object if dtype == 'category' else 'int64'
+                               for column, dtype in RAW_SCHEMA.items()
+                               if dtype in ('category', str(compact[column].dtype))
+                               and column not in ('Car_id', 'Date')})
+    original = original.astype({'Year': 'int32', 'Month': 'int32', 'Quarter': 'int32'})
+    original = original.assign(Car_id=CAR_ID_PREFIX + compact['Car_id'].astype(str).str.zfill(6),
+                               Date=decode_dates(compact['Date']),
+                               Esforco_Financeiro=compact['Esforco_Financeiro'].astype('float64'))
+
+    print("="*80)
+    print(f"MEMÓRIA DE df_original ({len(compact):,} linhas, {Path(args.input).name})")
+    print("="*80)
+    print(f"{'Coluna':<22} {'Original (MB)':>14} {'Compacto (MB)':>14} {'Tipo':>10}")
+    before = original.memory_usage(deep=True, index=False)
+    after = compact.memory_usage(deep=True, index=False)
+    for column in compact.columns:
+        print(f"{column:<22} {before[column] / 2**20:>14.2f} {after[column] / 2**20:>14.2f} "
+              f"{str(compact[column].dtype):>10}")
+    print(f"{'Total':<22} {before.sum() / 2**20:>14.2f} {after.sum() / 2**20:>14.2f} "
+          f"{before.sum() / after.sum():>9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
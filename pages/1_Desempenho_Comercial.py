@@ -8,18 +8,41 @@ Descrição: Script Python para utilizar o streamlit
 ============================================================================
 """
 
-import pickle
 import streamlit as st
 import pandas as pd
 import altair as alt
 import plotly.express as px
 
-# Carregar os DataFrames
-with open('dataframes/dataframes.pkl', 'rb') as f:
-    dfs = pickle.load(f)
+from utils.data_access import (
+    empty_selection_notice, load_cube, load_filtered_frames, load_timeseries, sidebar_filters
+)
+from utils.formatting import compacto, inteiro, moeda
+from utils.profiling import page_profiler
+from utils.timeseries import RESOLUTIONS, month_bounds
+
+# Perfil de renderização (opcional: DASHBOARD_PROFILE=1 ou ?profile=1)
+perfil = page_profiler('1_Desempenho_Comercial')
+
+# Cubo de vendas (montado uma vez por processo) e filtros da barra lateral;
+# cada combinação de filtros é reagregada e formatada (exibicao) uma única vez
+cube = load_cube()
+filtros = sidebar_filters(cube)
+dfs, exibicao = load_filtered_frames(
+    filtros,
+    'df_total',
+    'df_receita_total',
+    'df_modelos_vendidos',
+    'df_vendas_mes',
+    'df_top_marcas',
+    'df_share_marca',
+    'df_share_receita',
+    'df_receita_marca'
+)
+perfil.mark("Cubo, filtros e DataFrames", 'dados')
 
 # Titulo da página
 st.title("🚗 1.1 Vendas e Desempenho Comercial")
+empty_selection_notice(cube, filtros)
 
 # Usar as métricas principais em colunas como card
 col1, col2, col3 = st.columns(3)
@@ -29,57 +52,35 @@ col1, col2, col3 = st.columns(3)
 
 # Total de Vendas (valor direto)
 
-col1.metric(
-    "📋 Total de Vendas",
-    f"{int(dfs['df_total']['Valor'][0]):,}".replace(",", ".")
-)
-
-# Receita Total
+col1.metric("📋 Total de Vendas", inteiro(dfs['df_total']['Valor'][0]))
 
-# Função para formatar números grandes
-def formatar_numero(valor):
-    if valor >= 1_000_000_000:
-        return f"{valor/1_000_000_000:.1f} bi"
-    elif valor >= 1_000_000:
-        return f"{valor/1_000_000:.1f} mi"
-    elif valor >= 1_000:
-        return f"{valor/1_000:.1f} mil"
-    else:
-        return str(valor)
+# Receita Total (número compacto: mil / mi / bi)
 
 df_receita = dfs['df_receita_total']  # acessa o DataFrame
 
 valor = df_receita.loc[df_receita['Métrica'] == 'Receita Total', 'Valor'].values[0]
 
-valor_formatado = formatar_numero(valor)
-
-col2.metric("📋 Receita Total", valor_formatado)
+col2.metric("📋 Receita Total", compacto(valor))
 
 # Ticket Médio
 
 col3.metric(
     "📋 Ticket Médio",
-    f"${(df_receita.loc[df_receita['Métrica'] == 'Ticket Médio', 'Valor'].values[0]):,.2f}"
-    .replace(",", "X").replace(".", ",").replace("X", ".")
+    moeda(df_receita.loc[df_receita['Métrica'] == 'Ticket Médio', 'Valor'].values[0], simbolo='$')
 )
+perfil.mark("Métricas")
 
 # Modelos e marcas mais vendidos
 st.subheader(" 📈 Modelos e marcas mais vendidos")
 
-# Ordenar pelo maior valor
-dfs['df_modelos_vendidos'] = dfs['df_modelos_vendidos'].sort_values(by="Receita Total", ascending=False)
-
-# Função para formatar moeda
-def formatar_moeda(valor):
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-df = dfs['df_modelos_vendidos'].copy()
-
-# Formatar colunas desejadas
-df['Receita Total'] = df['Receita Total'].apply(formatar_moeda)
-df['Preço Médio'] = df['Preço Médio'].apply(formatar_moeda)
+# Ordenar pelo maior valor (sem alterar o DataFrame compartilhado);
+# Receita Total e Preço Médio já vêm formatados em R$ em exibicao
+ordem = dfs['df_modelos_vendidos'].sort_values(by="Receita Total", ascending=False).index
+df = exibicao['df_modelos_vendidos'].loc[ordem]
+perfil.mark("Modelos mais vendidos", 'transformação')
 
 st.dataframe(df.head(10))
+perfil.mark("Modelos mais vendidos")
 
 # ================================
 # Tabela - Share por quantidade vendida
@@ -87,32 +88,8 @@ st.dataframe(df.head(10))
 
 st.subheader(" 📈 Share por quantidade vendida")
 
-df_modelos = dfs['df_modelos_vendidos'] 
-
-# Agrupa por marca e soma a quantidade
-df_share_marca = (
-    df_modelos.groupby('Marca', as_index=False)['Quantidade']
-    .sum()
-)
-
-# Calcula o percentual de participação (numérico)
-df_share_marca['Share_num'] = (
-    df_share_marca['Quantidade'] / df_share_marca['Quantidade'].sum() * 100
-)
-
-# Ordena pelo maior percentual
-df_share_marca = df_share_marca.sort_values(by='Share_num', ascending=False)
-
-# Formata para exibir com 2 casas decimais e símbolo de porcentagem
-df_share_marca['Share (%)'] = df_share_marca['Share_num'].apply(
-    lambda x: f"{x:.2f}%"
-)
-
-# Remove a coluna numérica se não quiser exibir
-df_share_marca = df_share_marca[['Marca', 'Quantidade', 'Share (%)']]
-
-# Exibe no Streamlit
-st.dataframe(df_share_marca)
+# Share por marca já calculado e ordenado na geração (aggregations.py)
+st.dataframe(exibicao['df_share_marca'])
 
 # ================================
 # Tabela - Share por receita total
@@ -120,38 +97,8 @@ st.dataframe(df_share_marca)
 
 st.subheader("📈 Share por receita total")
 
-# Agrupa por marca e soma a receita
-df_share_receita = (
-    df_modelos.groupby('Marca', as_index=False)['Receita Total']
-    .sum()
-)
-
-# Cálculo numérico do percentual
-df_share_receita['Share_num'] = (
-    df_share_receita['Receita Total'] / df_share_receita['Receita Total'].sum() * 100
-)
-
-# Ordenar pelo percentual numérico
-df_share_receita = df_share_receita.sort_values(by='Share_num', ascending=False)
-
-# ---- FORMATAÇÕES ----
-
-# Formatar moeda (R$)
-def formatar_moeda(valor):
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-df_share_receita['Receita Total'] = df_share_receita['Receita Total'].apply(formatar_moeda)
-
-# Formatar percentual
-df_share_receita['Share Receita (%)'] = df_share_receita['Share_num'].apply(
-    lambda x: f"{x:.2f}%"
-)
-
-# Tabela final (sem a coluna numérica auxiliar)
-df_share_receita = df_share_receita[['Marca', 'Receita Total', 'Share Receita (%)']]
-
-# Exibir
-st.dataframe(df_share_receita)
+st.dataframe(exibicao['df_share_receita'])
+perfil.mark("Share por marca")
 
 # ================================
 #  Gráfico de Barras - Receita por Marca
@@ -159,27 +106,12 @@ st.dataframe(df_share_receita)
 
 st.subheader("📊 Receita Total por Marca")
 
-# Agrupar os dados por marca — SEM formatação
-df_receita = (
-    df_modelos.groupby('Marca', as_index=False)['Receita Total']
-    .sum()
-)
-
-# Criar coluna numérica para o gráfico (garante que é float)
-df_receita['Receita_num'] = df_receita['Receita Total'].astype(float)
-
-# Criar coluna formatada apenas para exibição em tabela (não usada no gráfico)
-def formatar_moeda(valor):
-    return f"R$ {valor:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
-
-df_receita['Receita Total'] = df_receita['Receita_num'].apply(formatar_moeda)
-
-# ---- GRÁFICO (usa Receita_num) ----
+# ---- GRÁFICO (valores numéricos; rótulos já formatados em R$) ----
 fig = px.bar(
-    df_receita,
+    dfs['df_receita_marca'],
     x='Marca',
-    y='Receita_num',
-    text=df_receita['Receita_num'].apply(lambda x: f"R$ {x:,.0f}".replace(",", "X").replace(".", ",").replace("X", ".")),
+    y='Receita Total',
+    text=exibicao['df_receita_marca']['Receita Total'],
 )
 
 fig.update_traces(textposition='outside')
@@ -188,8 +120,10 @@ fig.update_layout(
     xaxis_title="Marca",
     showlegend=False
 )
+perfil.mark("Receita por marca", 'figura')
 
 st.plotly_chart(fig, use_container_width=True)
+perfil.mark("Receita por marca")
 
 # ================================
 #   Gráfico de Linhas - Taxa de Crescimento
@@ -211,8 +145,43 @@ fig.update_layout(
     yaxis_title="Receita",
     hovermode="x unified"
 )
+perfil.mark("Taxa de crescimento", 'figura')
 
 st.plotly_chart(fig, use_container_width=True)
+perfil.mark("Taxa de crescimento")
+
+# ================================
+#   Gráfico de Linhas - Evolução das Vendas (df_evolucao)
+# ================================
+
+st.markdown("#### 📊 Evolução das Vendas")
+
+# A série segue todos os filtros da barra lateral e é reduzida no servidor:
+# dia, semana ou mês conforme o período, com no máximo
+# timeseries.MAX_POINTS pontos no gráfico
+resolucao = st.radio(
+    "Resolução",
+    ["Automática", *RESOLUTIONS],
+    horizontal=True,
+    key="resolucao_evolucao"
+)
+inicio, fim = month_bounds(filtros['YearMonth'])
+df_evolucao, resolucao_usada = load_timeseries(filtros).series(
+    inicio, fim, resolution=None if resolucao == "Automática" else resolucao
+)
+perfil.mark("Evolução das vendas", 'transformação')
+
+fig = px.line(df_evolucao, x='Data', y='Receita')
+fig.update_layout(
+    xaxis_title="Data",
+    yaxis_title="Receita",
+    hovermode="x unified"
+)
+perfil.mark("Evolução das vendas", 'figura')
+
+st.plotly_chart(fig, use_container_width=True)
+st.caption(f"Resolução: {resolucao_usada} · {inteiro(len(df_evolucao))} pontos")
+perfil.mark("Evolução das vendas")
 
 # ================================
 #   Gráfico de Pizza - Participação por Marca
@@ -256,5 +225,9 @@ fig.update_layout(
     template="plotly_white",
     margin=dict(t=60, b=20, l=20, r=20),
 )
+perfil.mark("Participação por marca", 'figura')
+
+st.plotly_chart(fig, use_container_width=True)
+perfil.mark("Participação por marca")
 
-st.plotly_chart(fig, use_container_width=True)
\ No newline at end of file
+perfil.finish()
\ No newline at end of file
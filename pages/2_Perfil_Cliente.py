@@ -8,16 +8,30 @@ Descrição: Script Python para utilizar o streamlit
 ============================================================================
 """
 
-import pickle
 import streamlit as st
 import altair as alt
 import plotly.express as px
 
-# Carregar os DataFrames
-with open('dataframes/dataframes.pkl', 'rb') as f:
-    dfs = pickle.load(f)
+from utils.data_access import empty_selection_notice, load_cube, load_filtered_frames, sidebar_filters
+from utils.profiling import page_profiler
+
+# Perfil de renderização (opcional: DASHBOARD_PROFILE=1 ou ?profile=1)
+perfil = page_profiler('2_Perfil_Cliente')
+
+# Cubo de vendas (montado uma vez por processo) e filtros da barra lateral;
+# cada combinação de filtros é reagregada uma única vez
+cube = load_cube()
+filtros = sidebar_filters(cube)
+dfs, _ = load_filtered_frames(
+    filtros,
+    'df_agrupar_faixa_renda',
+    'df_genero',
+    'df_preferencias'
+)
+perfil.mark("Cubo, filtros e DataFrames", 'dados')
 
 st.title("👤 1.2 Perfil Cliente")
+empty_selection_notice(cube, filtros)
 
 # ================================
 # GRÁFICO 1 — Distribuição por faixa de renda
@@ -38,7 +52,9 @@ chart = (
         width="container"
     )
 )
+perfil.mark("Faixa de renda", 'figura')
 st.altair_chart(chart, use_container_width=True)
+perfil.mark("Faixa de renda")
 
 # ================================
 # GRÁFICO 2 — Percentual de vendas por gênero
@@ -59,8 +75,10 @@ fig = px.pie(
 fig.update_traces(
     textinfo="label+percent"  # nome + porcentagem
 )
+perfil.mark("Vendas por gênero", 'figura')
 
 st.plotly_chart(fig, use_container_width=True)
+perfil.mark("Vendas por gênero")
 
 ###################################################
 
@@ -129,6 +147,8 @@ chart_scatter_renda = (
     )
 )
 
+perfil.mark("Preferências", 'figura')
+
 # =============================
 # LAYOUT EM 2 COLUNAS
 # =============================
@@ -138,4 +158,7 @@ col1.write("Preferências por Gênero")
 col1.altair_chart(chart_scatter_genero, use_container_width=True)
 
 col2.write("Preferências por Faixa de Renda")
-col2.altair_chart(chart_scatter_renda, use_container_width=True)
\ No newline at end of file
+col2.altair_chart(chart_scatter_renda, use_container_width=True)
+perfil.mark("Preferências")
+
+perfil.finish()
\ No newline at end of file
@@ -8,16 +8,30 @@ Descrição: Script Python para utilizar o streamlit
 ============================================================================
 """
 
-import pickle
 import streamlit as st
 import plotly.express as px
 import altair as alt
 
-# Carregar os DataFrames
-with open('dataframes/dataframes.pkl', 'rb') as f:
-    dfs = pickle.load(f)
+from utils.data_access import empty_selection_notice, load_cube, load_filtered_frames, sidebar_filters
+from utils.profiling import page_profiler
+
+# Perfil de renderização (opcional: DASHBOARD_PROFILE=1 ou ?profile=1)
+perfil = page_profiler('3_Analise_Regional')
+
+# Cubo de vendas (montado uma vez por processo) e filtros da barra lateral;
+# cada combinação de filtros é reagregada e formatada (exibicao) uma única vez
+cube = load_cube()
+filtros = sidebar_filters(cube)
+dfs, exibicao = load_filtered_frames(
+    filtros,
+    'df_receita_regiao',
+    'df_ranking',
+    'df_comparacao_regioes'
+)
+perfil.mark("Cubo, filtros e DataFrames", 'dados')
 
 st.title("🗺️ 1.3 Análise Regional")
+empty_selection_notice(cube, filtros)
 
 # ================================
 # GRÁFICO 1 — Barra horizontal receita por região
@@ -34,18 +48,16 @@ chart_regiao = (
         tooltip=["Região", "Receita Total", "Quantidade", "Percentual (%)"]
     )
 )
+perfil.mark("Receita por região", 'figura')
 
 st.altair_chart(chart_regiao, use_container_width=True)
+perfil.mark("Receita por região")
 
 # ================================
 # GRÁFICO 2 — Barra horizontal ticket médio por região e tabela de top 5
 # ================================
 st.subheader("📈 Ticket Médio por Concessionária")
-df_receita_regiao = dfs["df_receita_regiao"]  # <-- nome certo
-
-df_receita_regiao["Ticket Médio"] = (
-    df_receita_regiao["Receita Total"] / df_receita_regiao["Quantidade"]
-).round(2)
+df_receita_regiao = dfs["df_receita_regiao"]  # Ticket Médio já vem calculado
 
 chart_ticket = (
     alt.Chart(df_receita_regiao)
@@ -62,6 +74,7 @@ chart_ticket = (
         ],
     )
 )
+perfil.mark("Ticket médio por região", 'figura')
 
 col1, col2 = st.columns([2, 1])
 
@@ -76,6 +89,7 @@ with col2:
         .sort_values("Ticket Médio", ascending=False)
         .head(5)
     )
+perfil.mark("Ticket médio por região")
 
 # ================================
 # GRÁFICO 3 - Ranking de concessionárias
@@ -104,13 +118,14 @@ heatmap_ranking = (
     height=300,
     width="container"
 )
+perfil.mark("Ranking de concessionárias", 'figura')
 
 st.markdown("##### 🏆 Ranking de Concessionárias")
 
 # tabela mantida
 
 st.dataframe(
-    dfs["df_ranking"][[
+    exibicao["df_ranking"][[
         "Ranking",
         "Concessionária",
         "Região",
@@ -121,6 +136,7 @@ st.dataframe(
 
 st.markdown("##### 🔥 Mapa de Calor — Receita por Concessionária")
 st.altair_chart(heatmap_ranking, use_container_width=True)
+perfil.mark("Ranking de concessionárias")
 
 
 st.subheader("📊 Comparação entre Regiões")
@@ -137,7 +153,9 @@ fig_bar = px.bar(
     text_auto=".2s",
     template="plotly_white",
 )
+perfil.mark("Receita por concessionária", 'figura')
 st.plotly_chart(fig_bar, use_container_width=True)
+perfil.mark("Receita por concessionária")
 
 
 # ================================
@@ -150,6 +168,7 @@ df_melt = dfs["df_comparacao_regioes"].melt(
     var_name="Métrica",
     value_name="Valor"
 )
+perfil.mark("Comparação de indicadores", 'transformação')
 
 fig_grouped = px.bar(
     df_melt,
@@ -160,4 +179,8 @@ fig_grouped = px.bar(
     template="plotly_white",
     text_auto=".2s"
 )
-st.plotly_chart(fig_grouped, use_container_width=True)
\ No newline at end of file
+perfil.mark("Comparação de indicadores", 'figura')
+st.plotly_chart(fig_grouped, use_container_width=True)
+perfil.mark("Comparação de indicadores")
+
+perfil.finish()
\ No newline at end of file
@@ -0,0 +1,17 @@
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Configuração dos Testes (pytest)
+Descrição: Coloca a raiz do projeto, database/, dataframes/ e benchmarks/
+           no caminho de importação, como fazem os scripts ao serem executados
+============================================================================
+"""
+
+import sys
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+for path in (ROOT_DIR, ROOT_DIR / 'database', ROOT_DIR / 'dataframes', ROOT_DIR / 'benchmarks'):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
@@ -0,0 +1,72 @@
+"""Cubo OLAP (utils/cube.py) sobre uma base sintética, sem Streamlit"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from dataframes.aggregations import AGGREGATES, FRAME_ORDER, build_aggregates
+from dataframes.generate_dataframes import add_derived_columns, load_sales
+from dataframes.schema import decode_dates
+from synthetic_sales import write_sales_csv
+from utils.cube import DIMENSIONS, SPECIAL_FRAMES, Cube
+
+# DataFrames que o cubo consegue gerar (chaves entre as dimensões do cubo)
+CUBE_FRAMES = [name for name in FRAME_ORDER if name in SPECIAL_FRAMES or (
+    name in AGGREGATES and set(AGGREGATES[name]['keys']) <= set(DIMENSIONS))]
+
+
+@pytest.fixture(scope='module')
+def sales(tmp_path_factory):
+    path = tmp_path_factory.mktemp('cube') / 'car_sales.csv'
+    write_sales_csv(path, 3000, seed=11)
+    return add_derived_columns(load_sales(path))
+
+
+@pytest.fixture(scope='module')
+def cube(sales):
+    return Cube.from_frame(sales)
+
+
+def _assert_frames_equal(actual, expected):
+    assert list(actual) == list(expected)
+    for name in expected:
+        pd.testing.assert_frame_equal(actual[name].reset_index(drop=True),
+                                      expected[name].reset_index(drop=True),
+                                      check_dtype=False, obj=name)
+
+
+def test_frames_match_build_aggregates(sales, cube):
+    assert {'df_total', 'df_receita_total', 'df_ranking', 'df_preferencias'} <= set(CUBE_FRAMES)
+    _assert_frames_equal(cube.frames(CUBE_FRAMES), build_aggregates(sales, CUBE_FRAMES))
+
+
+def test_filtered_frames_match_build_aggregates_on_the_filtered_rows(sales, cube):
+    months = [month for month in cube.values('YearMonth') if '2022-03' <= month <= '2022-09']
+    filters = {'YearMonth': months, 'Dealer_Region': cube.values('Dealer_Region')[:3], 'Gender': ['Male']}
+    selected = sales[sales['YearMonth'].isin(months) & sales['Dealer_Region'].isin(filters['Dealer_Region'])
+                     & (sales['Gender'] == 'Male')]
+    _assert_frames_equal(cube.frames(CUBE_FRAMES, filters), build_aggregates(selected, CUBE_FRAMES))
+
+
+def test_unknown_frames_are_rejected(cube):
+    with pytest.raises(KeyError, match='df_correlacao'):
+        cube.frames(['df_total', 'df_correlacao'])
+
+
+def test_daily_without_filters_matches_df_evolucao(sales, cube):
+    expected = build_aggregates(sales, ['df_evolucao'])['df_evolucao']
+    pd.testing.assert_frame_equal(cube.daily(), expected, check_dtype=False)
+
+
+def test_daily_follows_filters(sales, cube):
+    filters = {'Company': ['Ford', 'Toyota'], 'Gender': ['Female']}
+    selected = sales[sales['Company'].isin(filters['Company']) & sales['Gender'].isin(filters['Gender'])]
+    expected = (selected.assign(Data=decode_dates(selected['Date']).to_numpy())
+                .groupby('Data').agg(Quantidade=('Car_id', 'count'), Receita=('Price ($)', 'sum'))
+                .reset_index())
+    pd.testing.assert_frame_equal(cube.daily(cube.mask(filters)), expected, check_dtype=False)
+
+
+def test_daily_of_empty_selection_is_empty(cube):
+    mask = np.zeros(cube.cells, dtype=bool)
+    assert cube.daily(mask).empty
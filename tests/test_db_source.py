@@ -0,0 +1,117 @@
+"""Paridade das agregações no banco (db_source.py) com as do pandas, sem servidor MySQL
+
+O star schema é montado em um SQLite em memória a partir de uma base
+sintética, e db_source.read_frame é redirecionado para ele. Diferenças de
+dialeto tratadas aqui: DATE_FORMAT (função registrada no SQLite) e a colação
+binária (utf8mb4_bin → BINARY).
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import db_source
+from aggregations import FRAME_ORDER, build_aggregates
+from generate_dataframes import add_derived_columns, load_sales
+from schema import decode_dates
+from synthetic_sales import write_sales_csv
+
+# Dimensão → (colunas da base, nomes no banco, chave substituta)
+DIMENSIONS = {
+    'dim_customer': (['Gender', 'Faixa_Renda', 'Annual Income'],
+                     ['gender', 'income_bracket', 'annual_income'], 'customer_key'),
+    'dim_dealer': (['Dealer_Name', 'Dealer_Region'], ['dealer_name', 'dealer_region'], 'dealer_key'),
+    'dim_vehicle': (['Company', 'Model', 'Body Style', 'Transmission', 'Color'],
+                    ['company', 'model', 'body_style', 'transmission', 'color'], 'vehicle_key')
+}
+
+
+def _star_schema(df):
+    """fact_sales + dimensões de `df` em um SQLite em memória"""
+    connection = sqlite3.connect(':memory:')
+    connection.create_function('DATE_FORMAT', 2, lambda value, _: value[:7])
+    base = df.astype({column: object for column in df.select_dtypes('category')})
+
+    dates = decode_dates(base['Date'])
+    fact = pd.DataFrame({'car_id': base['Car_id'], 'date_key': dates.dt.strftime('%Y-%m-%d'),
+                         'price': base['Price ($)'], 'annual_income': base['Annual Income']})
+    for table, (columns, names, key) in DIMENSIONS.items():
+        codes = base.groupby(columns, sort=False).ngroup() + 1
+        dimension = base[columns].set_axis(names, axis=1).assign(**{key: codes}).drop_duplicates(key)
+        dimension.to_sql(table, connection, index=False)
+        fact[key] = codes
+    fact.to_sql('fact_sales', connection, index=False)
+
+    time = pd.DataFrame({'date_key': fact['date_key'].unique()})
+    parsed = pd.to_datetime(time['date_key'])
+    time.assign(year=parsed.dt.year, quarter=parsed.dt.quarter).to_sql('dim_time', connection, index=False)
+    return connection
+
+
+@pytest.fixture(scope='module')
+def sales_csv(tmp_path_factory):
+    path = tmp_path_factory.mktemp('db_source') / 'car_sales.csv'
+    write_sales_csv(path, 3000, seed=7)
+    return path
+
+
+@pytest.fixture
+def sqlite_source(sales_csv, monkeypatch):
+    """db_source.read_frame lendo do SQLite; devolve as consultas executadas"""
+    connection = _star_schema(add_derived_columns(load_sales(sales_csv)))
+    queries = []
+
+    def read_frame(query, params=None):
+        queries.append(query)
+        return pd.read_sql(query.replace(f'COLLATE {db_source.TEXT_COLLATION}', 'COLLATE BINARY'),
+                           connection, params=params)
+
+    monkeypatch.setattr(db_source, 'read_frame', read_frame)
+    yield queries
+    connection.close()
+
+
+def test_grouping_query_joins_only_needed_dimensions():
+    sql = db_source.grouping_query(('Dealer_Region', 'Year'), ('quantidade', 'receita'))
+    assert 'JOIN dim_dealer d' in sql and 'JOIN dim_time t' in sql
+    assert 'dim_customer' not in sql and 'dim_vehicle' not in sql
+    assert sql.rstrip().endswith('GROUP BY 1, 2')
+
+
+def test_text_keys_use_binary_collation():
+    sql = db_source.grouping_query(('Company',), ('concessionarias',))
+    assert f'v.company COLLATE {db_source.TEXT_COLLATION} AS `Company`' in sql
+    assert f'COUNT(DISTINCT d.dealer_name COLLATE {db_source.TEXT_COLLATION})' in sql
+    assert 'COLLATE' not in db_source.grouping_query(('Year',), ('quantidade',))
+
+
+def test_every_key_and_measure_has_sql():
+    specs = db_source.select_specs()[1]
+    keys, measures = set(), set()
+    for grouped_keys, grouped_measures in db_source.grouping_sets(specs).items():
+        keys.update(grouped_keys)
+        measures.update(grouped_measures)
+    assert keys <= set(db_source.KEY_SQL)
+    assert measures <= set(db_source.MEASURE_SQL)
+
+
+def test_parity_with_pandas(sales_csv, sqlite_source):
+    assert db_source.compare_sources(sales_csv) == {}
+    assert any('CROSS JOIN' in query for query in sqlite_source)  # correlação calculada no banco
+
+
+def test_db_frames_match_build_aggregates(sales_csv, sqlite_source):
+    expected = build_aggregates(add_derived_columns(load_sales(sales_csv)))
+    actual = db_source.build_aggregates_from_db()
+    assert list(actual) == list(expected) and set(FRAME_ORDER) <= set(actual)
+    db_source.compare_frame(expected['df_correlacao'], actual['df_correlacao'], rtol=1e-9)
+
+
+def test_compare_frame_is_exact_for_integers():
+    expected = pd.DataFrame({'Marca': ['A', 'B'], 'Receita': [10**9, 5], 'Média': [1.0, 2.0]})
+    db_source.compare_frame(expected, expected.assign(Receita=[10.0**9, 5.0], Média=[1.0000001, 2.0]))
+    with pytest.raises(AssertionError):
+        db_source.compare_frame(expected, expected.assign(Receita=[10**9 + 1, 5]))
+    with pytest.raises(AssertionError):
+        db_source.compare_frame(expected, expected.assign(Marca=['A', 'b']))
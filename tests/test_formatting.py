@@ -0,0 +1,36 @@
+"""Formatação no padrão brasileiro (utils/formatting.py)"""
+
+import numpy as np
+import pandas as pd
+
+from utils.formatting import VAZIO, compacto, inteiro, moeda, percentual
+
+
+def test_brazilian_separators():
+    assert moeda(1234.5) == 'R$ 1.234,50'
+    assert inteiro(1234567) == '1.234.567'
+    assert percentual(12.345) == '12,35%'
+    assert compacto(25_600_000) == '25,6 mi'
+
+
+def test_missing_values_render_as_empty_marker():
+    # Ticket médio de uma seleção sem vendas (receita / 0 → NaN)
+    assert moeda(np.nan, simbolo='$') == VAZIO
+    assert percentual(np.nan) == VAZIO
+    assert compacto(np.nan) == VAZIO
+    assert moeda(pd.Series([10.0, np.nan])).tolist() == ['R$ 10,00', VAZIO]
+
+
+def test_vectorized_matches_format():
+    # Coluna formatada de uma vez == format() elemento a elemento,
+    # inclusive nos empates de arredondamento (12.345, 2.675, 999.995)
+    rng = np.random.default_rng(0)
+    valores = np.concatenate([
+        rng.normal(0, 1e7, 2000),
+        np.round(rng.uniform(-100, 100, 2000), 3),
+        [0.0, -0.0, -0.001, 12.345, 2.675, 999.995, 0.5, 1.5, 2.5, 1e12]
+    ])
+    serie = pd.Series(valores)
+    esperado = serie.map(lambda v: f'R$ {v:,.2f}'.translate(str.maketrans(',.', '.,')))
+    assert moeda(serie).tolist() == esperado.tolist()
+    assert percentual(serie, casas=1).tolist() == serie.map(lambda v: f'{v:.1f}%'.replace('.', ',')).tolist()
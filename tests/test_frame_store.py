@@ -0,0 +1,56 @@
+"""Store colunar (dataframes/frame_store.py): gravação, manifest e leitura"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from frame_store import MANIFEST_FILE, read_frame, read_manifest, write_store
+
+
+@pytest.fixture
+def frames():
+    raw = pd.DataFrame({
+        'Car_id': ['C_CND_000001', 'C_CND_000002', 'C_CND_000003'],
+        'Date': pd.to_datetime(['2022-01-02', '2022-01-02', '2023-12-31']),
+        'Company': ['Ford', 'Acura', 'Ford'],
+        'Price ($)': [20500.0, 14900.0, 31000.0]
+    })
+    aggregate = pd.DataFrame({'Marca': ['Acura', 'Ford'], 'Receita Total': np.array([14900, 51500], dtype='int64'),
+                              'Share (%)': np.array([22.4, 77.6], dtype='float32')})
+    return {'df_original': raw, 'df_receita_marca': aggregate}
+
+
+def test_round_trip(tmp_path, frames):
+    manifest = write_store(frames, tmp_path)
+    assert read_manifest(tmp_path) == manifest
+    assert manifest['df_original']['path'] == 'raw/df_original.feather'
+    assert manifest['df_original']['kind'] == 'raw' and manifest['df_receita_marca']['kind'] == 'aggregate'
+    assert manifest['df_receita_marca']['rows'] == 2
+    assert manifest['df_receita_marca']['columns'] == ['Marca', 'Receita Total', 'Share (%)']
+    assert manifest['df_original']['dtypes'] == {
+        'Car_id': 'int32', 'Date': 'int32', 'Company': 'category', 'Price ($)': 'int32'}
+
+    pd.testing.assert_frame_equal(read_frame(tmp_path, 'df_receita_marca'), frames['df_receita_marca'])
+    raw = read_frame(tmp_path, 'df_original', manifest)
+    assert raw.dtypes.astype(str).to_dict() == manifest['df_original']['dtypes']
+    assert raw['Car_id'].tolist() == [1, 2, 3] and raw['Date'].tolist() == [20220102, 20220102, 20231231]
+    assert raw['Company'].tolist() == ['Ford', 'Acura', 'Ford']
+
+
+def test_partial_write_keeps_other_frames_and_removes_stale_files(tmp_path, frames):
+    write_store(frames, tmp_path)
+    updated = frames['df_receita_marca'].assign(**{'Receita Total': np.array([1, 2], dtype='int64')})
+    manifest = write_store({'df_receita_marca': updated}, tmp_path, replace=False)
+    assert set(manifest) == {'df_original', 'df_receita_marca'}
+    assert read_frame(tmp_path, 'df_receita_marca')['Receita Total'].tolist() == [1, 2]
+
+    manifest = write_store({'df_receita_marca': updated}, tmp_path)
+    assert set(manifest) == {'df_receita_marca'}
+    assert not (tmp_path / 'raw' / 'df_original.feather').exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['df_receita_marca.feather', MANIFEST_FILE, 'raw']
+
+
+def test_unknown_frame_raises(tmp_path, frames):
+    write_store(frames, tmp_path)
+    with pytest.raises(KeyError, match='df_inexistente'):
+        read_frame(tmp_path, 'df_inexistente')
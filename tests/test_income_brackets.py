@@ -0,0 +1,38 @@
+"""Faixas de renda (dataframes/income_brackets.py) no pandas e no SQL"""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from income_brackets import LABELS, income_bracket, sql_case
+
+
+BOUNDARIES = [0, 49999, 50000, 99999.99, 100000, 499999, 500000, 999999, 1000000, 11200000]
+
+
+def test_lower_limit_is_inclusive_and_upper_exclusive():
+    brackets = income_bracket(pd.Series(BOUNDARIES))
+    assert brackets.tolist() == [
+        LABELS[0], LABELS[0], LABELS[1], LABELS[1], LABELS[2],
+        LABELS[2], LABELS[3], LABELS[3], LABELS[4], LABELS[4]
+    ]
+
+
+def test_brackets_are_ordered_categories():
+    brackets = income_bracket(pd.Series([1000000, 10000]))
+    assert brackets.cat.ordered and list(brackets.cat.categories) == LABELS
+    assert brackets.min() == LABELS[0]
+
+
+def test_missing_income_has_no_bracket():
+    assert income_bracket(pd.Series([np.nan, 60000]))[0] is np.nan
+
+
+def test_sql_case_matches_pandas():
+    connection = sqlite3.connect(':memory:')
+    connection.execute("CREATE TABLE customers (id INTEGER, annual_income REAL)")
+    connection.executemany("INSERT INTO customers VALUES (?, ?)", enumerate(BOUNDARIES))
+    rows = connection.execute(f"SELECT {sql_case()} FROM customers ORDER BY id").fetchall()
+    connection.close()
+    assert [label for label, in rows] == income_bracket(pd.Series(BOUNDARIES)).tolist()
@@ -0,0 +1,53 @@
+"""Spans de dataframes/instrumentation.py: picos de RSS e do tracemalloc"""
+
+import time
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import instrumentation
+from instrumentation import span
+
+
+@pytest.fixture
+def records():
+    was_tracing = tracemalloc.is_tracing()
+    instrumentation.configure(trace_memory=True, keep_records=True)
+    yield instrumentation.RECORDS
+    instrumentation.RECORDS.clear()
+    instrumentation.configure()
+    if not was_tracing:
+        tracemalloc.stop()
+
+
+def _allocate(mb, hold_s=0.0):
+    """Aloca e toca `mb` MB, segura por `hold_s` segundos e libera"""
+    block = np.ones(mb * 2**20 // 8)
+    time.sleep(hold_s)
+    del block
+
+
+def test_rss_peak_is_recorded_even_when_memory_is_freed(records):
+    with span('pico'):
+        _allocate(200, hold_s=0.1)
+    record = records[-1]
+    assert record['rss_peak_delta_mb'] >= 150
+    assert record['rss_delta_mb'] < 50
+    assert record['rss_peak_mb'] >= record['rss_mb']
+
+
+def test_nested_spans_keep_their_own_and_the_outer_peak(records):
+    with span('externo'):
+        _allocate(64)
+        with span('interno'):
+            _allocate(16)
+        with span('interno'):
+            pass
+    inner, empty, outer = records[-3:]
+    assert (inner['name'], empty['name'], outer['name']) == ('interno', 'interno', 'externo')
+    assert inner['parent'] == 'externo' and inner['depth'] == 1
+    assert 16 <= inner['py_peak_mb'] < 64
+    assert empty['py_peak_mb'] < 16
+    assert outer['py_peak_mb'] >= 64
+    assert not any(key.startswith('_') for record in records for key in record)
@@ -0,0 +1,46 @@
+"""Testes do TSV gravado para o LOAD DATA (load_data.write_tsv)"""
+
+import csv
+import io
+
+import pandas as pd
+
+from load_data import CAR_SALES_COLUMNS, TSV_NULL, write_tsv
+
+
+def _sale(**values):
+    """Uma venda já transformada (colunas de car_sales), com `values` sobrescritos"""
+    row = {column: 'x' for column in CAR_SALES_COLUMNS}
+    row.update(sale_date=pd.Timestamp('2022-01-02'), annual_income=13500.0, price=26000.0, phone=8264678)
+    row.update(values)
+    return row
+
+
+def _fields(df):
+    handle = io.StringIO()
+    write_tsv(df, handle)
+    return handle.getvalue().split('\n')[0].split('\t')
+
+
+def test_text_null_is_not_sql_null():
+    df = pd.DataFrame([_sale(customer_name='NULL', dealer_no=None)])
+    fields = dict(zip(CAR_SALES_COLUMNS, _fields(df)))
+    assert fields['customer_name'] == 'NULL'
+    assert fields['dealer_no'] == TSV_NULL == '\\N'
+
+
+def test_special_characters_are_escaped():
+    df = pd.DataFrame([_sale(customer_name='a\\b\tc\nd', model='say "hi"')])
+    fields = dict(zip(CAR_SALES_COLUMNS, _fields(df)))
+    assert len(fields) == len(CAR_SALES_COLUMNS)
+    assert fields['customer_name'] == 'a\\\\b\\tc\\nd'
+    assert fields['model'] == 'say "hi"'
+
+
+def test_categorical_columns_are_escaped():
+    df = pd.DataFrame([_sale(company='A\\B'), _sale(company='A\\B')]).astype({'company': 'category'})
+    handle = io.StringIO()
+    write_tsv(df, handle)
+    rows = list(csv.reader(io.StringIO(handle.getvalue()), delimiter='\t', quoting=csv.QUOTE_NONE))
+    position = CAR_SALES_COLUMNS.index('company')
+    assert [row[position] for row in rows] == ['A\\\\B', 'A\\\\B']
@@ -0,0 +1,56 @@
+"""Schema compacto (dataframes/schema.py): tipos, conversões e erros"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from schema import CAR_ID_PREFIX, apply_schema, compact_aggregate, decode_dates, encode_dates
+
+
+def test_numeric_columns_are_downcast():
+    df = apply_schema(pd.DataFrame({'Annual Income': [13500.0, 1_120_000.0], 'Price ($)': [20500.0, 14900.0],
+                                    'Phone': [9094435.0, 7051318.0], 'Year': [2022, 2023]}))
+    assert df.dtypes.astype(str).to_dict() == {
+        'Annual Income': 'int32', 'Price ($)': 'int32', 'Phone': 'int32', 'Year': 'int16'}
+
+
+def test_values_that_do_not_fit_fall_back_to_int64():
+    df = apply_schema(pd.DataFrame({'Phone': [9094435.0, 5_551_234_567.0],
+                                    'Annual Income': [3e9, 1e5], 'Price ($)': [2.5e9, 14900.0]}))
+    assert (df.dtypes == 'int64').all()
+    assert df['Phone'].tolist() == [9094435, 5_551_234_567]
+    assert apply_schema(df) is df  # já convertido: nada é copiado
+
+
+def test_cents_keep_float_and_missing_values_raise():
+    df = apply_schema(pd.DataFrame({'Price ($)': [20500.5, 14900.0]}))
+    assert df['Price ($)'].dtype == 'float64'
+    with pytest.raises(ValueError, match='ausente'):
+        apply_schema(pd.DataFrame({'Annual Income': [np.nan, 1e5]}))
+
+
+def test_dates_car_ids_and_categories():
+    df = apply_schema(pd.DataFrame({
+        'Date': pd.to_datetime(['2022-01-02', '2023-12-31']),
+        'Car_id': [f'{CAR_ID_PREFIX}000123', f'{CAR_ID_PREFIX}023906'],
+        'Company': ['Ford', 'Acura']
+    }))
+    assert df['Date'].tolist() == [20220102, 20231231]
+    assert df['Car_id'].dtype == 'int32' and df['Car_id'].tolist() == [123, 23906]
+    assert list(df['Company'].cat.categories) == ['Acura', 'Ford']
+    assert (decode_dates(df['Date']) == pd.to_datetime(['2022-01-02', '2023-12-31'])).all()
+    assert encode_dates(decode_dates(df['Date'])).tolist() == df['Date'].tolist()
+
+
+def test_other_car_id_formats_stay_categorical():
+    df = apply_schema(pd.DataFrame({'Car_id': ['X-1', 'X-2']}))
+    assert isinstance(df['Car_id'].dtype, pd.CategoricalDtype)
+
+
+def test_compact_aggregate():
+    frame = compact_aggregate(pd.DataFrame({
+        'Marca': pd.Categorical(['B', 'A']), 'Quantidade': np.array([3, 4], dtype='int64'),
+        'Receita': np.array([10, 20], dtype='int32'), 'Share (%)': [60.0, 40.0]
+    }))
+    assert frame.dtypes.astype(str).to_dict() == {
+        'Marca': 'object', 'Quantidade': 'int32', 'Receita': 'int64', 'Share (%)': 'float32'}
@@ -0,0 +1,67 @@
+"""Divisão de scripts SQL em comandos (database/sql_script.py)"""
+
+import pytest
+
+from sql_script import is_read_only, split_statements
+
+
+def test_split_respects_comments_quotes_and_labels():
+    script = (
+        "-- Criar tabela\n"
+        "CREATE TABLE t (a TEXT); -- fim da linha não rotula o próximo\n"
+        "INSERT INTO t VALUES ('a;b', \"c;d\", 'it''s');\n"
+        "/* bloco; ignorado */\n"
+        "# Consulta\n"
+        "SELECT `col;umn` FROM t\n"
+    )
+    statements = split_statements(script)
+    assert [s.sql for s in statements] == [
+        "CREATE TABLE t (a TEXT)",
+        "INSERT INTO t VALUES ('a;b', \"c;d\", 'it''s')",
+        "SELECT `col;umn` FROM t"
+    ]
+    assert [s.label for s in statements] == ['Criar tabela', None, 'Consulta']
+    assert [s.line for s in statements] == [2, 3, 6]
+
+
+def test_split_follows_delimiter_directive():
+    script = (
+        "DELIMITER //\n"
+        "CREATE PROCEDURE p()\nBEGIN\n  SELECT 1;\n  SELECT 2;\nEND //\n"
+        "DELIMITER ;\n"
+        "CALL p();\n"
+    )
+    statements = split_statements(script)
+    assert len(statements) == 2
+    assert statements[0].sql.startswith('CREATE PROCEDURE') and statements[0].sql.endswith('END')
+    assert statements[1].sql == 'CALL p()'
+
+
+def test_executable_comments_are_kept():
+    assert split_statements("/*!40101 SET NAMES utf8mb4 */;")[0].sql == "/*!40101 SET NAMES utf8mb4 */"
+
+
+@pytest.mark.parametrize('sql', [
+    "SELECT * FROM fact_sales",
+    "  -- comentário\n  select 1",
+    "WITH x AS (SELECT 1) SELECT * FROM x",
+    "SHOW TABLES",
+    "EXPLAIN SELECT 1",
+    "SELECT 'INSERT INTO t' AS texto, `update` FROM t",
+])
+def test_read_only(sql):
+    assert is_read_only(sql)
+
+
+@pytest.mark.parametrize('sql', [
+    "",
+    "INSERT INTO t VALUES (1)",
+    "WITH x AS (SELECT 1) DELETE FROM t",
+    "SELECT * INTO OUTFILE '/tmp/x' FROM t",
+    "SELECT a INTO @v FROM t",
+    "SELECT * FROM t FOR UPDATE",
+    "SELECT * FROM t LOCK IN SHARE MODE",
+    "EXPLAIN ANALYZE UPDATE t SET a = 1",
+])
+def test_not_read_only(sql):
+    assert not is_read_only(sql)
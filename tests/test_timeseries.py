@@ -0,0 +1,62 @@
+"""Série temporal com resolução adaptativa (utils/timeseries.py)"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.timeseries import MAX_POINTS, TimeSeries, lttb, month_bounds
+
+
+@pytest.fixture(scope='module')
+def daily():
+    rng = np.random.default_rng(3)
+    dates = pd.date_range('2022-01-01', '2023-12-31', freq='D')
+    return pd.DataFrame({'Data': dates, 'Quantidade': rng.integers(1, 50, len(dates)),
+                         'Receita': rng.integers(10_000, 900_000, len(dates))})
+
+
+def test_lttb_keeps_endpoints_and_extremes():
+    x = np.arange(1000)
+    y = np.sin(x / 40.0)
+    y[137], y[612] = 5.0, -5.0
+    keep = lttb(x, y, 50)
+    assert len(keep) == 50 and keep[0] == 0 and keep[-1] == 999
+    assert (np.diff(keep) > 0).all()
+    assert {137, 612} <= set(keep)
+
+
+def test_lttb_returns_everything_below_threshold():
+    assert lttb(np.arange(10), np.arange(10), 20).tolist() == list(range(10))
+
+
+def test_automatic_resolution_is_the_finest_that_fits(daily):
+    series = TimeSeries.from_frame(daily)
+    assert series.series(*month_bounds(['2022-03']))[1] == 'Dia'
+    assert series.series(*month_bounds(['2022-01', '2022-12']))[1] == 'Semana'
+    frame, resolution = series.series()
+    assert resolution == 'Semana' and len(frame) <= MAX_POINTS
+
+
+def test_periods_sum_to_the_daily_totals(daily):
+    series = TimeSeries.from_frame(daily)
+    start, end = month_bounds(['2022-02', '2022-05'])
+    selected = daily[(daily['Data'] >= pd.Timestamp(start)) & (daily['Data'] < pd.Timestamp(end))]
+    for resolution in ('Dia', 'Semana', 'Mês'):
+        frame, _ = series.series(start, end, resolution=resolution)
+        assert frame['Receita'].sum() == selected['Receita'].sum()
+        assert frame['Quantidade'].sum() == selected['Quantidade'].sum()
+        assert frame['Data'].iloc[0] == pd.Timestamp(start)  # período cortado: primeiro dia selecionado
+    months, _ = series.series(start, end, resolution='Mês')
+    assert months['Receita'].tolist() == selected.groupby(selected['Data'].dt.to_period('M'))['Receita'].sum().tolist()
+
+
+def test_forced_daily_resolution_is_reduced_with_lttb(daily):
+    frame, resolution = TimeSeries.from_frame(daily).series(resolution='Dia')
+    assert resolution == 'Dia (LTTB)' and len(frame) == MAX_POINTS
+    assert frame['Data'].iloc[0] == daily['Data'].iloc[0] and frame['Data'].iloc[-1] == daily['Data'].iloc[-1]
+
+
+def test_month_bounds():
+    assert month_bounds([]) == (None, None)
+    start, end = month_bounds(['2023-12', '2022-02'])
+    assert (str(start), str(end)) == ('2022-02-01', '2024-01-01')
@@ -0,0 +1,237 @@
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Cubo OLAP em Memória
+Descrição: Células pré-agregadas por mês, região, concessionária, marca,
+           modelo, carroceria, gênero e faixa de renda, com as dimensões
+           codificadas em dicionário (inteiros + categorias); filtros
+           (slice/dice) e reagregações usam apenas numpy sobre os códigos.
+           As vendas de cada célula também ficam separadas por dia, para a
+           série temporal (df_evolucao) respeitar os mesmos filtros
+============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+from dataframes.aggregations import (
+    AGGREGATES, assemble_aggregates, grouping_sets, receita_total_frame, select_specs, total_frame
+)
+from dataframes.schema import decode_dates
+
+# Dimensões do cubo (colunas da base gerada por generate_dataframes.py)
+DIMENSIONS = [
+    'YearMonth', 'Dealer_Region', 'Dealer_Name', 'Company',
+    'Model', 'Body Style', 'Gender', 'Faixa_Renda'
+]
+
+# Medidas aditivas de cada célula: nome → (coluna de origem, agregação)
+CELL_MEASURES = {
+    'quantidade': ('Car_id', 'count'),
+    'receita': ('Price ($)', 'sum'),
+    'soma_renda': ('Annual Income', 'sum'),
+    'soma_esforco': ('Esforco_Financeiro', 'sum')
+}
+
+# Coluna de data da base (AAAAMMDD ou datetime) e medidas diárias das
+# células: coluna de df_evolucao → medida de CELL_MEASURES
+DATE_COLUMN = 'Date'
+DAILY_MEASURES = {'Quantidade': 'quantidade', 'Receita': 'receita'}
+
+# Medidas de aggregations.MEASURES derivadas das somas das células
+DERIVED_MEASURES = {
+    'quantidade': lambda sums: sums['quantidade'],
+    'receita': lambda sums: sums['receita'],
+    'preco_medio': lambda sums: sums['receita'] / sums['quantidade'],
+    'renda_media': lambda sums: sums['soma_renda'] / sums['quantidade'],
+    'esforco_medio': lambda sums: sums['soma_esforco'] / sums['quantidade']
+}
+
+# DataFrames que não vêm de um groupby e podem ser obtidos das somas totais
+SPECIAL_FRAMES = {
+    'df_total': lambda totals: total_frame(int(totals['quantidade'])),
+    'df_receita_total': lambda totals: receita_total_frame(
+        totals['receita'],
+        totals['receita'] / totals['quantidade'] if totals['quantidade'] else np.nan
+    )
+}
+
+
+def _encode(values):
+    """Codificação em dicionário: códigos inteiros compactos + categorias ordenadas"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Colunas categóricas (schema.py) já trazem os códigos: só descarta os membros sem vendas
+        values = values.cat.remove_unused_categories()
+        codes, categories = values.cat.codes.to_numpy(), values.cat.categories
+    else:
+        codes, categories = pd.factorize(values, sort=True)
+    dtype = np.int8 if len(categories) < 2**7 else np.int16 if len(categories) < 2**15 else np.int32
+    return codes.astype(dtype), pd.Index(categories)
+
+
+def _days(dates):
+    """Dias distintos da base (datetime64[D], ordenados) e a posição do dia de cada linha
+
+    Só os valores distintos são convertidos (AAAAMMDD ou datetime → datetime64[D]).
+    """
+    positions, distinct = pd.factorize(np.asarray(dates), sort=True)
+    if np.issubdtype(distinct.dtype, np.integer):
+        distinct = decode_dates(distinct)
+    return pd.DatetimeIndex(distinct).to_numpy().astype('datetime64[D]'), positions
+
+
+def _daily_cells(cell_ids, dates, measures):
+    """Vendas por (célula, dia) presentes na base
+
+    `measures` traz, por medida de DAILY_MEASURES, os valores de cada linha
+    (None = contagem de linhas). Retorna os dias (ordenados) e, por par
+    célula × dia com vendas, a posição da célula, a posição do dia e as somas.
+    """
+    # Uma chave inteira por par célula × dia (sem colunas temporárias extras)
+    days, day_codes = _days(dates)
+    key = cell_ids.astype(np.int64)
+    key *= len(days)
+    key += day_codes
+    del day_codes
+    unique, inverse = np.unique(key, return_inverse=True)
+    del key
+    daily = {'cell': (unique // len(days)).astype(np.int32),
+             'day': (unique % len(days)).astype(np.int32)}
+    for name, values in measures.items():
+        if values is None:
+            daily[name] = np.bincount(inverse, minlength=len(unique)).astype(np.int32)
+        else:
+            daily[name] = np.bincount(inverse, weights=values, minlength=len(unique))
+    return days, daily
+
+
+class Cube:
+    """Cubo de vendas: códigos das dimensões e medidas por célula (arrays numpy)
+
+    Com `days`/`daily` (ver _daily_cells), o cubo também entrega as vendas por
+    dia das células selecionadas. Os arrays são somente leitura: o cubo é
+    compartilhado entre sessões do Streamlit.
+    """
+
+    def __init__(self, codes, categories, measures, days=None, daily=None):
+        for array in (*codes.values(), *measures.values(), *(daily or {}).values()):
+            array.setflags(write=False)
+        self.codes = codes
+        self.categories = categories
+        self.measures = measures
+        self.cells = len(next(iter(measures.values())))
+        self.days = days
+        self.daily_cells = daily
+
+    @classmethod
+    def from_frame(cls, df, dimensions=DIMENSIONS, measures=CELL_MEASURES, date_column=DATE_COLUMN):
+        """Agrupa a base nas células do cubo (um único groupby) e codifica as dimensões
+
+        Se a base tiver `date_column`, guarda também as vendas de cada célula por dia.
+        """
+        groups = df.groupby(dimensions, sort=False, observed=True)
+        cells = groups.agg(**measures).reset_index()
+        codes, categories = {}, {}
+        for dim in dimensions:
+            codes[dim], categories[dim] = _encode(cells[dim])
+        sums = {name: cells[name].to_numpy(dtype='float64') for name in measures}
+        del cells
+
+        days = daily = None
+        if date_column in df:
+            daily_measures = {}
+            for name in DAILY_MEASURES.values():
+                column, how = measures[name]
+                daily_measures[name] = None if how == 'count' else df[column].to_numpy(dtype='float64')
+            days, daily = _daily_cells(groups.ngroup().to_numpy(), df[date_column], daily_measures)
+        return cls(codes, categories, sums, days, daily)
+
+    def values(self, dim):
+        """Membros de uma dimensão (em ordem)"""
+        return list(self.categories[dim])
+
+    def mask(self, filters=None):
+        """Células selecionadas pelos filtros {dimensão: membros} (vazio = todos)"""
+        selected = np.ones(self.cells, dtype=bool)
+        for dim, members in (filters or {}).items():
+            if not members:
+                continue
+            allowed = np.zeros(len(self.categories[dim]), dtype=bool)
+            positions = self.categories[dim].get_indexer(list(members))
+            allowed[positions[positions >= 0]] = True
+            selected &= allowed[self.codes[dim]]  # tabela de consulta por código
+        return selected
+
+    def totals(self, mask=None):
+        """Somas das medidas nas células selecionadas"""
+        return {name: float(values[mask].sum() if mask is not None else values.sum())
+                for name, values in self.measures.items()}
+
+    def aggregate(self, by, mask=None):
+        """Soma as medidas agrupando pelas dimensões `by` (ordenadas como no groupby)"""
+        sizes = [len(self.categories[dim]) for dim in by]
+        codes = [self.codes[dim] if mask is None else self.codes[dim][mask] for dim in by]
+        measures = {name: values if mask is None else values[mask]
+                    for name, values in self.measures.items()}
+
+        # Uma chave inteira por combinação de membros; a ordem das chaves
+        # segue a ordem das categorias, ou seja, a mesma do groupby(sort=True)
+        key = np.ravel_multi_index(codes, sizes) if by else np.zeros(len(measures['quantidade']), dtype=np.int64)
+        unique, inverse = np.unique(key, return_inverse=True)
+
+        columns = {
+            dim: self.categories[dim].take(positions)
+            for dim, positions in zip(by, np.unravel_index(unique, sizes) if by else [])
+        }
+        for name, values in measures.items():
+            columns[name] = np.bincount(inverse, weights=values, minlength=len(unique))
+        columns['quantidade'] = columns['quantidade'].astype('int64')
+        return pd.DataFrame(columns)
+
+    def _grouped(self, keys, measures, mask):
+        """Agrupamento no formato de aggregations.group_measures (chaves + medidas)"""
+        sums = self.aggregate(list(keys), mask)
+        columns = {key: sums[key] for key in keys}
+        for measure in measures:
+            if measure == 'concessionarias':
+                # Não aditiva: conta as concessionárias distintas com vendas no grupo
+                dealers = self.aggregate(list(keys) + ['Dealer_Name'], mask)
+                columns[measure] = dealers.groupby(list(keys), sort=True).size().to_numpy()
+            else:
+                columns[measure] = DERIVED_MEASURES[measure](sums)
+        return pd.DataFrame(columns)
+
+    def daily(self, mask=None):
+        """Vendas por dia nas células selecionadas (colunas de df_evolucao)
+
+        Só entram os dias com vendas, como no groupby da base.
+        """
+        if self.daily_cells is None:
+            raise KeyError("O cubo foi montado sem a coluna de data: vendas por dia indisponíveis")
+        day = self.daily_cells['day']
+        selected = None if mask is None else np.asarray(mask)[self.daily_cells['cell']]
+        columns = {}
+        for column, name in DAILY_MEASURES.items():
+            values = self.daily_cells[name] if selected is None else self.daily_cells[name] * selected
+            columns[column] = np.bincount(day, weights=values, minlength=len(self.days))
+        with_sales = columns['Quantidade'] > 0
+        frame = pd.DataFrame({'Data': pd.to_datetime(self.days[with_sales])})
+        for column, values in columns.items():
+            frame[column] = values[with_sales]
+        frame['Quantidade'] = frame['Quantidade'].astype('int64')
+        return frame
+
+    def frames(self, names, filters=None):
+        """Gera os DataFrames do dashboard (mesmas colunas de aggregations.py) para os filtros"""
+        unsupported = [name for name in names if name not in SPECIAL_FRAMES and not (
+            name in AGGREGATES and set(AGGREGATES[name]['keys']) <= set(self.codes))]
+        if unsupported:
+            raise KeyError(f"DataFrames não disponíveis no cubo: {', '.join(unsupported)}")
+
+        names, specs = select_specs(names)
+        mask = None if not filters else self.mask(filters)
+        totals = self.totals(mask)
+        special = {name: SPECIAL_FRAMES[name](totals) for name in names if name in SPECIAL_FRAMES}
+        grouped = {keys: self._grouped(keys, measures, mask)
+                   for keys, measures in grouping_sets(specs).items()}
+        return assemble_aggregates(names, specs, grouped, special, int(totals['quantidade']))
@@ -0,0 +1,223 @@
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Acesso aos DataFrames do Dashboard
+Descrição: Lê os DataFrames gerados por generate_dataframes.py (um arquivo
+           por DataFrame em dataframes/store/) e monta o cubo OLAP uma única
+           vez por processo, compartilhados entre reruns e sessões; os
+           filtros da barra lateral são aplicados sobre o cubo e cada
+           combinação de filtros é agregada e formatada uma única vez;
+           as páginas recebem visões rasas dos DataFrames em cache, com
+           arrays somente leitura, sem cópias por sessão
+============================================================================
+"""
+
+import os
+from collections.abc import Mapping
+from pathlib import Path
+
+import pandas as pd
+import streamlit as st
+
+from dataframes.frame_store import MANIFEST_FILE, read_frame, read_manifest
+from utils.cube import Cube
+from utils.formatting import DISPLAY_COLUMNS, display_frame, inteiro
+from utils.timeseries import TimeSeries
+
+# Diretório gerado por dataframes/generate_dataframes.py
+STORE_DIR = Path(__file__).resolve().parent.parent / 'dataframes' / 'store'
+
+
+def _copy_on_write():
+    """Ativa o copy-on-write do pandas apenas dentro do bloco `with`
+
+    DataFrames derivados de outro (visões, colunas selecionadas, assign,
+    sort_values...) compartilham os dados até serem modificados. A opção é
+    global no pandas, por isso fica restrita ao código deste módulo e não
+    muda o comportamento de quem apenas importa utils.data_access.
+    """
+    return pd.option_context('mode.copy_on_write', True)
+
+
+def _read_only(frame):
+    """Mesmo DataFrame, com os arrays de cada coluna marcados como somente leitura
+
+    As páginas recebem visões rasas que compartilham esses arrays: uma escrita
+    in-place (df.loc[...] = ...) gera ValueError em vez de alterar o
+    DataFrame das outras sessões. Criar colunas ou ordenar continua valendo.
+    """
+    columns = {}
+    for column, values in frame.items():
+        array = values.to_numpy().view()
+        array.flags.writeable = False
+        columns[column] = array
+    return pd.DataFrame(columns, index=frame.index, copy=False)
+
+
+class FrameRegistry(Mapping):
+    """Dicionário somente leitura de DataFrames compartilhados entre sessões
+
+    Cada acesso devolve uma visão rasa (copy(deep=False)) do DataFrame em
+    cache: a página pode criar colunas ou ordenar a visão sem afetar as
+    outras sessões. Os arrays em cache são somente leitura; para alterar
+    valores, a página trabalha sobre uma cópia (dfs['x'].copy()).
+    Atribuir um DataFrame ao registro (dfs['x'] = ...) gera TypeError.
+    """
+
+    def __init__(self, frames):
+        self._frames = dict(frames)
+
+    def __getitem__(self, name):
+        with _copy_on_write():
+            return self._frames[name].copy(deep=False)
+
+    def __iter__(self):
+        return iter(self._frames)
+
+    def __len__(self):
+        return len(self._frames)
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_manifest(mtime):
+    """Lê o manifest; `mtime` invalida o cache quando os DataFrames são regerados"""
+    return read_manifest(STORE_DIR)
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _load_frame(name, mtime):
+    """Lê um único DataFrame do disco (mapeado em memória)"""
+    return _read_only(read_frame(STORE_DIR, name, _load_manifest(mtime)))
+
+
+def load_frames(*names):
+    """Retorna um FrameRegistry apenas com os DataFrames pedidos pela página
+
+    Cada DataFrame é lido na primeira vez em que alguma página o pede; a base
+    bruta (df_original) só é carregada se for solicitada explicitamente.
+    """
+    mtime = os.path.getmtime(STORE_DIR / MANIFEST_FILE)
+    return FrameRegistry({name: _load_frame(name, mtime) for name in names})
+
+
+@st.cache_resource(max_entries=1, show_spinner="Montando o cubo de vendas...")
+def _load_cube(mtime):
+    """Monta o cubo a partir da base bruta; a base não fica em cache, só as células"""
+    return Cube.from_frame(read_frame(STORE_DIR, 'df_original', _load_manifest(mtime)))
+
+
+def load_cube():
+    """Cubo de vendas compartilhado (reconstruído quando os DataFrames são regerados)"""
+    return _load_cube(os.path.getmtime(STORE_DIR / MANIFEST_FILE))
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_timeseries(mtime):
+    """Série diária montada a partir de df_evolucao (somas acumuladas)"""
+    return TimeSeries.from_frame(_load_frame('df_evolucao', mtime))
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _filtered_timeseries(mtime, filters):
+    """Série diária das células do cubo selecionadas pelos filtros"""
+    cube = _load_cube(mtime)
+    return TimeSeries.from_frame(cube.daily(cube.mask({dim: list(members) for dim, members in filters})))
+
+
+def load_timeseries(filters=None):
+    """Série temporal compartilhada (ver timeseries.TimeSeries.series)
+
+    Sem filtros além do período, usa df_evolucao; com região, marca etc., a
+    série vem das vendas diárias do cubo, montada uma vez por combinação.
+    O período não entra na chave: é aplicado depois, em series(início, fim).
+    """
+    mtime = os.path.getmtime(STORE_DIR / MANIFEST_FILE)
+    key = tuple(sorted((dim, tuple(members)) for dim, members in (filters or {}).items()
+                       if members and dim != 'YearMonth'))
+    if not key:
+        return _load_timeseries(mtime)
+    return _filtered_timeseries(mtime, key)
+
+
+# Filtros da barra lateral: dimensão do cubo → rótulo (multiselect, vazio = todos)
+SIDEBAR_FILTERS = {
+    'Dealer_Region': 'Região',
+    'Company': 'Marca',
+    'Body Style': 'Tipo de Carroceria',
+    'Gender': 'Gênero',
+    'Faixa_Renda': 'Faixa de Renda'
+}
+
+# Valores escolhidos, guardados fora das chaves dos widgets para que a
+# seleção continue valendo ao trocar de página
+_FILTERS_STATE = 'filtros_cubo'
+
+
+def sidebar_filters(cube):
+    """Desenha os filtros na barra lateral e retorna {dimensão: membros selecionados}"""
+    saved = st.session_state.setdefault(_FILTERS_STATE, {})
+    months = cube.values('YearMonth')
+
+    st.sidebar.header("Filtros")
+    period = saved.get('YearMonth')
+    start, end = st.sidebar.select_slider(
+        "Período",
+        options=months,
+        value=period if period and set(period) <= set(months) else (months[0], months[-1]),
+        key='filtro_YearMonth'
+    )
+    saved['YearMonth'] = (start, end)
+    full_period = (start, end) == (months[0], months[-1])
+    filters = {'YearMonth': [] if full_period else [m for m in months if start <= m <= end]}
+
+    for dim, label in SIDEBAR_FILTERS.items():
+        options = cube.values(dim)
+        filters[dim] = st.sidebar.multiselect(
+            label,
+            options=options,
+            default=[member for member in saved.get(dim, []) if member in options],
+            key=f'filtro_{dim}',
+            placeholder="Todos"
+        )
+        saved[dim] = filters[dim]
+
+    selected = cube.totals(cube.mask(filters))['quantidade']
+    st.sidebar.caption(f"{inteiro(selected)} vendas selecionadas")
+    return filters
+
+
+def empty_selection_notice(cube, filters):
+    """Avisa na página quando nenhuma venda atende aos filtros; retorna True nesse caso"""
+    if cube.totals(cube.mask(filters))['quantidade']:
+        return False
+    st.info("Nenhuma venda atende aos filtros selecionados. Ajuste os filtros na barra lateral.")
+    return True
+
+
+@st.cache_resource(max_entries=256, show_spinner=False)
+def _filtered_frames(mtime, names, filters):
+    """DataFrames numéricos e de exibição para uma combinação de filtros
+
+    cache_resource (e não cache_data): o resultado é guardado uma vez e
+    compartilhado, sem desserializar uma cópia a cada rerun de cada sessão.
+    """
+    with _copy_on_write():
+        frames = _load_cube(mtime).frames(list(names), {dim: list(members) for dim, members in filters})
+        display = {name: display_frame(frames[name], DISPLAY_COLUMNS[name])
+                   for name in names if name in DISPLAY_COLUMNS}
+    return ({name: _read_only(frame) for name, frame in frames.items()},
+            {name: _read_only(frame) for name, frame in display.items()})
+
+
+def load_filtered_frames(filters, *names):
+    """Retorna (DataFrames, DataFrames de exibição) da página para os filtros
+
+    Os DataFrames de exibição (ver formatting.DISPLAY_COLUMNS) têm moeda,
+    percentuais etc. já convertidos em texto: a formatação é feita uma vez
+    por combinação de filtros, não a cada rerun. Os dois são FrameRegistry:
+    a memória por sessão não cresce com o número de sessões.
+    """
+    mtime = os.path.getmtime(STORE_DIR / MANIFEST_FILE)
+    key = tuple(sorted((dim, tuple(members)) for dim, members in filters.items() if members))
+    frames, display = _filtered_frames(mtime, tuple(names), key)
+    return FrameRegistry(frames), FrameRegistry(display)
@@ -0,0 +1,136 @@
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Formatação de Valores no Padrão Brasileiro
+Descrição: Moeda, números compactos (mil/mi/bi), inteiros e percentuais
+           formatados de uma vez para a coluna inteira, e as colunas de
+           exibição de cada DataFrame do dashboard
+============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Texto exibido no lugar de valores ausentes (ex.: ticket médio sem vendas)
+VAZIO = '—'
+
+# Escalas dos números compactos: limite inferior → (divisor, sufixo)
+_ESCALAS = [
+    (1_000_000_000, 1_000_000_000, ' bi'),
+    (1_000_000, 1_000_000, ' mi'),
+    (1_000, 1_000, ' mil')
+]
+
+
+def _milhar(inteiros):
+    """Parte inteira com ponto a cada três dígitos (1234567 → '1.234.567')
+
+    Monta o texto grupo a grupo com pyarrow.compute, do grupo mais alto para
+    o mais baixo; os grupos depois do primeiro são completados com zeros.
+    """
+    texto = None
+    nivel = len(str(int(inteiros.max()))) // 3 if len(inteiros) else 0
+    for base in (1000 ** n for n in range(nivel, -1, -1)):
+        grupo = pc.cast(pa.array((inteiros // base) % 1000), pa.string())
+        if texto is None:
+            texto = grupo
+            continue
+        acima = pa.array(inteiros >= base * 1000)
+        texto = pc.if_else(acima,
+                           pc.binary_join_element_wise(texto, pc.utf8_lpad(grupo, 3, '0'), '.'),
+                           grupo)
+    return texto
+
+
+def _formatar(valores, casas, milhar=True):
+    """Formata no padrão brasileiro (1.234,56), escalar ou coluna
+
+    A coluna inteira é formatada de uma vez, sem format() por elemento: os
+    valores são arredondados para inteiros em unidades de 10^-casas e as
+    partes inteira e decimal viram texto com pyarrow.compute. O resultado é
+    idêntico ao de '{:,.2f}'.format (inclusive nos empates de arredondamento,
+    refeitos com format() para as poucas linhas em que a multiplicação por
+    10^casas não é exata). Valores ausentes (NaN) viram VAZIO.
+    """
+    if np.ndim(valores) == 0:
+        return _formatar(np.array([valores], dtype='float64'), casas, milhar).iloc[0]
+    index = valores.index if isinstance(valores, pd.Series) else None
+    numeros = np.asarray(valores, dtype='float64')
+    if numeros.size == 0:
+        return pd.Series(numeros, index=index, dtype=object)
+
+    ausentes = np.isnan(numeros)
+    absolutos = np.abs(np.where(ausentes, 0.0, numeros))
+    escala = 10 ** casas
+    escalados = absolutos * escala
+    unidades = np.rint(escalados).astype('int64')
+    empates = np.abs(escalados - np.floor(escalados) - 0.5) <= 4 * np.spacing(escalados)
+    for i in np.flatnonzero(empates):
+        unidades[i] = int(f'{absolutos[i]:.{casas}f}'.replace('.', ''))
+
+    inteiros = unidades // escala
+    texto = _milhar(inteiros) if milhar else pc.cast(pa.array(inteiros), pa.string())
+    if casas:
+        decimais = pc.utf8_lpad(pc.cast(pa.array(unidades % escala), pa.string()), casas, '0')
+        texto = pc.binary_join_element_wise(texto, decimais, ',')
+    texto = pc.if_else(pa.array(np.signbit(numeros)), pc.binary_join_element_wise('-', texto, ''), texto)
+    texto = pc.if_else(pa.array(ausentes), VAZIO, texto)
+    return pd.Series(texto.to_numpy(zero_copy_only=False), index=index, dtype=object)
+
+
+def _unidade(texto, prefixo='', sufixo=''):
+    """Acrescenta símbolo/sufixo ao texto formatado, exceto em VAZIO"""
+    if isinstance(texto, str):
+        return texto if texto == VAZIO else prefixo + texto + sufixo
+    return (prefixo + texto + sufixo).where(texto != VAZIO, VAZIO)
+
+
+def moeda(valores, casas=2, simbolo='R$'):
+    """R$ 1.234,56"""
+    return _unidade(_formatar(valores, casas), prefixo=f'{simbolo} ')
+
+
+def inteiro(valores):
+    """1.234"""
+    return _formatar(valores, 0)
+
+
+def percentual(valores, casas=2):
+    """12,34%"""
+    return _unidade(_formatar(valores, casas, milhar=False), sufixo='%')
+
+
+def compacto(valores, casas=1):
+    """25,6 mi / 1,2 bi / 3,4 mil (valores abaixo de mil sem sufixo)"""
+    numeros = np.atleast_1d(np.asarray(valores, dtype='float64'))
+    absolutos = np.abs(numeros)
+    condicoes = [absolutos >= limite for limite, _, _ in _ESCALAS]
+    divisor = np.select(condicoes, [d for _, d, _ in _ESCALAS], default=1)
+    sufixo = np.select(condicoes, [s for _, _, s in _ESCALAS], default='')
+
+    texto = np.where(divisor > 1,
+                     _formatar(numeros / divisor, casas, milhar=False).to_numpy(dtype=object) + sufixo,
+                     _formatar(numeros, 0).to_numpy(dtype=object))
+    if np.ndim(valores) == 0:
+        return str(texto[0])
+    return pd.Series(texto, index=getattr(valores, 'index', None))
+
+
+# Colunas de exibição: DataFrame → {coluna: formatador}; o DataFrame de
+# exibição tem as mesmas colunas, com os valores já convertidos em texto
+DISPLAY_COLUMNS = {
+    'df_modelos_vendidos': {'Receita Total': moeda, 'Preço Médio': moeda},
+    'df_share_marca': {'Share (%)': percentual},
+    'df_share_receita': {'Receita Total': moeda, 'Share Receita (%)': percentual},
+    'df_receita_marca': {'Receita Total': lambda valores: moeda(valores, casas=0)},
+    'df_ranking': {'Receita Total': moeda}
+}
+
+
+def display_frame(frame, formatters):
+    """Cópia do DataFrame com as colunas indicadas formatadas para exibição"""
+    return frame.assign(**{
+        column: formatter(frame[column]).to_numpy() for column, formatter in formatters.items()
+    })
@@ -0,0 +1,226 @@
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Perfil de Renderização das Páginas (opcional)
+Descrição: Cronometra cada seção de uma página (dados, transformações,
+           construção das figuras e envio ao navegador), mostra a divisão
+           do tempo na barra lateral e acumula p50/p95 por página, de todas
+           as sessões, em um arquivo local de métricas (JSON Lines, com
+           rotação por tamanho) e em uma janela recente em memória
+============================================================================
+
+Ativação: variável DASHBOARD_PROFILE=1 ou ?profile=1 na URL (vale para a
+sessão inteira). Desativado, cada marcação custa uma comparação.
+
+Resumo do arquivo de métricas:
+    python -m utils.profiling [--file metrics/dashboard_render.jsonl]
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PROFILE_ENV = 'DASHBOARD_PROFILE'
+METRICS_FILE_ENV = 'DASHBOARD_METRICS_FILE'
+METRICS_FILE = Path(__file__).resolve().parent.parent / 'metrics' / 'dashboard_render.jsonl'
+
+# Tipos de seção: o que é medido entre duas marcações
+KINDS = {
+    'dados': 'Leitura/cache dos DataFrames e filtros',
+    'transformação': 'Reordenação, melt e demais operações do pandas',
+    'figura': 'Construção da figura (px / alt.Chart)',
+    'envio': 'Serialização e envio do elemento ao navegador (st.*)'
+}
+
+# Renderizações mais recentes consideradas nos percentis
+MAX_RECORDS = 2000
+
+# Tamanho a partir do qual o arquivo de métricas é rotacionado (o anterior
+# vira <arquivo>.1, substituindo a rotação anterior)
+MAX_FILE_BYTES = 5 * 2**20
+
+_SESSION_STATE = 'perfil_renderizacao'
+_lock = threading.Lock()
+
+# Janela das últimas MAX_RECORDS execuções deste processo (carregada do
+# arquivo na primeira execução perfilada; depois, sem reler o arquivo)
+_recent = None
+
+
+def metrics_file():
+    return Path(os.environ.get(METRICS_FILE_ENV, METRICS_FILE))
+
+
+def profiling_enabled():
+    """Ativado pela variável de ambiente ou por ?profile=1 (lembrado na sessão)"""
+    state = st.session_state.setdefault(_SESSION_STATE, {'ativo': False, 'sessao': uuid.uuid4().hex[:12]})
+    if os.environ.get(PROFILE_ENV, '').lower() in ('1', 'true', 'sim'):
+        return True
+    if st.query_params.get('profile') is not None:
+        state['ativo'] = st.query_params.get('profile') not in ('0', 'false')
+    return state['ativo']
+
+
+class PageProfiler:
+    """Linha do tempo de uma execução da página
+
+    Cada mark(seção, tipo) atribui à seção o tempo decorrido desde a marcação
+    anterior (ou desde o início da página), sem reindentar o código da página.
+    """
+
+    def __init__(self, page, enabled=True):
+        self.page = page
+        self.enabled = enabled
+        self.sections = []
+        self.started = self.last = time.perf_counter()
+
+    def mark(self, section, kind='envio'):
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        self.sections.append({'section': section, 'kind': kind, 'ms': (now - self.last) * 1000})
+        self.last = now
+
+    def record(self):
+        """Registro desta execução (uma linha do arquivo de métricas)"""
+        state = st.session_state.get(_SESSION_STATE, {})
+        return {
+            'page': self.page,
+            'session': state.get('sessao'),
+            'at': datetime.now().isoformat(timespec='seconds'),
+            'total_ms': round((self.last - self.started) * 1000, 3),
+            'sections': [{**s, 'ms': round(s['ms'], 3)} for s in self.sections]
+        }
+
+    def finish(self):
+        """Grava a execução no arquivo de métricas e mostra a divisão na barra lateral"""
+        if not self.enabled:
+            return
+        record = self.record()
+        append_record(record)
+        history = [r for r in recent_records() if r['page'] == self.page]
+
+        with st.sidebar.expander(f"⏱️ Renderização: {record['total_ms']:.0f} ms", expanded=False):
+            breakdown = pd.DataFrame(record['sections']).rename(
+                columns={'section': 'Seção', 'kind': 'Tipo', 'ms': 'ms'})
+            breakdown['%'] = (breakdown['ms'] / record['total_ms'] * 100).round(1) if record['total_ms'] else 0.0
+            st.dataframe(breakdown.round({'ms': 1}), hide_index=True)
+
+            by_kind = breakdown.groupby('Tipo')['ms'].sum().round(1)
+            st.caption(" · ".join(f"{kind}: {by_kind[kind]} ms" for kind in KINDS if kind in by_kind.index),
+                       help="\n\n".join(f"**{kind}**: {text}" for kind, text in KINDS.items()))
+
+            summary = percentiles(history).get(self.page)
+            if summary:
+                st.markdown(f"**Todas as sessões** ({summary['renders']} execuções)")
+                st.dataframe(section_percentiles(history, self.page).round(1), hide_index=True)
+
+
+def page_profiler(page):
+    """Perfilador da página (inerte quando o modo de perfil está desligado)"""
+    return PageProfiler(page, enabled=profiling_enabled())
+
+
+def rotated_file(path):
+    """Arquivo anterior à última rotação (<arquivo>.1)"""
+    return path.with_name(path.name + '.1')
+
+
+def recent_records():
+    """Janela em memória das últimas MAX_RECORDS execuções (todas as sessões do processo)"""
+    global _recent
+    if _recent is None:
+        records = read_records()
+        with _lock:
+            if _recent is None:
+                _recent = deque(records, maxlen=MAX_RECORDS)
+    with _lock:
+        return list(_recent)
+
+
+def append_record(record, path=None):
+    """Acrescenta uma execução ao arquivo de métricas (e à janela em memória, se for o padrão)
+
+    Quando o arquivo passa de MAX_FILE_BYTES, ele é rotacionado antes da escrita.
+    """
+    path = Path(path or metrics_file())
+    with _lock:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if path.exists() and path.stat().st_size >= MAX_FILE_BYTES:
+            path.replace(rotated_file(path))
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+        if _recent is not None and path == metrics_file():
+            _recent.append(record)
+
+
+def read_records(path=None, limit=MAX_RECORDS):
+    """Últimas `limit` execuções registradas (no arquivo atual e no rotacionado)"""
+    path = Path(path or metrics_file())
+    lines = deque(maxlen=limit)
+    with _lock:
+        for source in (rotated_file(path), path):
+            if source.exists():
+                with open(source, encoding='utf-8') as f:
+                    lines.extend(f)
+    return [json.loads(line) for line in lines if line.strip()]
+
+
+def percentiles(records):
+    """p50/p95 do tempo total por página"""
+    totals = {}
+    for record in records:
+        totals.setdefault(record['page'], []).append(record['total_ms'])
+    return {
+        page: {'renders': len(values), 'p50_ms': float(np.percentile(values, 50)),
+               'p95_ms': float(np.percentile(values, 95))}
+        for page, values in totals.items()
+    }
+
+
+def section_percentiles(records, page):
+    """p50/p95 de cada seção da página (e do total)"""
+    rows = [{'Seção': s['section'], 'Tipo': s['kind'], 'ms': s['ms']}
+            for r in records if r['page'] == page for s in r['sections']]
+    rows += [{'Seção': 'Total', 'Tipo': '', 'ms': r['total_ms']} for r in records if r['page'] == page]
+    if not rows:
+        return pd.DataFrame(columns=['Seção', 'Tipo', 'p50 (ms)', 'p95 (ms)'])
+    grouped = pd.DataFrame(rows).groupby(['Seção', 'Tipo'], sort=False)['ms']
+    return pd.DataFrame({
+        'p50 (ms)': grouped.quantile(0.50),
+        'p95 (ms)': grouped.quantile(0.95)
+    }).reset_index()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Resumo p50/p95 das renderizações registradas")
+    parser.add_argument('--file', default=str(metrics_file()), help="Arquivo de métricas (JSON Lines)")
+    parser.add_argument('--limit', type=int, default=MAX_RECORDS, help="Execuções mais recentes consideradas")
+    args = parser.parse_args(argv)
+
+    records = read_records(args.file, args.limit)
+    if not records:
+        print(f"Nenhuma execução registrada em {args.file}")
+        return 0
+
+    for page, summary in percentiles(records).items():
+        print("\n" + "="*80)
+        print(f"{page}: {summary['renders']} execuções · "
+              f"p50 {summary['p50_ms']:.1f} ms · p95 {summary['p95_ms']:.1f} ms")
+        print("="*80)
+        print(section_percentiles(records, page).round(1).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
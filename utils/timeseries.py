@@ -0,0 +1,138 @@
+"""
+============================================================================
+PROJETO INTEGRADOR - APOIO DECISÓRIO AOS NEGÓCIOS
+Série Temporal de Vendas com Resolução Adaptativa
+Descrição: Guarda os totais diários (df_evolucao) como somas acumuladas e
+           entrega a série do período selecionado por dia, semana ou mês,
+           dentro de um limite fixo de pontos; se nem a mensal couber,
+           os pontos são reduzidos com LTTB (Largest-Triangle-Three-Buckets).
+           O número de pontos enviados ao navegador é sempre limitado
+============================================================================
+"""
+
+import numpy as np
+import pandas as pd
+
+# Resoluções, da mais fina para a mais grossa
+RESOLUTIONS = ('Dia', 'Semana', 'Mês')
+
+# Limite fixo de pontos por série: o servidor não conhece a largura real do
+# gráfico (use_container_width), então o orçamento é o de um gráfico de
+# ~800 px com 4 px por ponto, suficiente também para telas maiores
+MAX_POINTS = 200
+
+
+def _period_starts(dates):
+    """Data de início do período de cada dia, por resolução (semana começa na segunda)"""
+    days = dates.astype('int64')  # 1970-01-01 foi uma quinta-feira
+    return {
+        'Dia': dates,
+        'Semana': dates - ((days + 3) % 7).astype('timedelta64[D]'),
+        'Mês': dates.astype('datetime64[M]').astype('datetime64[D]')
+    }
+
+
+def lttb(x, y, threshold):
+    """Índices dos pontos mantidos pelo Largest-Triangle-Three-Buckets
+
+    Mantém o primeiro e o último ponto e, em cada balde intermediário, o que
+    forma o maior triângulo com o ponto escolhido antes e a média do próximo
+    balde: picos e vales são preservados com apenas `threshold` pontos.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = [0]
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        mean_x, mean_y = x[end:next_end].mean(), y[end:next_end].mean()
+        a = selected[-1]
+        area = np.abs((x[a] - mean_x) * (y[start:end] - y[a])
+                      - (x[a] - x[start:end]) * (mean_y - y[a]))
+        selected.append(start + int(area.argmax()))
+    selected.append(n - 1)
+    return np.array(selected)
+
+
+class TimeSeries:
+    """Totais diários de vendas servidos em resolução adaptativa
+
+    As medidas ficam como somas acumuladas: o total de qualquer intervalo de
+    dias é uma subtração, então cada consulta custa O(pontos devolvidos), não
+    O(dias do histórico). Os arrays são somente leitura (compartilhados entre sessões).
+    """
+
+    def __init__(self, dates, measures):
+        self.dates = dates
+        self.dtypes = {name: np.asarray(values).dtype for name, values in measures.items()}
+        self.cumulative = {
+            name: np.concatenate([[0], np.cumsum(values, dtype='float64')])
+            for name, values in measures.items()
+        }
+        self.starts = _period_starts(dates)
+        # Índice do primeiro dia de cada período (dia, semana ou mês)
+        self.boundaries = {
+            resolution: np.flatnonzero(np.diff(starts.astype('int64'), prepend=-1))
+            for resolution, starts in self.starts.items()
+        }
+        for array in (dates, *self.cumulative.values(), *self.starts.values(), *self.boundaries.values()):
+            array.setflags(write=False)
+
+    @classmethod
+    def from_frame(cls, frame, date_column='Data', measures=('Quantidade', 'Receita')):
+        """Série a partir de um DataFrame diário como df_evolucao"""
+        daily = frame.groupby(date_column, sort=True)[list(measures)].sum()
+        return cls(daily.index.to_numpy().astype('datetime64[D]'),
+                   {name: daily[name].to_numpy() for name in measures})
+
+    def _range(self, start, end):
+        """Posições [i0, i1) dos dias com start <= data < end"""
+        i0 = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, 'D')))
+        i1 = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, 'D')))
+        return i0, max(i0, i1)
+
+    def _aggregate(self, resolution, i0, i1):
+        """Totais por período de `resolution` entre os dias i0 e i1"""
+        inner = self.boundaries[resolution]
+        inner = inner[(inner > i0) & (inner < i1)]
+        edges = np.concatenate([[i0], inner, [i1]]) if i1 > i0 else np.array([], dtype=int)
+        labels = self.starts[resolution][edges[:-1]].copy()
+        if len(labels):
+            # Período cortado pelo início do intervalo: rótulo no primeiro dia selecionado
+            labels[0] = max(labels[0], self.dates[i0])
+        columns = {'Data': pd.to_datetime(labels)}
+        for name, dtype in self.dtypes.items():
+            columns[name] = np.diff(self.cumulative[name][edges]).astype(dtype)
+        return pd.DataFrame(columns)
+
+    def series(self, start=None, end=None, resolution=None, y='Receita'):
+        """Série do período [start, end) com no máximo MAX_POINTS pontos
+
+        Sem `resolution`, usa a mais fina de RESOLUTIONS que couber no limite.
+        Se nem a escolhida couber, aplica LTTB sobre a medida `y`.
+        Retorna (DataFrame com Data + medidas, resolução usada).
+        """
+        limit = MAX_POINTS
+        i0, i1 = self._range(start, end)
+
+        candidates = RESOLUTIONS if resolution is None else (resolution,)
+        for level in candidates:
+            frame = self._aggregate(level, i0, i1)
+            if len(frame) <= limit:
+                return frame, level
+
+        keep = lttb(frame['Data'].to_numpy().astype('int64'), frame[y].to_numpy(), limit)
+        return frame.iloc[keep].reset_index(drop=True), f'{level} (LTTB)'
+
+
+def month_bounds(months):
+    """Intervalo [início, fim) de dias de uma lista de meses AAAA-MM (vazia = tudo)"""
+    if not months:
+        return None, None
+    return (np.datetime64(min(months), 'M').astype('datetime64[D]'),
+            (np.datetime64(max(months), 'M') + 1).astype('datetime64[D]'))